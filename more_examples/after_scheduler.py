@@ -0,0 +1,192 @@
+"""
+Doing things LATER without freezing the GUI.
+
+A callback that calls   time.sleep(2)   stops the whole event loop for
+2 seconds: the window does not redraw, and clicks and key presses wait.
+Instead, ask tkinter to call a function later, with the   after
+method that every widget has, and return right away.  The Scheduler
+below makes that easy for:
+  -- doing something once, after a delay           (call_later)
+  -- doing something over and over                  (call_every)
+  -- doing several steps, each after its own delay  (call_in_steps)
+and every one of those returns a Timer that can be CANCELLED.
+
+The LatencyProbe measures how late the event loop is in running a
+timer that should run every few milliseconds.  If some callback blocks
+the loop (for example, with time.sleep), the probe sees it.
+
+Run this module directly to see the probe measure   time.sleep(2)
+against   call_later(2000, ...).
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import tkinter
+import time
+
+
+class Timer(object):
+    """ Something that a Scheduler will do later, unless cancelled. """
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.widget = scheduler.widget
+        self.after_id = None
+        self.is_cancelled = False
+        scheduler.timers.add(self)
+
+    def cancel(self):
+        self.is_cancelled = True
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+        self.scheduler.timers.discard(self)
+
+    def is_active(self):
+        return self.after_id is not None
+
+    def _schedule(self, milliseconds, function):
+        if not self.is_cancelled:
+            self.after_id = self.widget.after(max(0, int(milliseconds)),
+                                              function)
+
+
+class Scheduler(object):
+    """
+    Runs functions later on the tkinter event loop.
+
+    Type hints:
+      :type widget: tkinter.Widget
+    """
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.timers = set()  # Timers that have not finished
+
+    def call_later(self, milliseconds, function, *arguments):
+        """ Calls the function with the arguments, after the delay. """
+        return self.call_in_steps([(milliseconds, function, arguments)])
+
+    def call_every(self, milliseconds, function, *arguments):
+        """
+        Calls the function with the arguments every   milliseconds,
+        until the returned Timer is cancelled.  The timer does not
+        drift: if one call runs late, the next is scheduled sooner.
+        """
+        timer = Timer(self)
+        next_time = [time.perf_counter() + milliseconds / 1000]
+
+        def run():
+            timer.after_id = None
+            function(*arguments)
+            next_time[0] = next_time[0] + milliseconds / 1000
+            delay = (next_time[0] - time.perf_counter()) * 1000
+            timer._schedule(delay, run)
+
+        timer._schedule(milliseconds, run)
+        return timer
+
+    def call_in_steps(self, steps):
+        """
+        Runs the given steps one after another.  Each step is
+        (milliseconds, function) or (milliseconds, function, arguments):
+        wait that long after the previous step, then call the function.
+        Cancelling the returned Timer cancels the steps not yet run.
+        """
+        timer = Timer(self)
+        steps = list(steps)
+
+        def run_step(k):
+            timer.after_id = None
+            arguments = steps[k][2] if len(steps[k]) > 2 else ()
+            steps[k][1](*arguments)
+            schedule_step(k + 1)
+
+        def schedule_step(k):
+            if k < len(steps) and not timer.is_cancelled:
+                timer._schedule(steps[k][0], lambda: run_step(k))
+            else:
+                self.timers.discard(timer)
+
+        schedule_step(0)
+        return timer
+
+    def cancel_all(self):
+        for timer in list(self.timers):
+            timer.cancel()
+
+
+class LatencyProbe(object):
+    """
+    Checks that the event loop stays responsive: asks to be called
+    every   milliseconds   and records how late each call actually was.
+    """
+
+    def __init__(self, widget, milliseconds=10):
+        self.widget = widget
+        self.milliseconds = milliseconds
+        self.latencies = []  # In milliseconds
+        self.after_id = None
+        self.expected_time = None
+
+    def start(self):
+        self.latencies = []
+        self._schedule()
+        return self
+
+    def stop(self):
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+    def worst(self):
+        """ Returns the latest that any call was, in milliseconds. """
+        return max(self.latencies) if self.latencies else 0
+
+    def average(self):
+        if not self.latencies:
+            return 0
+        return sum(self.latencies) / len(self.latencies)
+
+    def report(self):
+        return '{} checks, average {:.1f} ms late, worst {:.1f} ms'.format(
+            len(self.latencies), self.average(), self.worst())
+
+    def _schedule(self):
+        self.expected_time = time.perf_counter() + self.milliseconds / 1000
+        self.after_id = self.widget.after(self.milliseconds, self._check)
+
+    def _check(self):
+        lateness = (time.perf_counter() - self.expected_time) * 1000
+        self.latencies.append(max(0, lateness))
+        self._schedule()
+
+
+# ----------------------------------------------------------------------
+# Benchmark: how late the event loop runs while a callback waits
+# 2 seconds with time.sleep, versus with the Scheduler.
+# ----------------------------------------------------------------------
+def benchmark():
+    root = tkinter.Tk()
+    scheduler = Scheduler(root)
+
+    for name, wait in [
+            ('time.sleep(2)', lambda done: (time.sleep(2), done())),
+            ('call_later(2000)', lambda done: scheduler.call_later(2000,
+                                                                   done))]:
+        probe = LatencyProbe(root, 10).start()
+        finished = []
+        # Start the wait from a callback, as a Button press would.
+        root.after(50, lambda: wait(lambda: finished.append(True)))
+        while not finished:
+            root.update()
+            time.sleep(0.001)
+        probe.stop()
+        print('{:18}  {}'.format(name, probe.report()))
+
+    root.destroy()
+
+
+if __name__ == '__main__':
+    benchmark()
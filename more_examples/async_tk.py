@@ -0,0 +1,255 @@
+"""
+Running tkinter and asyncio TOGETHER, in one thread.
+
+With this module, a Button's command or a bind handler can be an
+  async def
+function, which can   await   network I/O (like sending a message to
+a robot) without freezing the GUI while it waits.  For example:
+
+    root = tkinter.Tk()
+    driver = AsyncTk(root)
+
+    async def send(command):
+        ...  # Code that awaits network I/O
+
+    button['command'] = driver.callback(lambda: send('Forward'))
+    root.bind('<Up>', driver.callback(lambda event: send('Forward')))
+
+    driver.run()  # Use this INSTEAD of   root.mainloop()
+
+How it works: tkinter's mainloop stays in charge.  On each TICK (an
+after   callback), the driver lets the asyncio loop go once around,
+using only asyncio's public methods:
+    loop.call_soon(loop.stop)
+    loop.run_forever()
+which runs the callbacks that are ready and handles the I/O that is
+ready, without waiting.  While any asyncio task is unfinished, the
+driver ticks every   tick_milliseconds ; once they are all done, it
+stops ticking (so nothing runs while idle) until a new task starts.
+
+The driver does NOT make its loop the "current" event loop.  Code that
+runs outside of the tasks and needs the loop should use the driver's
+loop   attribute (or call   asyncio.set_event_loop(driver.loop)
+itself).
+
+Run this module directly to compare idle CPU use and input latency
+with a loop that simply calls   root.update()   over and over.
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import tkinter
+import asyncio
+import inspect
+import os
+import socket
+import threading
+import time
+
+
+class AsyncTk(object):
+    """
+    Drives an asyncio event loop from tkinter's mainloop.
+
+    Type hints:
+      :type root: tkinter.Tk
+    """
+
+    def __init__(self, root, tick_milliseconds=10):
+        self.root = root
+        self.loop = asyncio.new_event_loop()
+        self.tick_milliseconds = tick_milliseconds
+        self.after_id = None
+        self.number_of_steps = 0
+
+    def callback(self, function):
+        """
+        Returns a function to use as a Button's command or in bind.
+        If the given function is an   async def   function (or returns
+        a coroutine), its coroutine is run as an asyncio task.
+        """
+        def run(*arguments):
+            result = function(*arguments)
+            if inspect.iscoroutine(result):
+                self.loop.create_task(result)
+                self.step_soon()
+                return None
+            return result
+        return run
+
+    def create_task(self, coroutine):
+        """ Runs the given coroutine as an asyncio task. """
+        task = self.loop.create_task(coroutine)
+        self.step_soon()
+        return task
+
+    def run(self):
+        """ Runs tkinter's mainloop (and asyncio with it). """
+        self.step()
+        try:
+            self.root.mainloop()
+        finally:
+            self.close()
+
+    def close(self):
+        if self.after_id is not None:
+            try:
+                self.root.after_cancel(self.after_id)
+            except tkinter.TclError:  # The root window is gone already.
+                pass
+            self.after_id = None
+        if self.loop.is_closed():
+            return
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        if tasks:  # (With no tasks, gather would use the current loop.)
+            self.loop.run_until_complete(
+                asyncio.gather(*tasks, return_exceptions=True))
+        self.loop.close()
+
+    def step_soon(self):
+        """ Runs asyncio's ready callbacks as soon as tkinter is idle. """
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+        self.after_id = self.root.after_idle(self.step)
+
+    def step(self):
+        """
+        Runs once around asyncio's loop: the callbacks that are ready,
+        and the I/O that is ready, without waiting.  Then, if any task
+        is unfinished, comes back on the next tick.
+        """
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        if self.loop.is_closed():
+            return
+        self.number_of_steps = self.number_of_steps + 1
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+        if asyncio.all_tasks(self.loop):
+            self.after_id = self.root.after(self.tick_milliseconds,
+                                            self.step)
+
+
+# ----------------------------------------------------------------------
+# Benchmark: idle CPU use, and the time from input (a Tk event, or
+# bytes arriving on a socket) to the async handler that handles it,
+# for AsyncTk and for a loop that keeps calling root.update().
+# ----------------------------------------------------------------------
+class Latencies(object):
+    def __init__(self):
+        self.tk_event = []
+        self.socket = []
+
+    def report(self, name):
+        def summary(values):
+            values = sorted(values)
+            if not values:
+                return 'none'
+            return 'median {:.2f} ms, worst {:.2f} ms'.format(
+                1000 * values[len(values) // 2], 1000 * values[-1])
+        print('  {}'.format(name))
+        print('    Tk event -> async handler:  ' + summary(self.tk_event))
+        print('    socket   -> coroutine:      ' + summary(self.socket))
+
+
+def send_timestamps(sock, count, interval):
+    """ In another thread: sends the time, every   interval   seconds. """
+    for _ in range(count):
+        time.sleep(interval)
+        sock.send('{:.9f}\n'.format(time.perf_counter()).encode())
+    sock.close()
+
+
+async def read_timestamps(reader, latencies):
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        latencies.socket.append(time.perf_counter() - float(line))
+
+
+def start_test(root, latencies, count=50, interval=0.02):
+    """ Binds an async handler and starts both sources of input. """
+    async def handler(event):
+        latencies.tk_event.append(time.perf_counter() - sent_times.pop(0))
+
+    sent_times = []
+
+    def generate():
+        sent_times.append(time.perf_counter())
+        root.event_generate('<<Input>>', when='tail')
+
+    for k in range(count):
+        root.after(int(1000 * interval * (k + 1)), generate)
+
+    reader_socket, writer_socket = socket.socketpair()
+    threading.Thread(target=send_timestamps,
+                     args=(writer_socket, count, interval)).start()
+    return handler, reader_socket
+
+
+def run_with_async_tk(seconds_idle, latencies):
+    root = tkinter.Tk()
+    driver = AsyncTk(root)
+    handler, reader_socket = start_test(root, latencies)
+    root.bind('<<Input>>', driver.callback(handler))
+
+    async def read():
+        reader, _ = await asyncio.open_connection(sock=reader_socket)
+        await read_timestamps(reader, latencies)
+        await asyncio.sleep(seconds_idle)  # Idle: nothing to do but wait
+        root.destroy()
+
+    driver.create_task(read())
+    start = time.process_time()
+    driver.run()
+    return time.process_time() - start
+
+
+def run_with_update_loop(seconds_idle, latencies):
+    root = tkinter.Tk()
+    handler, reader_socket = start_test(root, latencies)
+    loop = asyncio.new_event_loop()
+    root.bind('<<Input>>', lambda event: loop.create_task(handler(event)))
+
+    async def main():
+        reader, _ = await asyncio.open_connection(sock=reader_socket)
+        await read_timestamps(reader, latencies)
+        end = time.perf_counter() + seconds_idle
+        while time.perf_counter() < end:
+            root.update()
+            await asyncio.sleep(0.01)
+        root.destroy()
+
+    async def update_forever():
+        while True:
+            root.update()
+            await asyncio.sleep(0.01)
+
+    start = time.process_time()
+    updater = loop.create_task(update_forever())
+    loop.run_until_complete(main())
+    updater.cancel()
+    loop.close()
+    return time.process_time() - start
+
+
+def benchmark(seconds_idle=3):
+    print('CPU time includes the test traffic, then {} s idle'.format(
+        seconds_idle))
+    for name, run in [('AsyncTk', run_with_async_tk),
+                      ('update() every 10 ms', run_with_update_loop)]:
+        latencies = Latencies()
+        cpu = run(seconds_idle, latencies)
+        latencies.report('{}: {:.3f} s of CPU'.format(name, cpu))
+
+
+if __name__ == '__main__':
+    if os.environ.get('DISPLAY') or os.name == 'nt':
+        benchmark()
+    else:
+        print('This benchmark needs a display (try   xvfb-run ).')
@@ -0,0 +1,499 @@
+"""
+A compact BINARY FILE FORMAT for saving and loading Canvas drawings.
+
+The file is a LOG: every finished stroke or circle is APPENDED to the
+end of the file as soon as it is drawn, so the drawing is always saved
+and nothing ever has to rewrite the whole file.  Erasing a shape
+appends a short record that says so.
+
+Coordinates are stored as 2-byte integers (or 4-byte floats, if they
+are not whole numbers that fit in 2 bytes), using the   array   module,
+so a point takes 4 bytes instead of the dozen or more it would take
+as text.  Colors are stored once, in a table, and then referred to by
+their index in the table.
+
+To LOAD a drawing, the file is memory-mapped (see the   mmap   module),
+and nothing is decoded until it is needed.  When a DrawingLog is
+closed, it saves an INDEX next to the drawing (name.tkx for name.tkd):
+the bounding box of every shape, and a GRID of square cells, each with
+the numbers of the shapes that touch it (as in the   canvas_index
+module).  Opening the drawing reads just the index, and then only the
+records that were added after it was saved (if the program stopped
+without closing the log).  Finding the shapes in an area looks only
+at the cells there, and points are decoded only for those shapes, so
+opening a drawing with millions of points, and each change of the
+view, takes milliseconds.
+
+Each record in the file is:
+  kind (1 byte), length of the rest of the record (4 bytes), the rest.
+and the kinds are COLOR, STROKE, DOT and ERASE (see below).
+All numbers in the file are little-endian.
+
+Run this module directly to see a benchmark of opening a big drawing.
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import array
+import math
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+import zlib
+
+FILE_HEADER = b'TKDRAW\x00\x01'
+
+RECORD_HEADER = struct.Struct('<BI')  # kind, length of the rest
+COLOR = 1  # then: color index, then the color name in ASCII
+STROKE = 2  # then: STROKE_HEADER, then the coordinates
+DOT = 3  # then: DOT_RECORD
+ERASE = 4  # then: ERASE_RECORD
+
+# Coordinate type ('h' or 'f'), color index, width, number of points,
+# and the bounding box (left, top, right, bottom) of the stroke.
+STROKE_HEADER = struct.Struct('<cBfI4f')
+# Fill color index, outline color index, outline width, x, y, radius.
+DOT_RECORD = struct.Struct('<BBffff')
+# The number of the stroke or dot to erase (0 is the first one saved).
+ERASE_RECORD = struct.Struct('<I')
+
+# The index file is:  INDEX_HEADER, then each color (its length in 1
+# byte, then its name in ASCII), then a SHAPE_ENTRY for each shape, then
+# a CELL_ENTRY for each cell, then the shape numbers of all the cells.
+INDEX_FILE_HEADER = b'TKDRAWIX'
+# File header, where the records it covers end, CRC of the last bytes of
+# those records, number of shapes saved, and the numbers of colors,
+# (not erased) shapes and cells.
+INDEX_HEADER = struct.Struct('<8sQIIIII')
+# Shape number, kind, where its record starts, left, top, right, bottom.
+SHAPE_ENTRY = struct.Struct('<IBQ4f')
+# Column, row, and how many shape numbers the cell has.
+CELL_ENTRY = struct.Struct('<iiI')
+CELL_SIZE = 256
+
+
+class DrawingLog(object):
+    """
+    Appends strokes and circles to a drawing file as they are drawn.
+
+    Shapes are identified by a key, as in the SpatialIndex of the
+    canvas_index   module, so that they can be erased later.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.number_of_key = {}  # key -> number of the shape in the file
+
+        if os.path.exists(filename) and os.path.getsize(filename) > 0:
+            # Carry on from where the existing file left off.
+            drawing = DrawingFile(filename)
+            self.color_index = {}
+            for k in range(len(drawing.colors)):
+                self.color_index[drawing.colors[k]] = k
+            self.number_of_shapes = drawing.number_of_shapes
+            end = drawing.end_of_records
+            drawing.close()
+            self.file = open(filename, 'ab')
+            # Cut off a record that was only partly written (for example,
+            # in a crash), so that new records follow the last whole one.
+            self.file.truncate(end)
+        else:
+            self.color_index = {}
+            self.number_of_shapes = 0
+            if os.path.exists(index_filename(filename)):
+                os.remove(index_filename(filename))  # Of an old drawing
+            self.file = open(filename, 'wb')
+            self.file.write(FILE_HEADER)
+            self.file.flush()
+
+    def remember(self, key, number):
+        """
+        Makes the given key refer to the shape with the given number,
+        for example a shape that was loaded from this file.
+        """
+        self.number_of_key[key] = number
+
+    def add_stroke(self, stroke):
+        """ Appends the given canvas_strokes.Stroke, as its own key. """
+        self.add_line(stroke, stroke.points, stroke.color, stroke.width)
+
+    def add_line(self, key, points, color, width):
+        """ Appends a line through the flat list of points [x0, y0, ...]. """
+        coordinates = coordinates_array(points)
+        xs = points[0::2]
+        ys = points[1::2]
+        record = STROKE_HEADER.pack(coordinates.typecode.encode(),
+                                    self._color(color), width,
+                                    len(points) // 2,
+                                    min(xs), min(ys), max(xs), max(ys))
+        if sys.byteorder == 'big':
+            coordinates.byteswap()
+        self._append(key, STROKE, record + coordinates.tobytes())
+
+    def add_dot(self, key, x, y, radius, fill, outline='black',
+                outline_width=1):
+        """ Appends a circle like the Canvas's   create_oval   makes. """
+        record = DOT_RECORD.pack(self._color(fill), self._color(outline),
+                                 outline_width, x, y, radius)
+        self._append(key, DOT, record)
+
+    def remove(self, key):
+        """ Appends a record that erases the shape with the given key. """
+        if key in self.number_of_key:
+            number = self.number_of_key.pop(key)
+            self._write(ERASE, ERASE_RECORD.pack(number))
+
+    def close(self):
+        """ Closes the file, and saves its index (see DrawingFile). """
+        self.file.close()
+        # Reads the old index, and only the records written since then.
+        drawing = DrawingFile(self.filename)
+        drawing.save_index()
+        drawing.close()
+
+    # ------------------------------------------------------------------
+    # The rest of this class is helpers for the methods above.
+    # ------------------------------------------------------------------
+    def _color(self, name):
+        if name not in self.color_index:
+            index = len(self.color_index)
+            if index > 255:
+                raise ValueError('a drawing file can have at most 256'
+                                 ' colors')
+            self.color_index[name] = index
+            self._write(COLOR, bytes([index]) + name.encode('ascii'))
+        return self.color_index[name]
+
+    def _append(self, key, kind, record):
+        self.number_of_key[key] = self.number_of_shapes
+        self.number_of_shapes = self.number_of_shapes + 1
+        self._write(kind, record)
+
+    def _write(self, kind, record):
+        # Write each record with a single call, and flush it right away,
+        # so that a crash can lose at most the record being written.
+        self.file.write(RECORD_HEADER.pack(kind, len(record)) + record)
+        self.file.flush()
+
+
+class DrawingFile(object):
+    """
+    A drawing file opened for reading.  Opening it reads its index,
+    and the headers of only the records that the index does not cover;
+    the points of a stroke are read only when the stroke is asked for.
+    """
+
+    def __init__(self, filename):
+        self.file = open(filename, 'rb')
+        if os.fstat(self.file.fileno()).st_size == 0:
+            self.data = b''
+        else:
+            self.data = mmap.mmap(self.file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+        if self.data[:len(FILE_HEADER)] != FILE_HEADER:
+            self.close()
+            raise ValueError(filename + ' is not a drawing file')
+
+        self.colors = []  # Color names, in order of their index
+        # Shape number -> (kind, where its record starts, left, top,
+        #                  right, bottom), for shapes not erased.
+        self.shapes = {}
+        self.number_of_shapes = 0
+        self.cells = {}  # (column, row) -> numbers of shapes that touch it
+        self.end_of_records = len(FILE_HEADER)  # After the last whole one
+        self.filename = filename
+        self.has_index = self._read_index(index_filename(filename))
+        self._read_headers()
+
+    def shapes_in(self, left, top, right, bottom):
+        """
+        Returns a list of (number, shape) for the shapes whose bounding
+        boxes overlap the given rectangle, in the order they were drawn.
+        Each shape is one of:
+          ('line', points, color, width)
+          ('dot', x, y, radius, fill, outline, outline_width)
+        """
+        return [(number, self.shape(number))
+                for number in self.numbers_in(left, top, right, bottom)]
+
+    def numbers_in(self, left, top, right, bottom):
+        """
+        Returns a list of the numbers of the shapes whose bounding boxes
+        overlap the given rectangle, without reading their points.
+        """
+        candidates = set()
+        for cell in cells_in_box(left, top, right, bottom):
+            if cell in self.cells:
+                candidates.update(self.cells[cell])
+        found = []
+        for number in candidates:
+            if number in self.shapes:  # Else it was erased
+                x1, y1, x2, y2 = self.shapes[number][2:]
+                if not (x2 < left or x1 > right or y2 < top or y1 > bottom):
+                    found.append(number)
+        found.sort()
+        return found
+
+    def shape(self, number):
+        """ Returns the shape with the given number (see shapes_in). """
+        kind, start = self.shapes[number][0:2]
+        return self._shape(kind, start)
+
+    def all_shapes(self):
+        """ Returns a list of (number, shape) for every shape. """
+        return [(number, self.shape(number)) for number in self.shapes]
+
+    def save_index(self):
+        """
+        Saves the index of the drawing (see above), so that opening the
+        drawing next time reads it instead of the records.
+        """
+        end = self.end_of_records
+        last_bytes = self.data[max(0, end - 64):end]
+        parts = [INDEX_HEADER.pack(
+            INDEX_FILE_HEADER, end, zlib.crc32(last_bytes),
+            self.number_of_shapes, len(self.colors), len(self.shapes),
+            len(self.cells))]
+        for name in self.colors:
+            parts.append(bytes([len(name)]) + name.encode('ascii'))
+        for number, (kind, start, x1, y1, x2, y2) in self.shapes.items():
+            parts.append(SHAPE_ENTRY.pack(number, kind, start,
+                                          x1, y1, x2, y2))
+        numbers = array.array('I')
+        for (column, row), numbers_in_cell in self.cells.items():
+            # Erased shapes are left out.
+            numbers_in_cell = [number for number in numbers_in_cell
+                               if number in self.shapes]
+            parts.append(CELL_ENTRY.pack(column, row, len(numbers_in_cell)))
+            numbers.extend(numbers_in_cell)
+        if sys.byteorder == 'big':
+            numbers.byteswap()
+        parts.append(numbers.tobytes())
+
+        # Write a new file, then replace the old one with it, so that a
+        # crash cannot leave half of an index.
+        filename = index_filename(self.filename)
+        with open(filename + '.new', 'wb') as file:
+            file.write(b''.join(parts))
+        os.replace(filename + '.new', filename)
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+    # ------------------------------------------------------------------
+    # The rest of this class is helpers for the methods above.
+    # ------------------------------------------------------------------
+    def _read_index(self, filename):
+        # Returns True if it read the index, or False if there is none
+        # or it is not for this drawing file (as it is now).
+        try:
+            with open(filename, 'rb') as file:
+                index = file.read()
+            (file_header, end, crc, number_of_shapes, number_of_colors,
+             number_of_entries, number_of_cells) = INDEX_HEADER.unpack_from(
+                 index, 0)
+        except (OSError, struct.error):
+            return False
+        if (file_header != INDEX_FILE_HEADER
+                or not len(FILE_HEADER) <= end <= len(self.data)
+                or zlib.crc32(self.data[max(0, end - 64):end]) != crc):
+            return False
+
+        position = INDEX_HEADER.size
+        colors = []
+        for _ in range(number_of_colors):
+            length = index[position]
+            colors.append(index[position + 1:position + 1 + length]
+                          .decode('ascii'))
+            position = position + 1 + length
+        shapes = {}
+        size = SHAPE_ENTRY.size * number_of_entries
+        for entry in SHAPE_ENTRY.iter_unpack(
+                index[position:position + size]):
+            shapes[entry[0]] = entry[1:]
+        position = position + size
+        size = CELL_ENTRY.size * number_of_cells
+        cell_entries = list(CELL_ENTRY.iter_unpack(
+            index[position:position + size]))
+        position = position + size
+        numbers = array.array('I')
+        numbers.frombytes(index[position:])
+        if sys.byteorder == 'big':
+            numbers.byteswap()
+        cells = {}
+        first = 0
+        for column, row, count in cell_entries:
+            cells[(column, row)] = numbers[first:first + count]
+            first = first + count
+
+        self.colors = colors
+        self.shapes = shapes
+        self.cells = cells
+        self.number_of_shapes = number_of_shapes
+        self.end_of_records = end
+        return True
+
+    def _add_shape(self, kind, start, x1, y1, x2, y2):
+        number = self.number_of_shapes
+        self.shapes[number] = (kind, start, x1, y1, x2, y2)
+        for cell in cells_in_box(x1, y1, x2, y2):
+            if cell in self.cells:
+                self.cells[cell].append(number)
+            else:
+                self.cells[cell] = array.array('I', [number])
+        self.number_of_shapes = self.number_of_shapes + 1
+
+    def _read_headers(self):
+        # Reads the records after the ones that the index covers.
+        data = self.data
+        position = self.end_of_records
+        while position + RECORD_HEADER.size <= len(data):
+            kind, length = RECORD_HEADER.unpack_from(data, position)
+            start = position + RECORD_HEADER.size
+            if start + length > len(data):
+                break  # The last record was only partly written.
+
+            if kind == COLOR:
+                name = bytes(data[start + 1:start + length]).decode('ascii')
+                self.colors.append(name)
+            elif kind == STROKE:
+                header = STROKE_HEADER.unpack_from(data, start)
+                self._add_shape(STROKE, start, header[4], header[5],
+                                header[6], header[7])
+            elif kind == DOT:
+                record = DOT_RECORD.unpack_from(data, start)
+                x, y, radius = record[3], record[4], record[5]
+                reach = radius + record[2] / 2
+                self._add_shape(DOT, start, x - reach, y - reach,
+                                x + reach, y + reach)
+            elif kind == ERASE:
+                number = ERASE_RECORD.unpack_from(data, start)[0]
+                self.shapes.pop(number, None)
+            # Records of any other kind are skipped.
+
+            position = start + length
+            self.end_of_records = position
+
+    def _shape(self, kind, start):
+        if kind == DOT:
+            record = DOT_RECORD.unpack_from(self.data, start)
+            return ('dot', record[3], record[4], record[5],
+                    self.colors[record[0]], self.colors[record[1]],
+                    record[2])
+
+        header = STROKE_HEADER.unpack_from(self.data, start)
+        typecode = header[0].decode()
+        coordinates = array.array(typecode)
+        first = start + STROKE_HEADER.size
+        last = first + 2 * header[3] * coordinates.itemsize
+        coordinates.frombytes(self.data[first:last])
+        if sys.byteorder == 'big':
+            coordinates.byteswap()
+        return ('line', coordinates.tolist(), self.colors[header[1]],
+                header[2])
+
+
+def index_filename(filename):
+    """ Returns, for example, 'drawing.tkx' for 'drawing.tkd'. """
+    return os.path.splitext(filename)[0] + '.tkx'
+
+
+def cells_in_box(x1, y1, x2, y2):
+    """ Returns the (column, row) of each cell that the box touches. """
+    cells = []
+    for column in range(math.floor(x1 / CELL_SIZE),
+                        math.floor(x2 / CELL_SIZE) + 1):
+        for row in range(math.floor(y1 / CELL_SIZE),
+                         math.floor(y2 / CELL_SIZE) + 1):
+            cells.append((column, row))
+    return cells
+
+
+def coordinates_array(points):
+    """
+    Returns an array of the given coordinates: 2-byte integers if they
+    are all whole numbers that fit, else 4-byte floats.
+    """
+    try:
+        if all(point == int(point) for point in points):
+            return array.array('h', [int(point) for point in points])
+    except OverflowError:
+        pass
+    return array.array('f', points)
+
+
+# ----------------------------------------------------------------------
+# Benchmark: writes a drawing with millions of points, then opens it
+# (with its index, and without it) and loads just a small viewport of it.
+# ----------------------------------------------------------------------
+def benchmark(filename='benchmark_drawing.tkd', number_of_strokes=20000,
+              points_per_stroke=100):
+    random.seed(120)
+    if os.path.exists(filename):
+        os.remove(filename)
+
+    start = time.perf_counter()
+    log = DrawingLog(filename)
+    for key in range(number_of_strokes):
+        x = random.randrange(10000)
+        y = random.randrange(10000)
+        points = []
+        for _ in range(points_per_stroke):
+            x = x + random.randrange(-5, 6)
+            y = y + random.randrange(-5, 6)
+            points.extend([x, y])
+        log.add_line(key, points, random.choice(['blue', 'red']), 5)
+    log.close()
+    seconds_to_write = time.perf_counter() - start
+
+    size = os.path.getsize(filename)
+    number_of_points = number_of_strokes * points_per_stroke
+    print('{} points in {} strokes: {:.1f} MB, {:.1f} bytes per point,'
+          ' written in {:.2f} s'.format(number_of_points, number_of_strokes,
+                                        size / 1000000,
+                                        size / number_of_points,
+                                        seconds_to_write))
+
+    start = time.perf_counter()
+    drawing = DrawingFile(filename)
+    seconds_to_open = time.perf_counter() - start
+
+    start = time.perf_counter()
+    numbers = drawing.numbers_in(2000, 2000, 2800, 2600)
+    seconds_to_find = time.perf_counter() - start
+
+    start = time.perf_counter()
+    shapes = drawing.shapes_in(0, 0, 800, 600)
+    seconds_for_viewport = time.perf_counter() - start
+
+    start = time.perf_counter()
+    everything = drawing.all_shapes()
+    seconds_for_everything = time.perf_counter() - start
+    drawing.close()
+
+    os.remove(index_filename(filename))
+    start = time.perf_counter()
+    drawing = DrawingFile(filename)
+    seconds_to_open_without_index = time.perf_counter() - start
+    drawing.close()
+
+    print('Open, reading its index: {:.1f} ms'.format(seconds_to_open * 1000))
+    print('Open, reading every record instead: {:.1f} ms'.format(
+        seconds_to_open_without_index * 1000))
+    print('Find the {} strokes in an 800 x 600 viewport: {:.2f} ms'.format(
+        len(numbers), seconds_to_find * 1000))
+    print('Load the {} strokes in another 800 x 600 viewport: {:.1f} ms'
+          .format(len(shapes), seconds_for_viewport * 1000))
+    print('Load all {} strokes: {:.1f} ms'
+          .format(len(everything), seconds_for_everything * 1000))
+    os.remove(filename)
+
+
+if __name__ == '__main__':
+    benchmark()
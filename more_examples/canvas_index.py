@@ -0,0 +1,329 @@
+"""
+A SPATIAL INDEX for finding what is drawn at a place on a Canvas.
+
+The Canvas's own   find_overlapping   method looks at EVERY item on the
+Canvas, so it gets slower and slower as the drawing grows.  This index
+splits the drawing area into a grid of square cells and remembers which
+shapes touch which cells.  To find the shapes at a point (or in a
+rectangle), it looks only at the shapes in the few cells there.  So
+the time for a query depends on how many shapes are in those cells,
+not on how many there are in all.  But as more and more is drawn in
+the same area, its cells FILL UP and queries slow down; smaller cells
+hold fewer shapes each (but a big rectangle then covers more cells).
+
+Shapes are identified by a KEY that you choose when you add them,
+for example the Canvas item id of an oval or the Stroke object
+(see the   canvas_strokes   module) for a stroke.
+
+Run this module directly to see a benchmark of query time against the
+number of shapes in one Canvas-sized area, for two sizes of cells,
+compared to checking every shape one by one.
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import math
+import random
+import time
+
+
+class SpatialIndex(object):
+    """ A uniform grid of cells, each holding the keys of its shapes. """
+
+    def __init__(self, cell_size=32):
+        self.cell_size = cell_size
+        self.cells = {}  # (column, row) -> set of keys
+        self.shapes = {}  # key -> ('oval', box) or ('line', points, width)
+        self.cells_of_key = {}  # key -> list of (column, row)
+
+    def __len__(self):
+        return len(self.shapes)
+
+    def __contains__(self, key):
+        return key in self.shapes
+
+    def add_oval(self, key, x1, y1, x2, y2):
+        """ Adds an oval (or circle) with the given bounding box. """
+        self.remove(key)
+        box = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        self.shapes[key] = ('oval', box)
+        self._add_to_cells(key, self._cells_in_box(box[0], box[1],
+                                                   box[2], box[3]))
+
+    def add_line(self, key, points, width=1):
+        """
+        Adds a line through the given flat list of points
+        [x0, y0, x1, y1, ...] that is   width   pixels wide.
+        """
+        self.remove(key)
+        points = list(points)
+        self.shapes[key] = ('line', points, width)
+
+        cells = set()
+        if len(points) == 2:
+            points = points + points
+        for k in range(0, len(points) - 2, 2):
+            cells.update(self._cells_near_segment(points[k], points[k + 1],
+                                                  points[k + 2],
+                                                  points[k + 3],
+                                                  width / 2))
+        self._add_to_cells(key, cells)
+
+    def add_stroke(self, stroke):
+        """ Adds the given canvas_strokes.Stroke, using it as its key. """
+        self.add_line(stroke, stroke.points, stroke.width)
+
+    def remove(self, key):
+        """ Removes the shape with the given key, if there is one. """
+        if key not in self.shapes:
+            return
+        del self.shapes[key]
+        for cell in self.cells_of_key.pop(key):
+            keys = self.cells[cell]
+            keys.discard(key)
+            if not keys:
+                del self.cells[cell]
+
+    def clear(self):
+        self.cells = {}
+        self.shapes = {}
+        self.cells_of_key = {}
+
+    def find_at_point(self, x, y, radius=0):
+        """
+        Returns a list of the keys of the shapes that are within
+        the given radius of the given point.
+        """
+        found = []
+        for key in self._candidates(x - radius, y - radius,
+                                    x + radius, y + radius):
+            if self._touches_circle(self.shapes[key], x, y, radius):
+                found.append(key)
+        return found
+
+    def find_in_rectangle(self, x1, y1, x2, y2):
+        """
+        Returns a list of the keys of the shapes that overlap
+        the rectangle with the given corners.
+        """
+        left, right = min(x1, x2), max(x1, x2)
+        top, bottom = min(y1, y2), max(y1, y2)
+        found = []
+        for key in self._candidates(left, top, right, bottom):
+            if self._touches_rectangle(self.shapes[key],
+                                       left, top, right, bottom):
+                found.append(key)
+        return found
+
+    def overlaps(self, key, x1, y1, x2, y2):
+        """
+        Returns True if the shape with the given key overlaps
+        the rectangle with the given corners.
+        """
+        return self._touches_rectangle(self.shapes[key],
+                                       min(x1, x2), min(y1, y2),
+                                       max(x1, x2), max(y1, y2))
+
+    # ------------------------------------------------------------------
+    # The rest of this class is helpers for the methods above.
+    # ------------------------------------------------------------------
+    def _add_to_cells(self, key, cells):
+        cells = list(cells)
+        self.cells_of_key[key] = cells
+        for cell in cells:
+            if cell in self.cells:
+                self.cells[cell].add(key)
+            else:
+                self.cells[cell] = {key}
+
+    def _cells_in_box(self, x1, y1, x2, y2):
+        size = self.cell_size
+        cells = []
+        for column in range(math.floor(x1 / size),
+                            math.floor(x2 / size) + 1):
+            for row in range(math.floor(y1 / size),
+                             math.floor(y2 / size) + 1):
+                cells.append((column, row))
+        return cells
+
+    def _cells_near_segment(self, x1, y1, x2, y2, half_width):
+        # Walk along the segment in steps of one cell, taking the cells
+        # near each step.  That covers a long diagonal segment with
+        # a few cells, instead of every cell in its bounding box.
+        size = self.cell_size
+        steps = int(math.hypot(x2 - x1, y2 - y1) / size) + 1
+        reach = half_width + size / 2
+        cells = set()
+        for k in range(steps + 1):
+            x = x1 + (x2 - x1) * k / steps
+            y = y1 + (y2 - y1) * k / steps
+            cells.update(self._cells_in_box(x - reach, y - reach,
+                                            x + reach, y + reach))
+        return cells
+
+    def _candidates(self, x1, y1, x2, y2):
+        candidates = set()
+        for cell in self._cells_in_box(x1, y1, x2, y2):
+            if cell in self.cells:
+                candidates.update(self.cells[cell])
+        return candidates
+
+    @staticmethod
+    def _touches_circle(shape, x, y, radius):
+        if shape[0] == 'oval':
+            left, top, right, bottom = shape[1]
+            rx = (right - left) / 2
+            ry = (bottom - top) / 2
+            dx = x - (left + rx)
+            dy = y - (top + ry)
+            if rx == 0 or ry == 0:
+                return math.hypot(dx, dy) <= radius + max(rx, ry)
+            # Grow the oval by the radius, then test the point against it.
+            return ((dx / (rx + radius)) ** 2
+                    + (dy / (ry + radius)) ** 2) <= 1
+
+        points, width = shape[1], shape[2]
+        reach = radius + width / 2
+        if len(points) == 2:
+            return math.hypot(x - points[0], y - points[1]) <= reach
+        for k in range(0, len(points) - 2, 2):
+            if distance_to_segment(x, y, points[k], points[k + 1],
+                                   points[k + 2], points[k + 3]) <= reach:
+                return True
+        return False
+
+    @staticmethod
+    def _touches_rectangle(shape, left, top, right, bottom):
+        if shape[0] == 'oval':
+            box = shape[1]
+            return not (box[2] < left or box[0] > right
+                        or box[3] < top or box[1] > bottom)
+
+        points, width = shape[1], shape[2]
+        half = width / 2
+        left, top = left - half, top - half
+        right, bottom = right + half, bottom + half
+        if len(points) == 2:
+            points = points + points
+        for k in range(0, len(points) - 2, 2):
+            if segment_meets_rectangle(points[k], points[k + 1],
+                                       points[k + 2], points[k + 3],
+                                       left, top, right, bottom):
+                return True
+        return False
+
+
+def distance_to_segment(x, y, x1, y1, x2, y2):
+    """ Returns the distance from (x, y) to the segment (x1, y1)-(x2, y2). """
+    dx = x2 - x1
+    dy = y2 - y1
+    length_squared = dx * dx + dy * dy
+    if length_squared == 0:
+        return math.hypot(x - x1, y - y1)
+    t = ((x - x1) * dx + (y - y1) * dy) / length_squared
+    t = max(0, min(1, t))
+    return math.hypot(x - (x1 + t * dx), y - (y1 + t * dy))
+
+
+def segment_meets_rectangle(x1, y1, x2, y2, left, top, right, bottom):
+    """
+    Returns True if the segment (x1, y1)-(x2, y2) has any point inside
+    the given rectangle (Liang-Barsky clipping).
+    """
+    t_enter = 0
+    t_leave = 1
+    dx = x2 - x1
+    dy = y2 - y1
+    for p, q in ((-dx, x1 - left), (dx, right - x1),
+                 (-dy, y1 - top), (dy, bottom - y1)):
+        if p == 0:
+            if q < 0:
+                return False
+        else:
+            t = q / p
+            if p < 0:
+                t_enter = max(t_enter, t)
+            else:
+                t_leave = min(t_leave, t)
+            if t_enter > t_leave:
+                return False
+    return True
+
+
+# ----------------------------------------------------------------------
+# Benchmark: query time against the number of shapes in the index, as
+# they fill up the cells of one Canvas-sized area.
+# ----------------------------------------------------------------------
+def add_random_shapes(index, number_of_shapes, width, height):
+    """ Adds circles and short strokes scattered over the given area. """
+    for key in range(number_of_shapes):
+        x = random.uniform(0, width)
+        y = random.uniform(0, height)
+        if key % 4 == 0:
+            points = [x, y]
+            for _ in range(5):
+                x = x + random.uniform(-15, 15)
+                y = y + random.uniform(-15, 15)
+                points.extend([x, y])
+            index.add_line(key, points, 5)
+        else:
+            index.add_oval(key, x - 10, y - 10, x + 10, y + 10)
+
+
+def find_by_checking_every_shape(index, x, y, radius):
+    found = []
+    for key, shape in index.shapes.items():
+        if SpatialIndex._touches_circle(shape, x, y, radius):
+            found.append(key)
+    return found
+
+
+def time_queries(query, number_of_queries, width, height):
+    """ Returns the average microseconds per call of the given query. """
+    points = [(random.uniform(0, width), random.uniform(0, height))
+              for _ in range(number_of_queries)]
+    start = time.perf_counter()
+    for x, y in points:
+        query(x, y)
+    return (time.perf_counter() - start) / number_of_queries * 1000000
+
+
+def shapes_per_cell(index):
+    """ Returns the average number of shapes in a cell that has any. """
+    return sum(len(keys) for keys in index.cells.values()) / len(index.cells)
+
+
+def benchmark(width=800, height=600):
+    # All the shapes are in one Canvas-sized area, as when the user
+    # draws for longer and longer in the same window, so the cells fill
+    # up.  The Viewport of the   canvas_viewport   module uses cells of
+    # 256 pixels; smaller cells hold fewer shapes each.
+    random.seed(120)
+    print('All shapes in one {} x {} area:'.format(width, height))
+    print('{:>5}  {:>8}  {:>9}  {:>12}  {:>12}  {:>15}'.format(
+        'cell', 'shapes', 'per cell', 'point (us)', 'rect (us)',
+        'check all (us)'))
+    for cell_size in [256, 32]:
+        for number_of_shapes in [1000, 10000, 100000, 500000]:
+            index = SpatialIndex(cell_size)
+            add_random_shapes(index, number_of_shapes, width, height)
+
+            point_time = time_queries(
+                lambda x, y: index.find_at_point(x, y, 8),
+                max(10, 200000 // number_of_shapes), width, height)
+            rectangle_time = time_queries(
+                lambda x, y: index.find_in_rectangle(x, y, x + 50, y + 50),
+                max(10, 200000 // number_of_shapes), width, height)
+            # Checking every shape is slow, so do fewer queries that way.
+            every_shape_time = time_queries(
+                lambda x, y: find_by_checking_every_shape(index, x, y, 8),
+                max(1, 20000 // number_of_shapes), width, height)
+
+            print('{:5}  {:8}  {:9.0f}  {:12.1f}  {:12.1f}  {:15.1f}'.format(
+                cell_size, number_of_shapes, shapes_per_cell(index),
+                point_time, rectangle_time, every_shape_time))
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,326 @@
+"""
+A RASTER BACKING STORE that "flattens" finished drawing into images.
+
+Every item on a Canvas costs time each time the Canvas redraws, so a
+drawing made of thousands of strokes and circles gets slower and
+slower.  Once a stroke or circle is FINISHED, though, it never changes.
+This module paints finished shapes into the pixels of a few
+tkinter.PhotoImage TILES that sit underneath everything else on the
+Canvas, so the Canvas holds one image item per tile no matter how much
+has been drawn.
+
+Each tile keeps its pixels, and remembers which shapes touch it.
+Adding a shape paints JUST that shape on top of the pixels of the tiles
+it touches, so adding a shape takes the same time however much has
+been drawn.  Removing a shape re-paints the tiles it touched from
+scratch (without it).  Either way, only the changed tiles are sent to
+Tk (once, the next time Tk is idle).
+
+Run this module directly to see a benchmark of redraw time as a
+drawing grows, with and without flattening.
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import tkinter
+import math
+import random
+import time
+
+
+class Tile(object):
+    """ One square PhotoImage of the backing store, and its shapes. """
+
+    def __init__(self, canvas, column, row, size):
+        self.column = column
+        self.row = row
+        self.keys = set()  # Keys of the shapes that touch this tile
+        self.new_keys = []  # Keys of shapes not yet painted, in order
+        self.pixels = None  # Rows of colors, once it has been painted
+        self.photo = tkinter.PhotoImage(master=canvas, width=size,
+                                        height=size)
+        self.item = canvas.create_image(column * size, row * size,
+                                        image=self.photo, anchor='nw',
+                                        tags=('backing',))
+        canvas.tag_lower(self.item)
+
+
+class RasterBackingStore(object):
+    """
+    Paints finished strokes and circles into PhotoImage tiles.
+
+    Type hints:
+      :type canvas: tkinter.Canvas
+    """
+
+    def __init__(self, canvas, background='lightgray', tile_size=128):
+        self.canvas = canvas
+        self.background = background
+        self.tile_size = tile_size
+        self.tiles = {}  # (column, row) -> Tile
+        self.shapes = {}  # key -> ('line', ...) or ('dot', ...)
+        self.tiles_of_key = {}  # key -> list of (column, row)
+        self.order_of_key = {}  # key -> when it was added: 0, 1, 2, ...
+        self.number_added = 0
+        self.changed_tiles = set()
+        self.tiles_to_repaint = set()  # Changed tiles that lost a shape
+        self.is_flush_scheduled = False
+        self.number_of_tiles_painted = 0
+
+    def __contains__(self, key):
+        return key in self.shapes
+
+    def add_line(self, key, points, color, width):
+        """ Paints a line through the flat list of points [x0, y0, ...]. """
+        self.remove(key)
+        points = list(points)
+        if len(points) == 2:
+            points = points + points
+        self.shapes[key] = ('line', points, color, width)
+        self._set_order(key)
+
+        reach = width / 2 + 1
+        xs = points[0::2]
+        ys = points[1::2]
+        self._add_to_tiles(key, min(xs) - reach, min(ys) - reach,
+                           max(xs) + reach, max(ys) + reach)
+
+    def add_stroke(self, stroke):
+        """ Paints the given canvas_strokes.Stroke, using it as its key. """
+        self.add_line(stroke, stroke.points, stroke.color, stroke.width)
+
+    def add_dot(self, key, x, y, radius, fill, outline='black',
+                outline_width=1):
+        """ Paints a circle like the Canvas's   create_oval   makes. """
+        self.remove(key)
+        self.shapes[key] = ('dot', x, y, radius, fill, outline,
+                            outline_width)
+        self._set_order(key)
+        reach = radius + outline_width / 2 + 1
+        self._add_to_tiles(key, x - reach, y - reach, x + reach, y + reach)
+
+    def remove(self, key):
+        """ Removes the shape with the given key, if there is one. """
+        if key not in self.shapes:
+            return
+        del self.shapes[key]
+        del self.order_of_key[key]
+        for tile_position in self.tiles_of_key.pop(key):
+            self.tiles[tile_position].keys.discard(key)
+            self.tiles_to_repaint.add(tile_position)
+            self._mark_changed(tile_position)
+
+    def flush(self):
+        """
+        Paints the new shapes on each changed tile (or re-paints the
+        whole tile, if a shape was removed from it) and sends it to Tk.
+        """
+        self.is_flush_scheduled = False
+        for tile_position in self.changed_tiles:
+            tile = self.tiles[tile_position]
+            if tile_position in self.tiles_to_repaint or tile.pixels is None:
+                size = self.tile_size
+                tile.pixels = [[self.background] * size for _ in range(size)]
+                self._paint(tile, sorted(tile.keys,
+                                         key=self.order_of_key.get))
+            else:
+                self._paint(tile, tile.new_keys)
+            tile.new_keys = []
+            rows = ['{' + ' '.join(row) + '}' for row in tile.pixels]
+            tile.photo.put(' '.join(rows), to=(0, 0))
+            self.number_of_tiles_painted = self.number_of_tiles_painted + 1
+        self.changed_tiles = set()
+        self.tiles_to_repaint = set()
+
+    def number_of_items(self):
+        """ Returns the number of Canvas items used by the tiles. """
+        return len(self.tiles)
+
+    # ------------------------------------------------------------------
+    # The rest of this class is helpers for the methods above.
+    # ------------------------------------------------------------------
+    def _set_order(self, key):
+        self.order_of_key[key] = self.number_added
+        self.number_added = self.number_added + 1
+
+    def _add_to_tiles(self, key, x1, y1, x2, y2):
+        size = self.tile_size
+        positions = []
+        for column in range(math.floor(x1 / size),
+                            math.floor(x2 / size) + 1):
+            for row in range(math.floor(y1 / size),
+                             math.floor(y2 / size) + 1):
+                position = (column, row)
+                if position not in self.tiles:
+                    self.tiles[position] = Tile(self.canvas, column, row,
+                                                size)
+                self.tiles[position].keys.add(key)
+                self.tiles[position].new_keys.append(key)
+                self._mark_changed(position)
+                positions.append(position)
+        self.tiles_of_key[key] = positions
+
+    def _mark_changed(self, tile_position):
+        self.changed_tiles.add(tile_position)
+        if not self.is_flush_scheduled:
+            self.is_flush_scheduled = True
+            self.canvas.after_idle(self.flush)
+
+    def _paint(self, tile, keys):
+        # Paints the shapes with the given keys on the tile's pixels, in
+        # the given order (the order they were added, so that later
+        # shapes are on top of earlier ones).
+        size = self.tile_size
+        left = tile.column * size
+        top = tile.row * size
+        pixels = tile.pixels
+        for key in keys:
+            shape = self.shapes[key]
+            if shape[0] == 'line':
+                points, color, width = shape[1], shape[2], shape[3]
+                for k in range(0, len(points) - 2, 2):
+                    paint_capsule(pixels, left, top,
+                                  points[k], points[k + 1],
+                                  points[k + 2], points[k + 3],
+                                  width / 2, color)
+            else:
+                x, y, radius, fill, outline, outline_width = shape[1:]
+                outer = radius + outline_width / 2
+                inner = radius - outline_width / 2
+                paint_capsule(pixels, left, top, x, y, x, y, outer,
+                              outline)
+                paint_capsule(pixels, left, top, x, y, x, y, inner, fill)
+
+
+def paint_capsule(pixels, left, top, x1, y1, x2, y2, radius, color):
+    """
+    Paints, in the given rows of pixels whose top-left pixel is at
+    (left, top) on the Canvas, every pixel whose center is within the
+    given radius of the segment (x1, y1)-(x2, y2).  That is a thick
+    line with round ends or, if the two points are the same, a disk.
+    """
+    size_y = len(pixels)
+    size_x = len(pixels[0])
+    dx = x2 - x1
+    dy = y2 - y1
+    length = math.hypot(dx, dy)
+
+    first_row = max(0, math.ceil(min(y1, y2) - radius - top - 0.5))
+    last_row = min(size_y - 1,
+                   math.floor(max(y1, y2) + radius - top - 0.5))
+    for row in range(first_row, last_row + 1):
+        y = top + row + 0.5
+        # The shape is convex, so on each row it covers one run of
+        # pixels: the union of the runs covered by the two round ends
+        # and by the band between them.
+        low = math.inf
+        high = -math.inf
+        for cx, cy in ((x1, y1), (x2, y2)):
+            h = radius * radius - (y - cy) * (y - cy)
+            if h >= 0:
+                h = math.sqrt(h)
+                low = min(low, cx - h)
+                high = max(high, cx + h)
+        band = None
+        if dx != 0 and dy != 0:
+            band = band_on_row(x1, y1, dx, dy, length, radius, y)
+        elif dy == 0 and dx != 0 and abs(y - y1) <= radius:
+            band = (min(x1, x2), max(x1, x2))
+        elif dx == 0 and dy != 0 and min(y1, y2) <= y <= max(y1, y2):
+            band = (x1 - radius, x1 + radius)
+        if band is not None:
+            low = min(low, band[0])
+            high = max(high, band[1])
+        if low > high:
+            continue
+
+        first_x = max(0, math.ceil(low - left - 0.5))
+        last_x = min(size_x - 1, math.floor(high - left - 0.5))
+        if first_x <= last_x:
+            pixels[row][first_x:last_x + 1] = (
+                [color] * (last_x - first_x + 1))
+
+
+def band_on_row(x1, y1, dx, dy, length, radius, y):
+    """
+    Returns the (low, high) x-values where the horizontal line at height
+    y crosses the band of points that are within   radius   of the
+    segment and whose closest point on it is not an end; or None.
+    """
+    # Along the row, the position t along the segment and the signed
+    # distance d from it are both linear in x:  keep 0 <= t <= 1 and
+    # -radius <= d <= radius.
+    ux = dx / length
+    uy = dy / length
+    low = -math.inf
+    high = math.inf
+    # t * length = (x - x1) * ux + (y - y1) * uy
+    # d          = (x - x1) * uy - (y - y1) * ux
+    for slope, offset, lowest, highest in (
+            (ux, (y - y1) * uy, 0, length),
+            (uy, -(y - y1) * ux, -radius, radius)):
+        a = (lowest - offset) / slope + x1
+        b = (highest - offset) / slope + x1
+        low = max(low, min(a, b))
+        high = min(high, max(a, b))
+    if low > high:
+        return None
+    return low, high
+
+
+# ----------------------------------------------------------------------
+# Benchmark: redraw time as a drawing grows, live versus flattened.
+# ----------------------------------------------------------------------
+def random_stroke_points(width, height):
+    x = random.uniform(0, width)
+    y = random.uniform(0, height)
+    points = [x, y]
+    for _ in range(30):
+        x = min(width, max(0, x + random.uniform(-20, 20)))
+        y = min(height, max(0, y + random.uniform(-20, 20)))
+        points.extend([x, y])
+    return points
+
+
+def time_redraw(canvas, repetitions=5):
+    total = 0
+    for k in range(repetitions):
+        # Changing the background makes Tk redraw the whole Canvas.
+        canvas['background'] = ('lightgray', 'white')[k % 2]
+        start = time.perf_counter()
+        canvas.update_idletasks()
+        total = total + time.perf_counter() - start
+    return total / repetitions
+
+
+def benchmark(number_of_strokes=20000, report_every=5000):
+    root = tkinter.Tk()
+    width, height = 800, 600
+    for flatten in [False, True]:
+        random.seed(120)
+        canvas = tkinter.Canvas(root, width=width, height=height,
+                                background='lightgray')
+        canvas.grid(row=0, column=0)
+        backing = RasterBackingStore(canvas)
+        print('Flattened' if flatten else 'Live items')
+        for k in range(1, number_of_strokes + 1):
+            points = random_stroke_points(width, height)
+            if flatten:
+                backing.add_line(k, points, 'blue', 5)
+            else:
+                canvas.create_line(*points, fill='blue', width=5)
+            if k % report_every == 0:
+                start = time.perf_counter()
+                root.update()  # Lets the backing store paint its tiles
+                seconds_to_flush = time.perf_counter() - start
+                print('  {:6} strokes  {:6} items  '
+                      'paint {:7.3f} s  redraw {:7.4f} s'.format(
+                          k, len(canvas.find_all()), seconds_to_flush,
+                          time_redraw(canvas)))
+        canvas.destroy()
+    root.destroy()
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,404 @@
+"""
+A STROKE ENGINE for drawing on a tkinter.Canvas with the mouse.
+
+A "stroke" is everything the pen draws between pressing the mouse
+button and releasing it.  Each stroke is drawn as ONE Canvas line item
+whose list of points GROWS as the mouse moves.  Compare that to making
+a brand-new two-point line item on every <B1-Motion> event: a long
+drag would then leave tens of thousands of tiny items on the Canvas,
+and the Canvas gets slower to redraw with every item it holds.
+
+Points are added to the end of the line item with the Canvas's
+  insert
+method, which sends only the NEW point to Tk (sending the whole list
+with   coords   on every event would get slower as the stroke grows).
+A very long stroke is split into a few line items, each holding at
+most   max_points_per_item   points, so that no single item gets huge.
+
+Strokes can also be SIMPLIFIED as they are drawn, by giving a
+  tolerance
+(in pixels) greater than 0.  While the mouse moves, a point closer
+than the tolerance to the last point kept is dropped (a "radial
+distance" filter).  When the stroke ends, the Ramer-Douglas-Peucker
+algorithm removes the points that are within the tolerance of the
+straight line between their neighbors.  Either way, the drawn stroke
+stays within about   tolerance   pixels of where the mouse went,
+and a fast mouse no longer produces thousands of points per stroke.
+
+The   MotionCoalescer   class lets a drag handler collect the points of
+many <B1-Motion> events and send them to the stroke all at once, once
+per display frame, instead of calling Tk on every single event.
+
+Run this module directly to see a benchmark that replays a long drag
+both ways and reports the number of Canvas items and the redraw time.
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import tkinter
+import math
+import time
+
+
+class Stroke(object):
+    """ One press-drag-release of the mouse, drawn on a Canvas. """
+
+    def __init__(self, canvas, x, y, color, width,
+                 max_points_per_item=1000, tolerance=0):
+        self.canvas = canvas
+        self.color = color
+        self.width = width
+        self.max_points_per_item = max_points_per_item
+        self.tolerance = tolerance
+
+        self.points = [x, y]  # x0, y0, x1, y1, ... for the whole stroke
+        self.items = []  # Canvas ids of the line items for this stroke
+        self.points_in_last_item = 0
+
+        self.points_in = 1  # Number of points given to this Stroke
+        self.skipped_point = None  # Last point dropped by the filter
+
+    def add_point(self, x, y):
+        """ Extends this Stroke to the given point. """
+        self.add_points([x, y])
+
+    def add_points(self, points):
+        """
+        Extends this Stroke through the given flat list of points
+        [x0, y0, x1, y1, ...], with as few calls to Tk as possible.
+        """
+        self.points_in = self.points_in + len(points) // 2
+        if self.tolerance <= 0:
+            self.skipped_point = None
+            self._draw_points(points)
+            return
+
+        tolerance_squared = self.tolerance * self.tolerance
+        last_x = self.points[-2]
+        last_y = self.points[-1]
+        kept = []
+        for k in range(0, len(points), 2):
+            x = points[k]
+            y = points[k + 1]
+            dx = x - last_x
+            dy = y - last_y
+            if dx * dx + dy * dy < tolerance_squared:
+                self.skipped_point = (x, y)
+            else:
+                self.skipped_point = None
+                kept.append(x)
+                kept.append(y)
+                last_x = x
+                last_y = y
+        self._draw_points(kept)
+
+    def _draw_point(self, x, y):
+        self._draw_points([x, y])
+
+    def _draw_points(self, points):
+        start = 0
+        while start < len(points):
+            if (not self.items or
+                    self.points_in_last_item >= self.max_points_per_item):
+                # Start a new line item at the previous point,
+                # so that the pieces of the stroke join up.
+                room = self.max_points_per_item - 1
+                piece = points[start:start + 2 * room]
+                item = self.canvas.create_line(self.points[-2],
+                                               self.points[-1], *piece,
+                                               fill=self.color,
+                                               width=self.width,
+                                               capstyle=tkinter.ROUND,
+                                               joinstyle=tkinter.ROUND)
+                self.items.append(item)
+                self.points_in_last_item = 1 + len(piece) // 2
+            else:
+                room = self.max_points_per_item - self.points_in_last_item
+                piece = points[start:start + 2 * room]
+                self.canvas.insert(self.items[-1], 'end', piece)
+                self.points_in_last_item = (self.points_in_last_item
+                                            + len(piece) // 2)
+            self.points.extend(piece)
+            start = start + len(piece)
+
+    def finish(self):
+        """
+        Called when the mouse is released.  Makes the stroke end exactly
+        where the mouse did and, if there is a tolerance, simplifies it.
+        """
+        if self.skipped_point is not None:
+            self._draw_point(self.skipped_point[0], self.skipped_point[1])
+            self.skipped_point = None
+
+        if self.tolerance > 0 and len(self.points) > 4:
+            simpler = simplify_points(self.points, self.tolerance)
+            if len(simpler) < len(self.points):
+                self._redraw(simpler)
+
+    def _redraw(self, points):
+        """ Replaces this Stroke's line items with the given points. """
+        self.delete_items()
+        self.points = list(points)
+        if len(self.points) == 2:
+            self.points = self.points + self.points
+
+        # Make each line item with ONE call, each item starting at the
+        # last point of the item before it so that the pieces join up.
+        step = 2 * (self.max_points_per_item - 1)
+        for start in range(0, len(self.points) - 2, step):
+            piece = self.points[start:start + step + 2]
+            item = self.canvas.create_line(*piece,
+                                           fill=self.color,
+                                           width=self.width,
+                                           capstyle=tkinter.ROUND,
+                                           joinstyle=tkinter.ROUND)
+            self.items.append(item)
+            self.points_in_last_item = len(piece) // 2
+
+    def delete_items(self):
+        """ Deletes this Stroke's line items from the Canvas. """
+        if self.items:
+            self.canvas.delete(*self.items)
+        self.items = []
+
+    def number_of_points(self):
+        """ Returns the number of points kept (that is, drawn). """
+        return len(self.points) // 2
+
+
+def simplify_points(points, tolerance):
+    """
+    Returns a copy of the given flat list [x0, y0, x1, y1, ...] with the
+    points removed that are within   tolerance   of the line between the
+    points kept on either side of them (Ramer-Douglas-Peucker).
+    The first and last points are always kept.
+    """
+    n = len(points) // 2
+    keep = [False] * n
+    keep[0] = True
+    keep[n - 1] = True
+    tolerance_squared = tolerance * tolerance
+
+    # Use a list of (first, last) ranges instead of recursion,
+    # because a long stroke could go deeper than Python's recursion limit.
+    ranges = [(0, n - 1)]
+    while ranges:
+        first, last = ranges.pop()
+        x1 = points[2 * first]
+        y1 = points[2 * first + 1]
+        dx = points[2 * last] - x1
+        dy = points[2 * last + 1] - y1
+        length_squared = dx * dx + dy * dy
+
+        farthest = None
+        farthest_distance_squared = tolerance_squared
+        for k in range(first + 1, last):
+            px = points[2 * k] - x1
+            py = points[2 * k + 1] - y1
+            if length_squared == 0:
+                distance_squared = px * px + py * py
+            else:
+                cross = px * dy - py * dx
+                distance_squared = cross * cross / length_squared
+            if distance_squared > farthest_distance_squared:
+                farthest = k
+                farthest_distance_squared = distance_squared
+
+        if farthest is not None:
+            keep[farthest] = True
+            ranges.append((first, farthest))
+            ranges.append((farthest, last))
+
+    simpler = []
+    for k in range(n):
+        if keep[k]:
+            simpler.append(points[2 * k])
+            simpler.append(points[2 * k + 1])
+    return simpler
+
+
+class StrokeEngine(object):
+    """
+    Turns mouse press/drag/release events into Strokes on a Canvas.
+
+    Type hints:
+      :type canvas: tkinter.Canvas
+    """
+
+    def __init__(self, canvas, max_points_per_item=1000, tolerance=0):
+        self.canvas = canvas
+        self.max_points_per_item = max_points_per_item
+        self.tolerance = tolerance
+        self.current_stroke = None
+        self.number_of_strokes = 0
+
+    def begin_stroke(self, x, y, color, width):
+        self.end_stroke()
+        self.current_stroke = Stroke(self.canvas, x, y, color, width,
+                                     self.max_points_per_item,
+                                     self.tolerance)
+
+    def continue_stroke(self, x, y):
+        if self.current_stroke is not None:
+            self.current_stroke.add_point(x, y)
+
+    def end_stroke(self):
+        """ Finishes the current Stroke (if any) and returns it. """
+        stroke = self.current_stroke
+        self.current_stroke = None
+        if stroke is not None:
+            stroke.finish()
+            self.number_of_strokes = self.number_of_strokes + 1
+        return stroke
+
+    def extend_stroke(self, points):
+        """ Continues the stroke through a flat list [x0, y0, ...]. """
+        if self.current_stroke is not None:
+            self.current_stroke.add_points(points)
+
+    def is_drawing(self):
+        return self.current_stroke is not None
+
+
+class MotionCoalescer(object):
+    """
+    Collects the points of mouse-motion events and hands them ALL to
+    the given function at most once per display frame (about 60 times
+    per second), instead of once per event.  A mouse that reports
+    1000 times per second then causes about 60 updates per second.
+
+    Type hints:
+      :type widget: tkinter.Widget
+    """
+
+    def __init__(self, widget, flush_function, milliseconds_per_frame=16):
+        self.widget = widget
+        self.flush_function = flush_function
+        self.milliseconds_per_frame = milliseconds_per_frame
+        self.points = []
+        self.after_id = None
+        self.events_received = 0
+        self.flushes_performed = 0
+
+    def add(self, x, y):
+        """ Adds the point of a motion event, to be flushed soon. """
+        self.events_received = self.events_received + 1
+        self.points.append(x)
+        self.points.append(y)
+        if self.after_id is None:
+            self.after_id = self.widget.after(self.milliseconds_per_frame,
+                                              self._on_timer)
+
+    def _on_timer(self):
+        self.after_id = None
+        self.flush()
+
+    def flush(self):
+        """ Hands all the points collected so far to the function. """
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+        if self.points:
+            points = self.points
+            self.points = []
+            self.flush_function(points)
+            self.flushes_performed = self.flushes_performed + 1
+
+
+# ----------------------------------------------------------------------
+# Benchmark: replays a long drag with the one-line-per-event approach
+# and with the StrokeEngine, then reports items and redraw times.
+# ----------------------------------------------------------------------
+def make_drag_path(number_of_points, width, height):
+    """ Returns a list of (x, y) points: a spiral that fills the area. """
+    points = []
+    center_x = width / 2
+    center_y = height / 2
+    for k in range(number_of_points):
+        angle = k * 0.05
+        radius = (k % 5000) / 5000 * (min(width, height) / 2 - 10)
+        points.append((int(center_x + radius * math.cos(angle)),
+                       int(center_y + radius * math.sin(angle))))
+    return points
+
+
+def time_redraw(canvas, repetitions=5):
+    """ Returns the average seconds for the Canvas to redraw entirely. """
+    total = 0
+    for k in range(repetitions):
+        # Changing the background makes Tk redraw the whole Canvas.
+        canvas['background'] = ('lightgray', 'white')[k % 2]
+        start = time.perf_counter()
+        canvas.update_idletasks()
+        total = total + time.perf_counter() - start
+    return total / repetitions
+
+
+def draw_one_line_per_event(canvas, path):
+    previous = path[0]
+    for point in path[1:]:
+        canvas.create_line(previous[0], previous[1], point[0], point[1],
+                           fill='blue', width=5)
+        previous = point
+
+
+def draw_with_stroke_engine(canvas, path, tolerance=0):
+    engine = StrokeEngine(canvas, tolerance=tolerance)
+    engine.begin_stroke(path[0][0], path[0][1], 'blue', 5)
+    for point in path[1:]:
+        engine.continue_stroke(point[0], point[1])
+    stroke = engine.end_stroke()
+    print('  {:20}  {:7} points in, {:7} points out'
+          .format('', stroke.points_in, stroke.number_of_points()))
+
+
+def draw_with_simplified_strokes(canvas, path):
+    draw_with_stroke_engine(canvas, path, tolerance=1.5)
+
+
+def draw_with_coalesced_motion(canvas, path):
+    # A 1000 Hz mouse sends about 16 motion events per 60 Hz frame,
+    # and a MotionCoalescer hands each frame's points over at once.
+    engine = StrokeEngine(canvas, tolerance=1.5)
+    engine.begin_stroke(path[0][0], path[0][1], 'blue', 5)
+    batch = []
+    for point in path[1:]:
+        batch.extend(point)
+        if len(batch) == 2 * 16:
+            engine.extend_stroke(batch)
+            batch = []
+    engine.extend_stroke(batch)
+    engine.end_stroke()
+
+
+def benchmark(number_of_points=100000):
+    root = tkinter.Tk()
+    canvas = tkinter.Canvas(root, width=800, height=600,
+                            background='lightgray')
+    canvas.grid()
+    root.update()
+
+    path = make_drag_path(number_of_points, 800, 600)
+    print('Replaying a drag of {} points'.format(number_of_points))
+
+    for name, draw in [('One line per event', draw_one_line_per_event),
+                       ('Stroke engine', draw_with_stroke_engine),
+                       ('Simplified strokes', draw_with_simplified_strokes),
+                       ('Coalesced motion', draw_with_coalesced_motion)]:
+        canvas.delete('all')
+        start = time.perf_counter()
+        draw(canvas, path)
+        canvas.update_idletasks()
+        seconds_to_draw = time.perf_counter() - start
+
+        items = len(canvas.find_all())
+        seconds_to_redraw = time_redraw(canvas)
+        print('  {:20}  {:7} items   draw {:7.3f} s   redraw {:7.4f} s'
+              .format(name, items, seconds_to_draw, seconds_to_redraw))
+
+    root.destroy()
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,339 @@
+"""
+A zoomable, pannable VIEWPORT onto a drawing on a tkinter.Canvas.
+
+The drawing is kept in WORLD coordinates.  The viewport decides which
+part of the world is shown on the Canvas, and how big:
+  screen_x = (world_x - left) * scale
+  screen_y = (world_y - top) * scale
+
+To stay fast on drawings with millions of points, the viewport:
+  -- CULLS: only the shapes inside the view get Canvas items, found
+       with the SpatialIndex of the   canvas_index   module.
+  -- Uses LEVELS OF DETAIL: when zoomed out, a stroke is drawn with
+       a simplified copy of its points (see   simplify_points   in the
+       canvas_strokes   module), made once per zoom level and kept.
+  -- Redraws at most once per idle time: while the user pans or zooms,
+       the items already on the Canvas are just moved or scaled by Tk,
+       and the culling and level of detail catch up when Tk is idle.
+
+Shapes are the same tuples as in the   canvas_file   module:
+  ('line', points, color, width)
+  ('dot', x, y, radius, fill, outline, outline_width)
+each with a key that you choose, as in the SpatialIndex.
+
+Run this module directly to see a benchmark of zooming and panning
+around a drawing with millions of points.
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import tkinter
+import math
+import random
+import time
+from canvas_index import SpatialIndex
+from canvas_strokes import simplify_points
+
+
+class Viewport(object):
+    """
+    Draws the visible part of a set of shapes on a Canvas.
+
+    Type hints:
+      :type canvas: tkinter.Canvas
+      :type backing_store: canvas_raster.RasterBackingStore
+    """
+
+    def __init__(self, canvas, backing_store=None,
+                 smallest_scale=1 / 64, largest_scale=64):
+        self.canvas = canvas
+        # While the view is not zoomed or panned, shapes that have been
+        # flattened into this RasterBackingStore are not drawn as items.
+        self.backing_store = backing_store
+        self.smallest_scale = smallest_scale
+        self.largest_scale = largest_scale
+
+        self.left = 0
+        self.top = 0
+        self.scale = 1
+
+        self.shapes = {}  # key -> shape
+        self.order_of_key = {}  # key -> when it was added: 0, 1, 2, ...
+        self.number_added = 0
+        self.index = SpatialIndex(cell_size=256)
+        self.items_of_key = {}  # key -> Canvas items, for shapes shown
+        self.simpler_points = {}  # (key, level) -> simplified points
+        self.view_change_functions = []
+        self.is_render_scheduled = False
+        self.is_zoom_pending = False
+        self.was_identity = True
+        self.number_of_renders = 0
+
+    # ------------------------------------------------------------------
+    # Converting between world and screen (Canvas) coordinates.
+    # ------------------------------------------------------------------
+    def to_world(self, x, y):
+        return (x / self.scale + self.left, y / self.scale + self.top)
+
+    def to_screen(self, x, y):
+        return ((x - self.left) * self.scale, (y - self.top) * self.scale)
+
+    def to_world_points(self, points):
+        """ Converts a flat list of screen points [x0, y0, ...]. """
+        world = []
+        for k in range(0, len(points), 2):
+            world.extend(self.to_world(points[k], points[k + 1]))
+        return world
+
+    def is_identity(self):
+        """ Returns True if world and screen coordinates are the same. """
+        return self.scale == 1 and self.left == 0 and self.top == 0
+
+    def world_rectangle(self):
+        """ Returns (left, top, right, bottom) of the view, in the world. """
+        # Before the Canvas is on the screen, its size is 1 x 1,
+        # so use the size that it asked for instead.
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            width = self.canvas.winfo_reqwidth()
+            height = self.canvas.winfo_reqheight()
+        right, bottom = self.to_world(width, height)
+        return self.left, self.top, right, bottom
+
+    # ------------------------------------------------------------------
+    # Adding and removing shapes.
+    # ------------------------------------------------------------------
+    def add_shape(self, key, shape):
+        """ Adds the given shape and draws it, if it is in the view. """
+        self.remove(key)
+        self.shapes[key] = shape
+        self.order_of_key[key] = self.number_added
+        self.number_added = self.number_added + 1
+        if shape[0] == 'dot':
+            x, y, radius = shape[1], shape[2], shape[3]
+            reach = radius + shape[6] / 2
+            self.index.add_oval(key, x - reach, y - reach,
+                                x + reach, y + reach)
+        else:
+            self.index.add_line(key, shape[1], shape[3])
+
+        left, top, right, bottom = self.world_rectangle()
+        if self.index.overlaps(key, left, top, right, bottom):
+            self._draw(key)
+
+    def remove(self, key):
+        """ Removes the shape with the given key, if there is one. """
+        if key not in self.shapes:
+            return
+        self._undraw(key)
+        del self.shapes[key]
+        del self.order_of_key[key]
+        self.index.remove(key)
+        top_level = math.floor(math.log2(1 / self.smallest_scale))
+        for level in range(top_level + 1):
+            self.simpler_points.pop((key, level), None)
+
+    # ------------------------------------------------------------------
+    # Zooming and panning.
+    # ------------------------------------------------------------------
+    def zoom(self, factor, screen_x, screen_y):
+        """
+        Zooms in (factor > 1) or out (factor < 1), keeping the world
+        point at the given screen point where it is.
+        """
+        new_scale = min(self.largest_scale,
+                        max(self.smallest_scale, self.scale * factor))
+        factor = new_scale / self.scale
+        if factor == 1:
+            return
+        world_x, world_y = self.to_world(screen_x, screen_y)
+        self.scale = new_scale
+        self.left = world_x - screen_x / new_scale
+        self.top = world_y - screen_y / new_scale
+
+        # Scale what is already drawn right away; re-draw properly later.
+        self.canvas.scale('viewport', screen_x, screen_y, factor, factor)
+        self.is_zoom_pending = True
+        self._view_changed()
+
+    def pan(self, screen_dx, screen_dy):
+        """ Moves the drawing by the given number of screen pixels. """
+        self.left = self.left - screen_dx / self.scale
+        self.top = self.top - screen_dy / self.scale
+        self.canvas.move('viewport', screen_dx, screen_dy)
+        self._view_changed()
+
+    def reset(self):
+        """ Goes back to showing the world at (0, 0) at its actual size. """
+        self.left = 0
+        self.top = 0
+        self.scale = 1
+        self.is_zoom_pending = True
+        self._view_changed()
+
+    def render(self):
+        """
+        Makes the Canvas items match the view: deletes the items of
+        shapes that left the view and draws those that entered it
+        (or all of them, after a zoom).
+        """
+        self.is_render_scheduled = False
+        self.number_of_renders = self.number_of_renders + 1
+        identity = self.is_identity()
+        if self.is_zoom_pending or identity != self.was_identity:
+            # Flattened shapes are drawn as items only when the view is
+            # zoomed or panned, so going to or from that also redraws.
+            self.is_zoom_pending = False
+            self.was_identity = identity
+            for key in list(self.items_of_key):
+                self._undraw(key)
+            if self.backing_store is not None:
+                state = 'normal' if identity else 'hidden'
+                self.canvas.itemconfigure('backing', state=state)
+
+        left, top, right, bottom = self.world_rectangle()
+        visible = set(self.index.find_in_rectangle(left, top, right, bottom))
+        for key in list(self.items_of_key):
+            if key not in visible:
+                self._undraw(key)
+        # Draw the new shapes in the order they were added, so that
+        # later shapes are on top of earlier ones.
+        new_keys = [key for key in visible if key not in self.items_of_key]
+        for key in sorted(new_keys, key=self.order_of_key.get):
+            self._draw(key)
+
+        for function in self.view_change_functions:
+            function(left, top, right, bottom)
+
+    def on_view_change(self, function):
+        """
+        Calls the given function with the (left, top, right, bottom)
+        of the view in the world, each time the view has changed.
+        """
+        self.view_change_functions.append(function)
+
+    def number_of_items(self):
+        """ Returns the number of Canvas items the viewport is showing. """
+        return sum(len(items) for items in self.items_of_key.values())
+
+    # ------------------------------------------------------------------
+    # The rest of this class is helpers for the methods above.
+    # ------------------------------------------------------------------
+    def _view_changed(self):
+        if not self.is_render_scheduled:
+            self.is_render_scheduled = True
+            self.canvas.after_idle(self.render)
+
+    def _draw(self, key):
+        if (self.backing_store is not None and key in self.backing_store
+                and self.is_identity()):
+            self.items_of_key[key] = []  # Shown by the backing store
+            return
+
+        shape = self.shapes[key]
+        scale = self.scale
+        if shape[0] == 'dot':
+            x, y = self.to_screen(shape[1], shape[2])
+            radius = shape[3] * scale
+            item = self.canvas.create_oval(x - radius, y - radius,
+                                           x + radius, y + radius,
+                                           fill=shape[4], outline=shape[5],
+                                           width=max(1, shape[6] * scale),
+                                           tags=('viewport',))
+        else:
+            points = self._points_for_scale(key, shape[1])
+            screen = []
+            for k in range(0, len(points), 2):
+                screen.append((points[k] - self.left) * scale)
+                screen.append((points[k + 1] - self.top) * scale)
+            if len(screen) == 2:
+                screen = screen + screen
+            item = self.canvas.create_line(*screen, fill=shape[2],
+                                           width=max(1, shape[3] * scale),
+                                           capstyle=tkinter.ROUND,
+                                           joinstyle=tkinter.ROUND,
+                                           tags=('viewport',))
+        self.items_of_key[key] = [item]
+
+    def _undraw(self, key):
+        items = self.items_of_key.pop(key, [])
+        if items:
+            self.canvas.delete(*items)
+
+    def _points_for_scale(self, key, points):
+        # Level k means "zoomed out by 2 ** k or more", and its points
+        # are simplified to within 2 ** k world units, which is less
+        # than a pixel on the screen.
+        if self.scale >= 1 or len(points) <= 4:
+            return points
+        level = math.floor(math.log2(1 / self.scale))
+        if (key, level) not in self.simpler_points:
+            self.simpler_points[(key, level)] = simplify_points(points,
+                                                                2 ** level)
+        return self.simpler_points[(key, level)]
+
+
+# ----------------------------------------------------------------------
+# Benchmark: zooms and pans around a drawing with millions of points.
+# ----------------------------------------------------------------------
+def random_drawing(number_of_strokes, points_per_stroke, size):
+    random.seed(120)
+    shapes = []
+    for _ in range(number_of_strokes):
+        x = random.uniform(0, size)
+        y = random.uniform(0, size)
+        points = []
+        for _ in range(points_per_stroke):
+            x = x + random.uniform(-3, 3)
+            y = y + random.uniform(-3, 3)
+            points.extend([x, y])
+        shapes.append(('line', points, random.choice(['blue', 'red']), 5))
+    return shapes
+
+
+def time_frame(root, viewport):
+    """ Returns the seconds to render the view and let Tk draw it. """
+    start = time.perf_counter()
+    root.update()
+    viewport.render()
+    root.update()
+    return time.perf_counter() - start
+
+
+def benchmark(number_of_strokes=20000, points_per_stroke=100):
+    root = tkinter.Tk()
+    canvas = tkinter.Canvas(root, width=800, height=600,
+                            background='lightgray')
+    canvas.grid()
+    root.update()
+
+    viewport = Viewport(canvas)
+    shapes = random_drawing(number_of_strokes, points_per_stroke, 20000)
+    start = time.perf_counter()
+    for key in range(len(shapes)):
+        viewport.add_shape(key, shapes[key])
+    print('Added {} points in {} strokes in {:.2f} s'.format(
+        number_of_strokes * points_per_stroke, number_of_strokes,
+        time.perf_counter() - start))
+
+    for name, action in [
+            ('Start', lambda: None),
+            ('Pan 200 pixels', lambda: viewport.pan(200, 100)),
+            ('Zoom out x4', lambda: viewport.zoom(1 / 4, 400, 300)),
+            ('Zoom out x4 again', lambda: viewport.zoom(1 / 4, 400, 300)),
+            ('Pan 200 pixels', lambda: viewport.pan(200, 100)),
+            ('Zoom out x2', lambda: viewport.zoom(1 / 2, 400, 300)),
+            ('Zoom in x16', lambda: viewport.zoom(16, 400, 300))]:
+        action()
+        seconds = time_frame(root, viewport)
+        print('  {:20}  scale {:8.4f}  {:6} items  {:7.1f} ms'.format(
+            name, viewport.scale, viewport.number_of_items(),
+            seconds * 1000))
+
+    root.destroy()
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,123 @@
+"""
+Sending drive commands to a robot in a compact BINARY form.
+
+As text, a command like  {"command": "forward", "left": 600,
+"right": 600}  takes 50 bytes, and it must be parsed to be read.
+Here, every command is a FRAME of exactly 5 bytes:
+  opcode (1 byte: which command, see OPCODES below),
+  left wheel speed (2 bytes), right wheel speed (2 bytes),
+where the speeds are whole numbers from -32768 to 32767, with their
+bytes in "network order" (biggest first).  Several commands can be sent
+together, one frame after the other, as a BATCH.
+
+Run this module directly to compare the time to encode and decode,
+and the number of bytes, with the same commands as JSON text.
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import json
+import random
+import struct
+import time
+
+FRAME = struct.Struct('>Bhh')  # opcode, left speed, right speed
+
+OPCODES = {'stop': 0, 'forward': 1, 'back': 2, 'left': 3, 'right': 4,
+           'up': 5, 'down': 6, 'quit': 7}
+COMMANDS = {}  # opcode -> command, the reverse of OPCODES
+for _command, _opcode in OPCODES.items():
+    COMMANDS[_opcode] = _command
+
+
+def encode_command(command, left_speed=0, right_speed=0):
+    """ Returns the 5-byte frame for the given command and speeds. """
+    try:
+        return FRAME.pack(OPCODES[command], left_speed, right_speed)
+    except KeyError:
+        raise ValueError('unknown command: ' + repr(command))
+    except struct.error:
+        raise ValueError('speeds must be whole numbers from -32768 to'
+                         ' 32767, not {} and {}'.format(left_speed,
+                                                        right_speed))
+
+
+def decode_command(frame):
+    """ Returns (command, left_speed, right_speed) from a 5-byte frame. """
+    opcode, left_speed, right_speed = FRAME.unpack(frame)
+    return COMMANDS[opcode], left_speed, right_speed
+
+
+def encode_commands(commands):
+    """
+    Returns one batch of frames for the given sequence of
+    (command, left_speed, right_speed) triples.
+    """
+    batch = bytearray(FRAME.size * len(commands))
+    pack_into = FRAME.pack_into
+    offset = 0
+    try:
+        for command, left_speed, right_speed in commands:
+            pack_into(batch, offset, OPCODES[command], left_speed,
+                      right_speed)
+            offset = offset + FRAME.size
+    except (KeyError, struct.error):
+        # Let encode_command say exactly what was wrong.
+        encode_command(command, left_speed, right_speed)
+        raise
+    return bytes(batch)
+
+
+def decode_commands(batch):
+    """ Returns a list of (command, left_speed, right_speed) triples. """
+    if len(batch) % FRAME.size != 0:
+        raise ValueError('a batch must be a whole number of {}-byte'
+                         ' frames'.format(FRAME.size))
+    return [(COMMANDS[opcode], left_speed, right_speed)
+            for opcode, left_speed, right_speed in FRAME.iter_unpack(batch)]
+
+
+# ----------------------------------------------------------------------
+# Benchmark: binary frames versus JSON text, for a batch of commands.
+# ----------------------------------------------------------------------
+def random_commands(number_of_commands):
+    random.seed(120)
+    names = list(OPCODES)
+    return [(random.choice(names), random.randint(-900, 900),
+             random.randint(-900, 900)) for _ in range(number_of_commands)]
+
+
+def benchmark(number_of_commands=100000):
+    commands = random_commands(number_of_commands)
+
+    def encode_json(commands):
+        return json.dumps([{'command': command, 'left': left,
+                            'right': right}
+                           for command, left, right in commands]).encode()
+
+    def decode_json(data):
+        return [(item['command'], item['left'], item['right'])
+                for item in json.loads(data)]
+
+    print('{} commands:'.format(number_of_commands))
+    for name, encode, decode in [('binary', encode_commands, decode_commands),
+                                 ('JSON', encode_json, decode_json)]:
+        start = time.perf_counter()
+        data = encode(commands)
+        seconds_to_encode = time.perf_counter() - start
+
+        start = time.perf_counter()
+        decoded = decode(data)
+        seconds_to_decode = time.perf_counter() - start
+
+        assert decoded == commands
+        print('  {:6}  {:6.2f} bytes each,  encode {:5.2f} M/s,'
+              '  decode {:5.2f} M/s'.format(
+                  name, len(data) / number_of_commands,
+                  number_of_commands / seconds_to_encode / 1000000,
+                  number_of_commands / seconds_to_decode / 1000000))
+
+
+if __name__ == '__main__':
+    benchmark()
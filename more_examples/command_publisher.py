@@ -0,0 +1,174 @@
+"""
+Sending drive commands to a robot WITHOUT flooding the link.
+
+While a key is held down, the operating system repeats it, 30 or more
+times a second, so a   bind   on   <Up>   runs over and over.  Sending
+a command each time would fill the link to the robot with copies of
+the same command.  A CommandPublisher instead:
+  -- Sends a command only when it CHANGES what the robot should do.
+       Holding   <Up>   sends "forward" once.
+  -- Sends at most one command every   milliseconds_between_sends   on
+       each CHANNEL (for example, one channel for the wheels and one
+       for the arm).  If commands change faster than that, only the
+       latest one is sent, when its turn comes.
+  -- Sends a STOP command right away, without waiting its turn.
+and it counts the commands it sent and the ones it did not need to.
+
+Run this module directly to see how many commands a held key sends.
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import tkinter
+import time
+
+
+class CommandPublisher(object):
+    """
+    Decides which commands are worth sending, and sends them by calling
+    send_function(command).
+
+    Type hints:
+      :type widget: tkinter.Widget
+    """
+
+    def __init__(self, widget, send_function, milliseconds_between_sends=100,
+                 stop_commands=('stop',)):
+        self.widget = widget
+        self.send_function = send_function
+        self.milliseconds_between_sends = milliseconds_between_sends
+        self.stop_commands = stop_commands
+
+        self.last_sent = {}  # channel -> the command last sent on it
+        self.last_send_time = {}  # channel -> when it was sent
+        self.pending = {}  # channel -> the command waiting for its turn
+        self.after_ids = {}  # channel -> the after() that will send it
+
+        self.number_sent = 0
+        self.number_suppressed = 0
+
+    def publish(self, channel, command):
+        """
+        Asks for the given command to be sent on the given channel.
+        Commands can be anything that can be compared with ==.  A command
+        can also be a tuple, like   ('forward', 600, 600), whose first
+        item is its name (checked against   stop_commands); a change in
+        any of its items is a change in what the robot should do.
+        """
+        if command_name(command) in self.stop_commands:
+            # A stop skips the wait, but holding the stop key down
+            # still sends just one.
+            if (command == self.last_sent.get(channel)
+                    and channel not in self.pending):
+                self.number_suppressed = self.number_suppressed + 1
+                return
+            self._cancel_pending(channel)
+            self._send(channel, command)
+            return
+
+        latest = self.pending.get(channel, self.last_sent.get(channel))
+        if command == latest:
+            # The robot is already doing it, or is about to.
+            self.number_suppressed = self.number_suppressed + 1
+            return
+        if command == self.last_sent.get(channel):
+            # Back to what was last sent, so nothing needs sending.
+            self._cancel_pending(channel)
+            self.number_suppressed = self.number_suppressed + 1
+            return
+        if channel in self.pending:
+            # The pending command is replaced, and will never be sent.
+            self.number_suppressed = self.number_suppressed + 1
+
+        seconds_to_wait = self._seconds_until_turn(channel)
+        if seconds_to_wait <= 0 and channel not in self.pending:
+            self._send(channel, command)
+            return
+
+        self.pending[channel] = command
+        if channel not in self.after_ids:
+            self.after_ids[channel] = self.widget.after(
+                max(1, round(seconds_to_wait * 1000)),
+                lambda: self._send_pending(channel))
+
+    def flush(self):
+        """ Sends every pending command now. """
+        for channel in list(self.pending):
+            self._send_pending(channel)
+
+    def report(self):
+        total = self.number_sent + self.number_suppressed
+        return '{} commands asked for: {} sent, {} suppressed'.format(
+            total, self.number_sent, self.number_suppressed)
+
+    # ------------------------------------------------------------------
+    # The rest of this class is helpers for the methods above.
+    # ------------------------------------------------------------------
+    def _seconds_until_turn(self, channel):
+        if channel not in self.last_send_time:
+            return 0
+        next_time = (self.last_send_time[channel]
+                     + self.milliseconds_between_sends / 1000)
+        return next_time - time.perf_counter()
+
+    def _send(self, channel, command):
+        self.last_sent[channel] = command
+        self.last_send_time[channel] = time.perf_counter()
+        self.number_sent = self.number_sent + 1
+        self.send_function(command)
+
+    def _send_pending(self, channel):
+        if channel in self.after_ids:
+            self.widget.after_cancel(self.after_ids.pop(channel))
+        if channel in self.pending:
+            self._send(channel, self.pending.pop(channel))
+
+    def _cancel_pending(self, channel):
+        if channel in self.pending:
+            del self.pending[channel]
+            self.number_suppressed = self.number_suppressed + 1
+        if channel in self.after_ids:
+            self.widget.after_cancel(self.after_ids.pop(channel))
+
+
+def command_name(command):
+    """ Returns the name of a command: its first item, if a tuple. """
+    if isinstance(command, tuple):
+        return command[0]
+    return command
+
+
+# ----------------------------------------------------------------------
+# Benchmark: holds down keys (repeated 30 times a second, as the
+# operating system does), and counts the commands sent.
+# ----------------------------------------------------------------------
+def benchmark():
+    root = tkinter.Tk()
+    sent = []
+    publisher = CommandPublisher(root, sent.append)
+
+    # (seconds the key is held, command) for a short drive.
+    presses = [(3, 'forward'), (0.5, 'left'), (2, 'forward'),
+               (0.1, 'right'), (0.1, 'left'), (0.1, 'right'),
+               (0.1, 'left'), (1, 'back'), (0.2, 'stop'), (1, 'stop')]
+    events = []
+    start = 0
+    for seconds, command in presses:
+        for k in range(max(1, round(seconds * 30))):
+            events.append((start + k / 30, command))
+        start = start + seconds
+
+    for when, command in events:
+        root.after(round(when * 1000),
+                   lambda c=command: publisher.publish('drive', c))
+    root.after(round(start * 1000) + 200, root.destroy)
+    root.mainloop()
+
+    print('Sending every key event:  {} commands'.format(len(events)))
+    print('CommandPublisher:         ' + publisher.report())
+    print('Commands sent:            ' + ', '.join(sent))
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,189 @@
+"""
+Choosing the function that handles an event with a TABLE (a dict),
+instead of with if/elif statements, and TIMING each function.
+
+A Dispatcher keeps a dict whose keys are
+  (event type, detail, widget)
+where the detail is the key (its keysym) for key events and the mouse
+button number for button events, and whose values are the handlers.
+When an event comes, one dict lookup finds its handler, no matter how
+many there are.  (A handler registered with no detail handles every
+key, or every button, that has no handler of its own.)
+
+Each time a handler runs, the Dispatcher counts it and times it.
+Its   report   method shows, for each handler, the number of calls and
+how long they took in all, on average, in the middle (median), nearly
+at worst (the 99th percentile) and at worst, slowest handlers first.
+
+Run this module directly to time a few handlers.
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import tkinter
+import collections
+import time
+
+EVENT_TYPES = {'Key': 'KeyPress', 'KeyPress': 'KeyPress',
+               'KeyRelease': 'KeyRelease', 'Button': 'ButtonPress',
+               'ButtonPress': 'ButtonPress',
+               'ButtonRelease': 'ButtonRelease'}
+
+
+class HandlerTimes(object):
+    """ The number of calls of a handler, and how long they took. """
+
+    def __init__(self, samples_kept=10000):
+        self.number_of_calls = 0
+        self.total_seconds = 0
+        self.worst_seconds = 0
+        self.recent = collections.deque(maxlen=samples_kept)
+
+    def add(self, seconds):
+        self.number_of_calls = self.number_of_calls + 1
+        self.total_seconds = self.total_seconds + seconds
+        self.worst_seconds = max(self.worst_seconds, seconds)
+        self.recent.append(seconds)
+
+    def percentile(self, percent):
+        """ Of the recent calls, in seconds (percent is 0 to 100). """
+        if not self.recent:
+            return 0
+        times = sorted(self.recent)
+        return times[min(len(times) - 1, int(len(times) * percent / 100))]
+
+
+class Dispatcher(object):
+    """ Runs the handler registered for each event, and times it. """
+
+    def __init__(self):
+        self.handlers = {}  # (type, detail, widget name) -> (name, handler)
+        self.times = {}  # name of handler -> HandlerTimes
+
+    def bind(self, widget, sequence, handler, name=None):
+        """
+        Like   widget.bind(sequence, handler), for sequences like
+          '<Return>', '<Key-u>', '<KeyRelease-space>', '<Button-1>'
+        but the handler is found in this Dispatcher's table.
+        The name is used in the report; it defaults to the sequence
+        and the widget.
+        """
+        event_type, detail = parse_sequence(sequence)
+        if name is None:
+            name = '{} on {}'.format(sequence, widget)
+        self.register(event_type, detail, widget, handler, name)
+        widget.bind(sequence, self.dispatch)
+
+    def register(self, event_type, detail, widget, handler, name):
+        """
+        Makes the handler handle events of the given type ('KeyPress',
+        'ButtonPress', ...) with the given detail (a keysym, a button
+        number, or None for any) that happen on the given widget.
+        """
+        self.handlers[(event_type, detail, str(widget))] = (name, handler)
+        if name not in self.times:
+            self.times[name] = HandlerTimes()
+
+    def dispatch(self, event):
+        """ Runs (and times) the handler for the event, if there is one. """
+        # str(event.type) would be the type's number, for example '2'.
+        # (Tk events of a type that tkinter does not know have a string.)
+        event_type = getattr(event.type, 'name', event.type)
+        if event_type in ('KeyPress', 'KeyRelease'):
+            detail = event.keysym
+        else:
+            detail = event.num
+        widget = str(event.widget)
+        found = self.handlers.get((event_type, detail, widget))
+        if found is None:
+            found = self.handlers.get((event_type, None, widget))
+            if found is None:
+                return None
+
+        start = time.perf_counter()
+        result = found[1](event)
+        self.times[found[0]].add(time.perf_counter() - start)
+        return result  # So that a handler can return 'break'
+
+    def report(self):
+        """ Returns a table of the handlers' times, slowest first. """
+        lines = ['{:40}  {:>7}  {:>10}  {:>9}  {:>9}  {:>9}  {:>9}'.format(
+            'handler', 'calls', 'total ms', 'mean us', 'median us',
+            'p99 us', 'worst us')]
+        names = sorted(self.times, reverse=True,
+                       key=lambda name: self.times[name].total_seconds)
+        for name in names:
+            times = self.times[name]
+            mean = times.total_seconds / max(1, times.number_of_calls)
+            lines.append('{:40}  {:7}  {:10.2f}  {:9.1f}  {:9.1f}  {:9.1f}'
+                         '  {:9.1f}'.format(
+                             name[:40], times.number_of_calls,
+                             times.total_seconds * 1000, mean * 1000000,
+                             times.percentile(50) * 1000000,
+                             times.percentile(99) * 1000000,
+                             times.worst_seconds * 1000000))
+        return '\n'.join(lines)
+
+
+def parse_sequence(sequence):
+    """
+    Returns (event type, detail) for an event sequence like '<Key-u>':
+    ('KeyPress', 'u').  A button's detail is its number, as an int.
+    """
+    parts = sequence.strip('<>').split('-')
+    if parts[0] in EVENT_TYPES:
+        event_type = EVENT_TYPES[parts[0]]
+        detail = '-'.join(parts[1:]) or None
+    else:
+        event_type = 'KeyPress'  # For example, '<Return>' or '<u>'
+        detail = '-'.join(parts)
+    if detail is not None and event_type.startswith('Button'):
+        detail = int(detail)
+    return event_type, detail
+
+
+# ----------------------------------------------------------------------
+# Benchmark: dispatches many events to a few handlers, and shows the
+# report.  (No window is needed: the events are made up.)
+# ----------------------------------------------------------------------
+class MadeUpEvent(object):
+    def __init__(self, event_type, widget, keysym='??', num='??'):
+        self.type = event_type
+        self.widget = widget
+        self.keysym = keysym
+        self.num = num
+
+
+def benchmark(number_of_events=100000):
+    dispatcher = Dispatcher()
+    total = [0]
+
+    def add_one(event):
+        total[0] = total[0] + 1
+
+    def slow(event):
+        total[0] = total[0] + sum(range(2000))
+
+    for keysym in 'abcdefghijklmnopqrstuvwxyz':
+        dispatcher.register('KeyPress', keysym, '.button', add_one,
+                            'add_one (a to z)')
+    dispatcher.register('KeyPress', 'Return', '.entry', slow, 'slow')
+    dispatcher.register('ButtonPress', None, '.button', add_one,
+                        'add_one (any button)')
+
+    events = [MadeUpEvent(tkinter.EventType.KeyPress, '.button', keysym='q'),
+              MadeUpEvent(tkinter.EventType.KeyPress, '.entry',
+                          keysym='Return'),
+              MadeUpEvent(tkinter.EventType.ButtonPress, '.button', num=3)]
+    start = time.perf_counter()
+    for k in range(number_of_events):
+        dispatcher.dispatch(events[k % 3])
+    seconds = time.perf_counter() - start
+    print('{} events dispatched in {:.1f} ms'.format(number_of_events,
+                                                     seconds * 1000))
+    print(dispatcher.report())
+
+
+if __name__ == '__main__':
+    benchmark()
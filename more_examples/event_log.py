@@ -0,0 +1,188 @@
+"""
+Printing from event handlers WITHOUT slowing them down.
+
+print   writes to the Console right away, and the Console can be slow:
+while it writes, the event loop waits, and key presses and mouse
+motion pile up.  An EventLog's   log   method takes the same arguments
+as   print, and turns them into text just as print does, but it only
+puts that text in a queue, which is very fast.  Another thread, the
+WRITER, wakes up every   flush_seconds   and writes everything in the
+queue all at once, either:
+  -- to the Console (sys.stdout), or
+  -- to a file that is "rotated" when it gets too big: the file is
+       renamed to   name.1   (and   name.1   to   name.2, and so on,
+       keeping   backup_count   old files) and a new file is started.
+
+Call   close   at the end, to write what is still in the queue.
+If writing fails (for example, the disk is full), the writer prints
+why on sys.stderr, drops what it could not write, and keeps going.
+
+Run this module directly to compare the time an event handler takes,
+with   print   and with an EventLog.
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import collections
+import os
+import sys
+import tempfile
+import threading
+import time
+
+
+class EventLog(object):
+    """ A print-like log that is written by another thread, in batches. """
+
+    def __init__(self, filename=None, max_bytes=1000000, backup_count=3,
+                 flush_seconds=0.05):
+        self.filename = filename
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_seconds = flush_seconds
+
+        if filename is None:
+            self.file = sys.stdout
+        else:
+            self.file = open(filename, 'a', encoding='utf-8')
+        # Bytes in the file now (the writer thread keeps this up to date).
+        self.bytes_in_file = 0
+        if filename is not None:
+            self.bytes_in_file = os.path.getsize(filename)
+        # Appending to, and popping from, a deque is safe across threads.
+        self.queue = collections.deque()
+        self.is_closed = False
+        self.is_done = threading.Event()
+        self.number_logged = 0
+        self.number_of_writes = 0
+        self.number_of_errors = 0
+
+        self.writer = threading.Thread(target=self._write_forever,
+                                       daemon=True)
+        self.writer.start()
+
+    def log(self, *values, sep=' ', end='\n'):
+        """ Like print, but returns at once; the writing is done later. """
+        # Make the text now, while the values are as they are now (and
+        # so that a value that cannot be made into text fails here).
+        self.queue.append(sep.join([str(value) for value in values]) + end)
+        self.number_logged = self.number_logged + 1
+
+    def close(self):
+        """ Writes everything still in the queue, and stops the writer. """
+        if self.is_closed:
+            return
+        self.is_closed = True
+        self.is_done.set()
+        self.writer.join()
+        if self.filename is not None:
+            self.file.close()
+
+    # ------------------------------------------------------------------
+    # The rest of this class is helpers for the methods above,
+    # and all of it runs in the writer thread.
+    # ------------------------------------------------------------------
+    def _write_forever(self):
+        while not self.is_done.wait(self.flush_seconds):
+            self._write_batch_or_report()
+        self._write_batch_or_report()
+
+    def _write_batch_or_report(self):
+        # If the writer thread stopped, nothing would empty the queue.
+        try:
+            self._write_batch()
+        except Exception as error:
+            self.number_of_errors = self.number_of_errors + 1
+            print('EventLog could not write: {!r}'.format(error),
+                  file=sys.stderr)
+
+    def _write_batch(self):
+        pieces = []
+        queue = self.queue
+        while queue:
+            pieces.append(queue.popleft())
+        if not pieces:
+            return
+        text = ''.join(pieces)
+        if self.filename is not None:
+            number_of_bytes = len(text.encode('utf-8'))
+            # A batch bigger than max_bytes goes into a file by itself,
+            # rather than leaving an empty file behind.
+            if (self.bytes_in_file > 0 and
+                    self.bytes_in_file + number_of_bytes > self.max_bytes):
+                self._rotate()
+            self.bytes_in_file = self.bytes_in_file + number_of_bytes
+        self.file.write(text)
+        self.file.flush()
+        self.number_of_writes = self.number_of_writes + 1
+
+    def _rotate(self):
+        self.file.close()
+        try:
+            for k in range(self.backup_count - 1, 0, -1):
+                older = '{}.{}'.format(self.filename, k)
+                if os.path.exists(older):
+                    os.replace(older, '{}.{}'.format(self.filename, k + 1))
+            if self.backup_count > 0:
+                os.replace(self.filename, self.filename + '.1')
+            else:
+                os.remove(self.filename)
+        finally:
+            # A new file, or (if renaming failed) the same one again.
+            self.file = open(self.filename, 'a', encoding='utf-8')
+            self.bytes_in_file = os.path.getsize(self.filename)
+
+
+# ----------------------------------------------------------------------
+# Benchmark: a key-press handler that prints, run for a burst of key
+# presses, with   print   (flushed each time, as the Console is) and
+# with an EventLog.  The output goes to temporary files.
+# ----------------------------------------------------------------------
+class KeyEvent(object):
+    def __init__(self, keysym):
+        self.keysym = keysym
+
+
+def handler_times(handler, number_of_events):
+    events = [KeyEvent(key) for key in 'abcdefghijklmnopqrstuvwxyz']
+    times = []
+    for k in range(number_of_events):
+        start = time.perf_counter()
+        handler(events[k % len(events)])
+        times.append(time.perf_counter() - start)
+    return sorted(times)
+
+
+def benchmark(number_of_events=100000):
+    folder = tempfile.mkdtemp()
+    with open(os.path.join(folder, 'print.txt'), 'w') as file:
+        print_times = handler_times(
+            lambda event: print('You pressed the', event.keysym, 'key',
+                                file=file, flush=True),
+            number_of_events)
+
+    event_log = EventLog(os.path.join(folder, 'log.txt'))
+    start = time.perf_counter()
+    log_times = handler_times(
+        lambda event: event_log.log('You pressed the', event.keysym, 'key'),
+        number_of_events)
+    event_log.close()
+    seconds_to_finish = time.perf_counter() - start
+
+    print('{} key presses, time per handler call:'.format(number_of_events))
+    for name, times in [('print', print_times), ('EventLog', log_times)]:
+        print('  {:8}  median {:6.2f} us,  p99 {:6.2f} us,'
+              '  worst {:8.2f} us'.format(
+                  name, times[len(times) // 2] * 1000000,
+                  times[int(len(times) * 0.99)] * 1000000,
+                  times[-1] * 1000000))
+    print('EventLog wrote it all in {} writes, done after {:.2f} s'.format(
+        event_log.number_of_writes, seconds_to_finish))
+    for name in os.listdir(folder):
+        os.remove(os.path.join(folder, name))
+    os.rmdir(folder)
+
+
+if __name__ == '__main__':
+    benchmark()
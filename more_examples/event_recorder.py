@@ -0,0 +1,268 @@
+"""
+RECORDING the events of a GUI, and REPLAYING them, so that the event
+handlers of any example can be run again and again the same way.
+
+An EventRecorder asks to be told of every key press and release,
+mouse button press and release, mouse motion, and the mouse entering
+and leaving widgets, and keeps the details of each, with the time
+since recording started.  The events can be saved to a file, one per
+line, as JSON.
+
+An EventReplayer sends the events back in, with   event_generate,
+either at the speed they were recorded or as fast as possible.  It
+also tells how long after each event was sent its handlers finished,
+which gives a benchmark of the handlers (each event is sent with a
+serial number of its own, to match it up with its handlers finishing):
+  -- at real speed: the LATENCY from each event to its handlers,
+  -- as fast as possible: the THROUGHPUT, in events per second.
+
+To use them with an example, from the   more_examples   folder:
+    python event_recorder.py record m3e_keyboard_events.py events.jsonl
+(use the example, then close its window), and then:
+    python event_recorder.py replay m3e_keyboard_events.py events.jsonl
+    python event_recorder.py replay m3e_keyboard_events.py events.jsonl fast
+On a computer with no display, run the replays under a virtual X
+server, for example:
+    xvfb-run python event_recorder.py replay ...
+
+How they are told of the events: each widget has a list of "binding
+tags" (see the   bindtags   method), and an event runs the bindings
+of each tag in the list, in order.  (Binding with   bind_all   binds
+to the tag   'all'.)  The recorder adds its own tag at the START of the
+list of every widget, and the replayer adds one at the END.  So only
+the widgets that exist when recording or replaying starts are covered,
+and a handler that returns  'break'  hides the event from the replayer.
+Tk sends key events to the widget that has the FOCUS, so before it
+sends a key event, the replayer gives the focus to the widget that got
+that key when it was recorded.
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import tkinter
+import json
+import runpy
+import sys
+import time
+
+RECORDED_EVENTS = ('KeyPress', 'KeyRelease', 'ButtonPress', 'ButtonRelease',
+                   'Motion', 'Enter', 'Leave')
+
+
+class EventRecorder(object):
+    """
+    Records the events that reach any widget of a root window.
+
+    Type hints:
+      :type root: tkinter.Tk
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.events = []  # Dictionaries, in the order the events came
+        self.start_time = time.perf_counter()
+        add_binding_tag(root, 'EventRecorder', at_start=True)
+        for kind in RECORDED_EVENTS:
+            root.bind_class('EventRecorder', '<{}>'.format(kind),
+                            self._record)
+
+    def save(self, filename):
+        with open(filename, 'w') as file:
+            for event in self.events:
+                file.write(json.dumps(event) + '\n')
+
+    def _record(self, event):
+        details = {'time': time.perf_counter() - self.start_time,
+                   'type': event_type_name(event), 'widget': str(event.widget),
+                   'x': event.x, 'y': event.y, 'state': event.state}
+        if details['type'] in ('KeyPress', 'KeyRelease'):
+            details['keysym'] = event.keysym
+        if details['type'] in ('ButtonPress', 'ButtonRelease'):
+            details['button'] = event.num
+        self.events.append(details)
+
+
+def event_type_name(event):
+    """ Returns, for example, 'KeyPress' (not str(event.type), '2'). """
+    # Tk events of a type that tkinter does not know have just a string.
+    return getattr(event.type, 'name', event.type)
+
+
+def add_binding_tag(widget, tag, at_start):
+    """ Adds the tag to the binding tags of the widget and its children. """
+    tags = widget.bindtags()
+    if tag not in tags:
+        widget.bindtags((tag,) + tags if at_start else tags + (tag,))
+    for child in widget.winfo_children():
+        add_binding_tag(child, tag, at_start)
+
+
+def load_events(filename):
+    with open(filename) as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+class EventReplayer(object):
+    """
+    Sends recorded events back to the widgets of a root window,
+    and measures how long their handlers take.
+    """
+
+    def __init__(self, root, events):
+        self.root = root
+        self.events = events
+        self.sent_times = {}  # Serial number -> when that event was sent
+        self.latencies = []  # From sending each event to its handlers done
+        self.handled_times = []  # When each event's handlers finished
+        self.serial = 0  # Serial number of the last event sent
+        self.number_missed = 0  # Events whose widget no longer exists
+        self.done_function = None
+        add_binding_tag(root, 'EventReplayer', at_start=False)
+        for kind in RECORDED_EVENTS:
+            root.bind_class('EventReplayer', '<{}>'.format(kind),
+                            self._handled)
+
+    def replay(self, as_fast_as_possible=False, done_function=None):
+        """
+        Sends every event, then (once all of them have been handled)
+        calls   done_function(), if it is given.
+        """
+        self.done_function = done_function
+        self.sent_times = {}
+        self.latencies = []
+        self.handled_times = []
+        self.start_time = time.perf_counter()
+        if as_fast_as_possible:
+            for event in self.events:
+                self._send(event)
+            self.root.after_idle(self._finish)
+        else:
+            for k in range(len(self.events)):
+                self.root.after(round(self.events[k]['time'] * 1000),
+                                lambda k=k: self._send_at_real_speed(k))
+
+    def report(self):
+        number = len(self.handled_times)
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return 'No events were handled.'
+        seconds = self.handled_times[-1] - self.start_time
+        return ('{} events handled ({} missed) in {:.3f} s: {:.0f} per'
+                ' second; latency median {:.2f} ms, p99 {:.2f} ms'.format(
+                    number, self.number_missed, seconds,
+                    number / max(seconds, 1e-9),
+                    latencies[len(latencies) // 2] * 1000,
+                    latencies[int(len(latencies) * 0.99)] * 1000))
+
+    # ------------------------------------------------------------------
+    # The rest of this class is helpers for the methods above.
+    # ------------------------------------------------------------------
+    def _send_at_real_speed(self, k):
+        self._send(self.events[k])
+        if k == len(self.events) - 1:
+            self.root.after_idle(self._finish)
+
+    def _send(self, event):
+        try:
+            widget = self.root.nametowidget(event['widget'])
+        except KeyError:
+            self.number_missed = self.number_missed + 1
+            return
+        kind = event['type']
+        options = {'x': event['x'], 'y': event['y'],
+                   'state': event['state'], 'when': 'tail'}
+        if kind in ('KeyPress', 'KeyRelease'):
+            sequence = '<{}>'.format(kind)
+            options['keysym'] = event['keysym']
+            self._give_focus(widget)
+        elif kind in ('ButtonPress', 'ButtonRelease'):
+            sequence = '<{}-{}>'.format(kind, event['button'])
+        else:
+            sequence = '<{}>'.format(kind)
+        self.serial = self.serial + 1
+        options['serial'] = self.serial
+        self.sent_times[self.serial] = time.perf_counter()
+        widget.event_generate(sequence, **options)
+
+    def _give_focus(self, widget):
+        # Tk sends a key event to the widget that has the focus (or
+        # drops it, if no window of the program has the focus), so the
+        # widget that got the key when it was recorded must get the
+        # focus first.  The events already sent are handled first,
+        # since they were meant for the widget that has the focus now.
+        try:
+            has_focus = widget.focus_get() is widget
+        except KeyError:  # The focus is in a widget tkinter did not make
+            has_focus = False
+        if not has_focus:
+            widget.update()
+            widget.focus_force()
+            widget.update()
+
+    def _handled(self, event):
+        now = time.perf_counter()
+        self.handled_times.append(now)
+        # Events that were not sent by this replayer have no sent time.
+        sent_time = self.sent_times.pop(event.serial, None)
+        if sent_time is not None:
+            self.latencies.append(now - sent_time)
+
+    def _finish(self):
+        if self.done_function is not None:
+            self.done_function()
+
+
+def run_example(filename, at_mainloop):
+    """
+    Runs the example in the given file, calling   at_mainloop(root)
+    when the example starts its mainloop.
+    """
+    mainloop = tkinter.Misc.mainloop
+
+    def start_mainloop(widget, n=0):
+        at_mainloop(widget._root())
+        mainloop(widget, n)
+
+    tkinter.Misc.mainloop = start_mainloop
+    try:
+        runpy.run_path(filename)
+    finally:
+        tkinter.Misc.mainloop = mainloop
+
+
+def main():
+    if len(sys.argv) < 4 or sys.argv[1] not in ('record', 'replay'):
+        print('Use:  python event_recorder.py record EXAMPLE.py EVENTS')
+        print('  or  python event_recorder.py replay EXAMPLE.py EVENTS'
+              ' [fast]')
+        return
+    action, example, events_filename = sys.argv[1:4]
+
+    if action == 'record':
+        recorders = []
+        run_example(example, lambda root: recorders.append(
+            EventRecorder(root)))
+        recorders[0].save(events_filename)
+        print('Recorded {} events to {}'.format(len(recorders[0].events),
+                                                events_filename))
+        return
+
+    events = load_events(events_filename)
+    as_fast_as_possible = sys.argv[4:] == ['fast']
+    replayers = []
+
+    def replay(root):
+        replayer = EventReplayer(root, events)
+        replayers.append(replayer)
+        # Let the window appear (so that the widgets have a place on
+        # the screen) before sending the events.
+        root.after(200, lambda: replayer.replay(as_fast_as_possible,
+                                                root.destroy))
+
+    run_example(example, replay)
+    print(replayers[0].report())
+
+
+if __name__ == '__main__':
+    main()
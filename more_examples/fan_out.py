@@ -0,0 +1,153 @@
+"""
+Showing the SAME data on MANY widgets (for example, a Label on each of
+hundreds of windows), all kept up to date.
+
+A FanOut watches some fields of a Store (see state_store).  Each widget
+that shows those fields is ADDED to the FanOut, with a function that
+shows the data on it:
+    fan_out = FanOut(root, data, ['number'], updater)
+    fan_out.add(label, show_number)   # show_number(label, data)
+
+When the fields change, the FanOut waits until Tk is idle and then
+calls each widget's function ONCE, however many changes were made, and
+makes all the widgets' changes in that same idle time (with a
+WidgetUpdater, see widget_updates, so unchanged widgets are skipped).
+
+The FanOut holds its widgets WEAKLY (with the   weakref   module) and
+drops each one when it is destroyed, so a window that is closed for
+good simply stops being updated; nothing has to remember to remove it.
+
+Run this module directly to time a burst of changes shown on hundreds
+of windows, one widget at a time and with a FanOut.
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import tkinter
+from tkinter import ttk
+import time
+import weakref
+from widget_updates import WidgetUpdater
+from state_store import Store
+
+
+class FanOut(object):
+    """
+    Calls   show(widget, store)   for each added widget, once per idle
+    time in which any of the given fields of the store changed.
+
+    Type hints:
+      :type root: tkinter.Tk
+      :type store: Store
+      :type updater: WidgetUpdater
+    """
+
+    def __init__(self, root, store, fields, updater):
+        self.root = root
+        self.store = store
+        self.updater = updater
+        self.widgets = weakref.WeakKeyDictionary()  # widget -> show
+        self.is_flush_scheduled = False
+        self.number_of_flushes = 0
+        self.number_of_shows = 0
+        store.subscribe(fields, self.changed, call_now=False)
+
+    def add(self, widget, show):
+        """ Shows the data on the widget now, and each time it changes. """
+        self.widgets[widget] = show
+        reference = weakref.ref(widget)
+        widget.bind('<Destroy>', lambda event: self.remove(reference()),
+                    '+')
+        show(widget, self.store)
+
+    def remove(self, widget):
+        if widget is not None and widget in self.widgets:
+            del self.widgets[widget]
+            self.updater.forget(widget)
+
+    def changed(self, store):
+        if not self.is_flush_scheduled:
+            self.is_flush_scheduled = True
+            self.root.after_idle(self.flush)
+
+    def flush(self):
+        """ Shows the data on every widget (done for you when Tk is idle). """
+        self.is_flush_scheduled = False
+        self.number_of_flushes = self.number_of_flushes + 1
+        for widget, show in list(self.widgets.items()):
+            show(widget, self.store)
+            self.number_of_shows = self.number_of_shows + 1
+        self.updater.flush()
+
+    def report(self):
+        return '{} widgets, {} shows in {} idle times'.format(
+            len(self.widgets), self.number_of_shows, self.number_of_flushes)
+
+
+# ----------------------------------------------------------------------
+# Benchmark: a burst of changes to a number that is shown on a Label on
+# each of hundreds of windows, setting every Label on each change and
+# with a FanOut.
+# ----------------------------------------------------------------------
+class Data(Store):
+    __slots__ = ('number',)
+
+
+def make_windows(root, number_of_windows):
+    labels = []
+    for _ in range(number_of_windows):
+        window = tkinter.Toplevel(root)
+        label = ttk.Label(window, text='The number is: 0')
+        label.grid()
+        labels.append(label)
+    root.update()
+    return labels
+
+
+def benchmark(number_of_windows=300, number_of_changes=200):
+    root = tkinter.Tk()
+    labels = make_windows(root, number_of_windows)
+
+    start = time.perf_counter()
+    for k in range(number_of_changes):
+        for label in labels:
+            label['text'] = 'The number is: {}'.format(k)
+    root.update()
+    seconds_directly = time.perf_counter() - start
+
+    data = Data(number=0)
+    updater = WidgetUpdater(root)
+    fan_out = FanOut(root, data, ['number'], updater)
+
+    def show_number(label, data):
+        updater.set(label, 'text', 'The number is: {}'.format(data.number))
+
+    for label in labels:
+        fan_out.add(label, show_number)
+    root.update()
+
+    start = time.perf_counter()
+    for k in range(number_of_changes):
+        data.number = data.number + 1
+    root.update()
+    seconds_with_fan_out = time.perf_counter() - start
+
+    for label in labels[:number_of_windows // 2]:
+        label.master.destroy()
+    data.number = data.number + 1
+    root.update()
+
+    print('{} changes, each shown on {} windows:'.format(
+        number_of_changes, number_of_windows))
+    print('  every Label, every change:  {:8.1f} ms'.format(
+        seconds_directly * 1000))
+    print('  FanOut:                     {:8.1f} ms'.format(
+        seconds_with_fan_out * 1000))
+    print('  After destroying half the windows: {}'.format(
+        fan_out.report()))
+    root.destroy()
+
+
+if __name__ == '__main__':
+    benchmark()
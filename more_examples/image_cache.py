@@ -0,0 +1,197 @@
+"""
+Loading each IMAGE file just ONCE, however many widgets show it.
+
+tkinter.PhotoImage(file=...)   reads and decodes the whole file each
+time it is called, so a screen with many Buttons showing the same
+picture would decode it many times.  An ImageCache's   get   method
+decodes a file the first time it is asked for, and after that returns
+the SAME PhotoImage, which every widget can share.
+
+The cache remembers each image by:
+  -- the file's name, when it was last changed, and its size
+       (so if the file changes, it is loaded again), and
+  -- the SCALE it was asked for (for example, 0.5 for half as wide
+       and half as tall, using PhotoImage's   zoom   and   subsample).
+
+The cache also KEEPS a reference to each PhotoImage, so there is no
+need for the usual   button.image = photo   trick (without which
+Python frees the PhotoImage, and the button goes blank).
+
+Images take memory (4 bytes per pixel), so the cache uses at most about
+max_bytes.  When it has more than that, it lets go of the images that
+were used LEAST RECENTLY -- but never of an image that a widget is
+still showing, which would make that widget go blank.
+
+Run this module directly to compare the time to make a screen of image
+buttons with and without an ImageCache.
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import tkinter
+from tkinter import ttk
+import collections
+import fractions
+import os
+import time
+
+
+class ImageCache(object):
+    """ Shares PhotoImages, letting go of the least recently used. """
+
+    def __init__(self, max_bytes=50000000, master=None):
+        self.max_bytes = max_bytes
+        self.master = master
+        self.images = collections.OrderedDict()  # Least recent first
+        self.bytes_used = 0
+        self.number_of_hits = 0
+        self.number_of_misses = 0
+        self.seconds_decoding = 0
+        self.seconds_saved = 0
+
+    def get(self, filename, scale=1):
+        """
+        Returns a PhotoImage of the image in the given file, scaled by
+        the given scale, loading it only if it is not in the cache.
+        """
+        key = self.key(filename, scale)
+        photo = self.find(key)
+        if photo is None:
+            start = time.perf_counter()
+            photo = scaled(tkinter.PhotoImage(file=filename,
+                                              master=self.master),
+                           key[-1])
+            self.add(key, photo, time.perf_counter() - start)
+        return photo
+
+    def key(self, filename, scale=1):
+        """ Returns what the cache remembers the scaled image by. """
+        scale = fractions.Fraction(scale).limit_denominator(16)
+        status = os.stat(filename)
+        return (os.path.abspath(filename), status.st_mtime_ns,
+                status.st_size, scale)
+
+    def find(self, key):
+        """ Returns the PhotoImage with the given key, or None. """
+        if key not in self.images:
+            self.number_of_misses = self.number_of_misses + 1
+            return None
+        self.images.move_to_end(key)
+        photo, _, seconds = self.images[key]
+        self.number_of_hits = self.number_of_hits + 1
+        self.seconds_saved = self.seconds_saved + seconds
+        return photo
+
+    def add(self, key, photo, seconds_decoding):
+        """ Puts a PhotoImage (that took that long to make) in the cache. """
+        number_of_bytes = photo.width() * photo.height() * 4
+        self.seconds_decoding = self.seconds_decoding + seconds_decoding
+        self.images[key] = (photo, number_of_bytes, seconds_decoding)
+        self.bytes_used = self.bytes_used + number_of_bytes
+        self._let_go_of_least_recent()
+
+    def clear(self):
+        """ Lets go of every image that no widget is showing. """
+        max_bytes = self.max_bytes
+        self.max_bytes = 0
+        self._let_go_of_least_recent(keep_newest=False)
+        self.max_bytes = max_bytes
+
+    def report(self):
+        return ('{} hits, {} misses, {} images ({:.1f} MB);'
+                ' {:.1f} ms decoding, {:.1f} ms saved').format(
+                    self.number_of_hits, self.number_of_misses,
+                    len(self.images), self.bytes_used / 1000000,
+                    self.seconds_decoding * 1000, self.seconds_saved * 1000)
+
+    # The rest of this class is helpers for the methods above.
+
+    def _let_go_of_least_recent(self, keep_newest=True):
+        keys = list(self.images)
+        if keep_newest:
+            keys = keys[:-1]  # It is about to be used
+        for key in keys:
+            if self.bytes_used <= self.max_bytes:
+                break
+            photo, number_of_bytes, _ = self.images[key]
+            if not is_in_use(photo):
+                del self.images[key]
+                self.bytes_used = self.bytes_used - number_of_bytes
+
+
+def scaled(photo, scale):
+    """
+    Returns the given PhotoImage scaled by the given Fraction, using
+    zoom   to make it bigger and   subsample   to make it smaller.
+    """
+    if scale.numerator > 1:
+        photo = photo.zoom(scale.numerator)
+    if scale.denominator > 1:
+        photo = photo.subsample(scale.denominator)
+    return photo
+
+
+def is_in_use(photo):
+    """ Returns True if any widget is showing the given PhotoImage. """
+    return photo.tk.getboolean(photo.tk.call('image', 'inuse', photo.name))
+
+
+# ----------------------------------------------------------------------
+# Benchmark: a screen of Buttons, each showing one of a few sizes of the
+# same picture, with a new PhotoImage for each Button and with an
+# ImageCache.
+# ----------------------------------------------------------------------
+def make_buttons(root, get_photo, number_of_buttons, scales):
+    frame = ttk.Frame(root)
+    frame.grid()
+    start = time.perf_counter()
+    buttons = []
+    for k in range(number_of_buttons):
+        button = ttk.Button(frame, image=get_photo(scales[k % len(scales)]))
+        button.grid(row=k // 20, column=k % 20)
+        buttons.append(button)
+    root.update()
+    return frame, buttons, time.perf_counter() - start
+
+
+def benchmark(number_of_buttons=200, scales=(1 / 8, 1 / 4, 1 / 2)):
+    filename = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'tkinter_mqtt_ev3.gif')
+    root = tkinter.Tk()
+
+    photos = []
+
+    def new_photo(scale):
+        photo = scaled(tkinter.PhotoImage(file=filename),
+                       fractions.Fraction(scale))
+        photos.append(photo)  # Else the Button goes blank
+        return photo
+
+    frame, _, seconds_without_cache = make_buttons(
+        root, new_photo, number_of_buttons, scales)
+    frame.destroy()
+
+    cache = ImageCache()
+    frame, _, seconds_with_cache = make_buttons(
+        root, lambda scale: cache.get(filename, scale), number_of_buttons,
+        scales)
+
+    print('{} image Buttons:'.format(number_of_buttons))
+    print('  new PhotoImage for each:  {:8.1f} ms, {} images'.format(
+        seconds_without_cache * 1000, len(photos)))
+    print('  ImageCache:               {:8.1f} ms, {}'.format(
+        seconds_with_cache * 1000, cache.report()))
+
+    cache.clear()
+    print('  After clear, while the Buttons show them:  {}'.format(
+        cache.report()))
+    frame.destroy()
+    cache.clear()
+    print('  After the Buttons are destroyed:           {}'.format(
+        cache.report()))
+    root.destroy()
+
+
+if __name__ == '__main__':
+    benchmark()
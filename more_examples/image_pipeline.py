@@ -0,0 +1,440 @@
+"""
+Loading images WITHOUT making the GUI wait for them.
+
+tkinter.PhotoImage(file=...)   reads and decodes the file right away,
+in the same thread that runs the GUI, so while a big image (or many
+small ones) is decoded, no window appears and no click is handled.
+
+An ImagePipeline splits loading an image into two parts:
+  -- DECODING the GIF file (and shrinking it, for a thumbnail) is done
+       by WORKER threads, in plain Python (see   read_gif   below), into
+       PNG data that is quick for Tk to read: the red, green, blue and
+       OPACITY of each pixel, hardly compressed (made with
+       png_from_pixels   from the   canvas_dots   module).  So the
+       transparent pixels of the GIF stay transparent.
+  -- UPLOADING that to a PhotoImage is done by the GUI's thread (Tk
+       must only be used from that thread).  That is quick, and the
+       pipeline does only a little of it at a time (at most about
+       milliseconds_per_slice   each time it is called from the event
+       loop), so the GUI keeps handling clicks and keys.
+So the window appears at once, and each image shows up in it as soon
+as it is ready.
+
+load(filename, scale, function)   calls   function(photo)   (in the
+GUI's thread) when the PhotoImage is ready.  If an ImageCache (see
+image_cache) is given, images already in it are not loaded again.
+
+(Decoding in plain Python is slower than Tk's own decoding, and the
+worker threads share Python with the GUI's thread, so this pays off by
+keeping the GUI RESPONSIVE while images load, not by loading them
+sooner.)
+
+Run this module directly to compare the time until the window can be
+used, for a window of image buttons, with and without an ImagePipeline.
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import tkinter
+from tkinter import ttk
+import collections
+import concurrent.futures
+import fractions
+import operator
+import base64
+import os
+import shutil
+import tempfile
+import time
+from image_cache import scaled
+from canvas_dots import png_from_pixels
+
+
+class ImagePipeline(object):
+    """
+    Decodes images in worker threads and makes PhotoImages of them,
+    a few at a time, in the GUI's thread.
+
+    Type hints:
+      :type root: tkinter.Tk
+      :type cache: image_cache.ImageCache
+    """
+
+    def __init__(self, root, cache=None, number_of_threads=2,
+                 milliseconds_per_slice=8, poll_milliseconds=10):
+        self.root = root
+        self.cache = cache
+        self.milliseconds_per_slice = milliseconds_per_slice
+        self.poll_milliseconds = poll_milliseconds
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            number_of_threads)
+
+        self.waiting = {}  # key -> functions to call with its PhotoImage
+        # Workers append to this deque, and the GUI's thread pops from it.
+        self.decoded = collections.deque()
+        self.is_polling = False
+        self.number_loaded = 0
+        self.seconds_decoding = 0
+        self.seconds_uploading = 0
+        self.longest_slice_seconds = 0
+
+    def load(self, filename, scale, function):
+        """
+        Calls   function(photo)   in the GUI's thread when a PhotoImage of
+        the given file, scaled by the given scale, is ready.
+        """
+        if self.cache:
+            key = self.cache.key(filename, scale)
+            photo = self.cache.find(key)
+            if photo is not None:
+                function(photo)
+                return
+        else:
+            key = (filename, fractions.Fraction(scale).limit_denominator(16))
+
+        if key in self.waiting:
+            self.waiting[key].append(function)  # Already being decoded
+            return
+        self.waiting[key] = [function]
+        future = self.executor.submit(decode_and_scale, filename, key[-1])
+        future.add_done_callback(
+            lambda future: self.decoded.append((key, filename, future)))
+        if not self.is_polling:
+            self.is_polling = True
+            self.root.after(self.poll_milliseconds, self.upload_some)
+
+    def upload_some(self):
+        """
+        Makes PhotoImages of decoded images, for a little while
+        (done for you from the event loop, while images are loading).
+        """
+        start = time.perf_counter()
+        budget = self.milliseconds_per_slice / 1000
+        try:
+            while self.decoded and time.perf_counter() - start < budget:
+                self._upload(*self.decoded.popleft())
+        finally:
+            # Even if a function given to   load   fails, keep going.
+            seconds = time.perf_counter() - start
+            self.seconds_uploading = self.seconds_uploading + seconds
+            self.longest_slice_seconds = max(self.longest_slice_seconds,
+                                             seconds)
+            if self.decoded:
+                self.root.after(1, self.upload_some)
+            elif self.waiting:
+                self.root.after(self.poll_milliseconds, self.upload_some)
+            else:
+                self.is_polling = False
+
+    def close(self):
+        """ Stops the worker threads, dropping what they have not done. """
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def report(self):
+        return ('{} images: {:.1f} ms decoding (worker threads),'
+                ' {:.1f} ms uploading (longest slice {:.1f} ms)').format(
+                    self.number_loaded, self.seconds_decoding * 1000,
+                    self.seconds_uploading * 1000,
+                    self.longest_slice_seconds * 1000)
+
+    # The rest of this class is helpers for the methods above.
+
+    def _upload(self, key, filename, future):
+        functions = self.waiting.pop(key)
+        try:
+            png, seconds = future.result()
+        except Exception as error:
+            # Whatever went wrong in the worker thread, it is only this
+            # image that cannot be loaded.
+            print('Could not load {}: {}'.format(filename, error))
+            return
+        photo = tkinter.PhotoImage(master=self.root, data=png, format='png')
+        self.number_loaded = self.number_loaded + 1
+        self.seconds_decoding = self.seconds_decoding + seconds
+        if self.cache:
+            self.cache.add(key, photo, seconds)
+        for function in functions:
+            function(photo)
+
+
+def decode_and_scale(filename, scale):
+    """
+    Returns the first image in the given GIF file, scaled by the given
+    Fraction, as PNG data (in base64, as PhotoImage's   data   takes it),
+    and how long (in seconds) making it took.
+    """
+    start = time.perf_counter()
+    width, height, pixels, palette, transparent = read_gif(filename)
+    width, height, pixels = scale_pixels(width, height, pixels, scale)
+    png = png_from_pixels(width, height,
+                          to_rgba(pixels, palette, transparent))
+    return (base64.b64encode(png).decode('ascii'),
+            time.perf_counter() - start)
+
+
+def read_gif(filename):
+    """
+    Reads the first image in the given GIF file.  Returns its width and
+    height, its pixels (one byte, an index into the palette, per pixel,
+    row by row), its palette (red, green, blue for each index) and the
+    index that is transparent (or None).  Raises ValueError if the file
+    is not a GIF file, or is cut short.
+    """
+    with open(filename, 'rb') as file:
+        data = file.read()
+    try:
+        return parse_gif(data)
+    except IndexError:
+        raise ValueError('the GIF file is cut short') from None
+
+
+def parse_gif(data):
+    """ Returns what   read_gif   does, for the bytes of a GIF file. """
+    if data[:6] not in (b'GIF87a', b'GIF89a'):
+        raise ValueError('not a GIF file')
+
+    flags = data[10]
+    position = 13
+    palette = bytes(b for k in range(256) for b in (k, k, k))  # Gray
+    if flags & 0x80:
+        size = 3 << ((flags & 7) + 1)
+        palette = data[position:position + size]
+        position = position + size
+    transparent = None
+
+    while True:
+        if position >= len(data):
+            raise ValueError('no image in the GIF file')
+        block = data[position]
+        if block == 0x21:  # An extension
+            label = data[position + 1]
+            if label == 0xF9 and data[position + 3] & 1:
+                transparent = data[position + 6]
+            position = skip_sub_blocks(data, position + 2)
+        elif block == 0x2C:  # The image
+            break
+        else:
+            raise ValueError('not a GIF file')
+
+    width = data[position + 5] + 256 * data[position + 6]
+    height = data[position + 7] + 256 * data[position + 8]
+    flags = data[position + 9]
+    position = position + 10
+    if flags & 0x80:
+        size = 3 << ((flags & 7) + 1)
+        palette = data[position:position + size]
+        position = position + size
+
+    minimum_code_size = data[position]
+    end = skip_sub_blocks(data, position + 1)
+    compressed = join_sub_blocks(data, position + 1, end)
+    pixels = lzw_decode(compressed, minimum_code_size, width * height)
+    if len(pixels) < width * height:  # A short image is padded
+        pixels = pixels + bytes(width * height - len(pixels))
+    pixels = bytes(pixels[:width * height])
+    if flags & 0x40:
+        pixels = deinterlace(width, height, pixels)
+    return width, height, pixels, palette, transparent
+
+
+def skip_sub_blocks(data, position):
+    """ Returns the position just after the sub-blocks at the position. """
+    while data[position] != 0:
+        position = position + data[position] + 1
+    return position + 1
+
+
+def join_sub_blocks(data, position, end):
+    parts = []
+    while position < end - 1:
+        size = data[position]
+        parts.append(data[position + 1:position + 1 + size])
+        position = position + size + 1
+    return b''.join(parts)
+
+
+def lzw_decode(compressed, minimum_code_size, number_of_pixels):
+    """ Returns the palette indices that GIF's LZW-compressed data codes. """
+    clear_code = 1 << minimum_code_size
+    end_code = clear_code + 1
+    first_table = [bytes([k]) for k in range(clear_code)] + [b'', b'']
+    table = list(first_table)
+    code_size = minimum_code_size + 1
+    code_mask = (1 << code_size) - 1
+    previous = None
+    pixels = bytearray()
+    bits = 0
+    number_of_bits = 0
+
+    for byte in compressed:
+        bits = bits | (byte << number_of_bits)
+        number_of_bits = number_of_bits + 8
+        while number_of_bits >= code_size:
+            code = bits & code_mask
+            bits = bits >> code_size
+            number_of_bits = number_of_bits - code_size
+
+            if code == clear_code:
+                table = list(first_table)
+                code_size = minimum_code_size + 1
+                code_mask = (1 << code_size) - 1
+                previous = None
+                continue
+            if code == end_code:
+                return pixels
+
+            if previous is None:
+                entry = table[code]
+            elif code < len(table):
+                entry = table[code]
+                if len(table) < 4096:
+                    table.append(previous + entry[:1])
+            else:
+                entry = previous + previous[:1]
+                if len(table) < 4096:
+                    table.append(entry)
+            pixels += entry
+            previous = entry
+
+            if len(table) == code_mask + 1 and code_size < 12:
+                code_size = code_size + 1
+                code_mask = (1 << code_size) - 1
+        if len(pixels) >= number_of_pixels:
+            break
+    return pixels
+
+
+def deinterlace(width, height, pixels):
+    """ Puts the rows of an interlaced GIF back in order. """
+    rows = [pixels[y * width:(y + 1) * width] for y in range(height)]
+    order = (list(range(0, height, 8)) + list(range(4, height, 8))
+             + list(range(2, height, 4)) + list(range(1, height, 2)))
+    in_order = [None] * height
+    for row, y in zip(rows, order):
+        in_order[y] = row
+    return b''.join(in_order)
+
+
+def scale_pixels(width, height, pixels, scale):
+    """
+    Scales the pixels (one byte per pixel) by the given Fraction, to the
+    same size that PhotoImage's   zoom   and   subsample   make.
+    Returns the new width, height and pixels.
+    """
+    if scale == 1:
+        return width, height, pixels
+    new_width = -(-width * scale.numerator // scale.denominator)
+    new_height = -(-height * scale.numerator // scale.denominator)
+    ys = [y * scale.denominator // scale.numerator
+          for y in range(new_height)]
+    if scale.numerator == 1:
+        step = scale.denominator
+        rows = [pixels[y * width:(y + 1) * width:step] for y in ys]
+    else:
+        xs = [x * scale.denominator // scale.numerator
+              for x in range(new_width)]
+        pick = operator.itemgetter(*xs)
+        rows = [bytes(pick(pixels[y * width:(y + 1) * width])) for y in ys]
+    return new_width, new_height, b''.join(rows)
+
+
+def to_rgba(pixels, palette, transparent):
+    """
+    Returns the red, green, blue and alpha (255 for solid, 0 for
+    transparent) of each pixel (an index into the palette).
+    """
+    palette = palette.ljust(768, b'\0')
+    alpha = bytearray(b'\xff' * 256)
+    if transparent is not None:
+        alpha[transparent] = 0
+    rgba = bytearray(4 * len(pixels))
+    for color in range(3):
+        rgba[color::4] = pixels.translate(palette[color::3])
+    rgba[3::4] = pixels.translate(alpha)
+    return rgba
+
+
+# ----------------------------------------------------------------------
+# Benchmark: the time until a window of image Buttons can be used (that
+# is, until the event loop first has nothing to do), making each
+# PhotoImage from its file first and with an ImagePipeline; then the
+# time until all of the pipeline's images are showing.
+# ----------------------------------------------------------------------
+def time_window(make_buttons, wait_for_images):
+    start = time.perf_counter()
+    root = tkinter.Tk()
+    times = {}
+    make_buttons(root, times, start)
+
+    def usable():
+        times['usable'] = time.perf_counter() - start
+        if not wait_for_images:
+            root.quit()
+
+    root.after_idle(usable)
+    root.mainloop()
+    root.destroy()
+    return times
+
+
+def benchmark(number_of_images=30, scales=(1, 1 / 2, 1 / 4)):
+    filename = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'tkinter_mqtt_ev3.gif')
+    _, seconds = decode_and_scale(filename, fractions.Fraction(1))
+    print('Decoding the GIF in plain Python: {:.1f} ms'.format(
+        seconds * 1000))
+
+    # Each file has a different name, as if they were different images.
+    folder = tempfile.mkdtemp()
+    filenames = []
+    with open(filename, 'rb') as file:
+        data = file.read()
+    for k in range(number_of_images):
+        filenames.append(os.path.join(folder, 'image{}.gif'.format(k)))
+        with open(filenames[-1], 'wb') as file:
+            file.write(data)
+
+    def make_directly(root, times, start):
+        for k, name in enumerate(filenames):
+            scale = fractions.Fraction(scales[k % len(scales)])
+            photo = scaled(tkinter.PhotoImage(file=name), scale)
+            button = ttk.Button(root, image=photo)
+            button.image = photo
+            button.grid(row=k // 6, column=k % 6)
+
+    def make_with_pipeline(root, times, start):
+        pipeline = ImagePipeline(root)
+        number_shown = [0]
+
+        def show(button, photo):
+            button['image'] = photo
+            button.image = photo
+            number_shown[0] = number_shown[0] + 1
+            if number_shown[0] == number_of_images:
+                times['all images'] = time.perf_counter() - start
+                times['report'] = pipeline.report()
+                pipeline.close()
+                root.quit()
+
+        for k, name in enumerate(filenames):
+            button = ttk.Button(root, text='Loading...')
+            button.grid(row=k // 6, column=k % 6)
+            pipeline.load(name, scales[k % len(scales)],
+                          lambda photo, button=button: show(button, photo))
+
+    directly = time_window(make_directly, False)
+    with_pipeline = time_window(make_with_pipeline, True)
+    print('{} image Buttons, time until the window can be used:'.format(
+        number_of_images))
+    print('  PhotoImage(file=...):  {:8.1f} ms'.format(
+        directly['usable'] * 1000))
+    print('  ImagePipeline:         {:8.1f} ms (all images showing after'
+          ' {:.1f} ms)'.format(with_pipeline['usable'] * 1000,
+                               with_pipeline['all images'] * 1000))
+    print('  ' + with_pipeline['report'])
+    shutil.rmtree(folder)
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,190 @@
+"""
+Finding what GROWS in a GUI that runs for a long time.
+
+A GUI "leaks" when something keeps being made and is never let go of,
+for example:
+  -- windows that are destroyed, but are still in a list somewhere
+       (so their Python objects can never be freed),
+  -- items that keep being added to a Canvas, or
+  -- images that keep being made.
+
+A LeakDetector COUNTS, at each   checkpoint:
+  -- the widgets of each class (walking the tree of widgets from the
+       root window with   winfo_children),
+  -- the items on every Canvas, and the images that Tk has, and
+  -- the widgets that have been destroyed but whose Python objects are
+       still alive (it keeps a weak reference, with the   weakref
+       module, to every widget that it has seen).
+It also takes a snapshot of the memory that Python has allocated (with
+the   tracemalloc   module).  Each checkpoint returns a report of what
+grew since the previous one, and the lines of code whose memory grew
+the most.  So: checkpoint, do something in the GUI a few times, and
+checkpoint again.
+
+(tracemalloc makes the program slower while it runs, so it is started
+only at the FIRST checkpoint, which just takes note of how things are
+and returns None.  Making a LeakDetector costs nothing until then.)
+
+Run this module directly to see a report on a GUI that leaks.
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import tkinter
+from tkinter import ttk
+import collections
+import gc
+import time
+import tracemalloc
+import weakref
+
+DESTROYED = '(destroyed, but still referenced)'
+CANVAS_ITEMS = '(Canvas items)'
+
+
+class LeakDetector(object):
+    """
+    Reports what grew in a GUI between one checkpoint and the next.
+
+    Type hints:
+      :type root: tkinter.Tk
+    """
+
+    def __init__(self, root, number_of_lines=5):
+        self.root = root
+        self.number_of_lines = number_of_lines
+        self.widgets_seen = weakref.WeakSet()
+        self.counts = None
+        self.snapshot = None
+        self.number_of_checkpoints = 0
+
+    def checkpoint(self):
+        """
+        Returns a report of what grew since the last checkpoint, or None
+        if this is the first checkpoint (which starts tracemalloc).
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        counts = self.count()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)])
+        if self.counts is None:
+            report = None
+        else:
+            report = self._report(counts, snapshot)
+        self.counts = counts
+        self.snapshot = snapshot
+        self.number_of_checkpoints = self.number_of_checkpoints + 1
+        return report
+
+    def check_every(self, milliseconds, report_function=print):
+        """ Every so often, reports what grew (if anything did). """
+        counts = self.counts
+        report = self.checkpoint()
+        if report is not None and self.counts != counts:
+            report_function(report)
+        self.root.after(milliseconds,
+                        lambda: self.check_every(milliseconds,
+                                                 report_function))
+
+    def count(self):
+        """ Returns a Counter of the widgets of each class, and so on. """
+        counts = collections.Counter()
+        widgets = [self.root]
+        while widgets:
+            widget = widgets.pop()
+            self.widgets_seen.add(widget)
+            name = class_name(widget)
+            counts[name] = counts[name] + 1
+            if isinstance(widget, tkinter.Canvas):
+                counts[CANVAS_ITEMS] = (counts[CANVAS_ITEMS]
+                                        + len(widget.find_all()))
+            widgets.extend(widget.winfo_children())
+
+        for image in self.root.image_names():
+            name = '({} images)'.format(
+                self.root.tk.call('image', 'type', image))
+            counts[name] = counts[name] + 1
+
+        counts[DESTROYED] = len(self.destroyed_widgets())
+        return counts
+
+    def destroyed_widgets(self):
+        """
+        Returns the widgets that were destroyed but whose Python objects
+        something still refers to.
+        """
+        gc.collect()
+        return [widget for widget in list(self.widgets_seen)
+                if not widget.winfo_exists()]
+
+    # The rest of this class is helpers for the methods above.
+
+    def _report(self, counts, snapshot):
+        lines = ['Checkpoint {}, compared with the one before:'.format(
+            self.number_of_checkpoints)]
+        for name in sorted(set(counts) | set(self.counts)):
+            change = counts[name] - self.counts[name]
+            if change != 0:
+                lines.append('  {:+7d}  {:34}  (now {})'.format(
+                    change, name, counts[name]))
+        if len(lines) == 1:
+            lines.append('  No widgets, items or images grew')
+
+        differences = snapshot.compare_to(self.snapshot, 'lineno')
+        total = sum(difference.size_diff for difference in differences)
+        lines.append('  Python memory: {:+.1f} KB'.format(total / 1000))
+        grew = [difference for difference in differences
+                if difference.size_diff > 0]
+        for difference in grew[:self.number_of_lines]:
+            frame = difference.traceback[0]
+            lines.append('  {:+9.1f} KB  {}:{}'.format(
+                difference.size_diff / 1000, frame.filename, frame.lineno))
+        return '\n'.join(lines)
+
+
+def class_name(widget):
+    """ Returns, for example, 'Canvas' or 'ttk.Label'. """
+    widget_class = type(widget)
+    if widget_class.__module__ == ttk.__name__:
+        return 'ttk.' + widget_class.__name__
+    return widget_class.__name__
+
+
+# ----------------------------------------------------------------------
+# Benchmark: a GUI that leaks in the ways above (pop-up windows that are
+# destroyed but kept in a list, and a Canvas that only ever gets more
+# items), with the report that a LeakDetector gives for it, and the
+# time that a checkpoint takes.
+# ----------------------------------------------------------------------
+def benchmark(number_of_windows=200, number_of_items=5000):
+    root = tkinter.Tk()
+    canvas = tkinter.Canvas(root)
+    canvas.grid()
+    root.update()
+    detector = LeakDetector(root)
+    detector.checkpoint()
+
+    windows = []
+    for k in range(number_of_windows):
+        window = tkinter.Toplevel(root)
+        ttk.Label(window, text='Window {}'.format(k)).grid()
+        windows.append(window)
+    for k in range(number_of_items):
+        canvas.create_oval(k % 200, k % 150, k % 200 + 5, k % 150 + 5)
+    root.update()
+    print(detector.checkpoint())
+
+    for window in windows:
+        window.destroy()  # But they are still in the list
+    root.update()
+    start = time.perf_counter()
+    print(detector.checkpoint())
+    print('That checkpoint took {:.1f} ms'.format(
+        (time.perf_counter() - start) * 1000))
+    root.destroy()
+
+
+if __name__ == '__main__':
+    benchmark()
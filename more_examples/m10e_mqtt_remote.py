@@ -0,0 +1,145 @@
+"""
+Example showing for tkinter and ttk:
+  -- A remote control GUI (the one that   src/m6_grid_row_and_column.py
+       asks you to build) that SENDS its commands over the network,
+       without ever making the GUI wait for the network.  It uses
+       these modules, which must be in the same folder as this module:
+         async_tk            runs asyncio inside tkinter's mainloop,
+         command_publisher   sends only the commands that change what
+                               the robot should do, and not too often,
+         command_frames      turns each command, with the speeds of
+                               the wheels, into a 5-byte FRAME,
+         message_transport   sends the frames in the background, and
+                               has a LoopbackBroker that stands in for
+                               the robot,
+         speed_entry         reads the speeds only when they change.
+
+Until there is a robot, the LoopbackBroker (on any free port) just
+prints each command that it gets, with its speeds.
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import tkinter
+from tkinter import ttk
+from async_tk import AsyncTk
+from command_publisher import CommandPublisher
+from message_transport import MessageTransport, LoopbackBroker
+from command_frames import encode_command, decode_command
+from speed_entry import SpeedEntry
+
+
+def main():
+    """ Constructs and runs the GUI """
+    root = tkinter.Tk()
+    root.title("MQTT Remote")
+    # The driver runs asyncio, which sends the messages to the robot
+    # in the background, so that the GUI never waits for the network.
+    driver = AsyncTk(root)
+    transport = MessageTransport()
+    broker = LoopbackBroker(port=0)
+    broker.subscribe('robot/command',
+                     lambda topic, payload: print(decode_command(payload)))
+    driver.create_task(connect(broker, transport))
+
+    main_frame = ttk.Frame(root, padding=20)
+    main_frame.grid()
+
+    left_speed_label = ttk.Label(main_frame, text="Left")
+    left_speed_label.grid(row=0, column=0)
+    left_speed_entry = ttk.Entry(main_frame, width=8)
+    left_speed_entry.insert(0, "600")
+    left_speed_entry.grid(row=1, column=0)
+    left_speed = SpeedEntry(left_speed_entry)  # Parsed only when changed
+
+    right_speed_label = ttk.Label(main_frame, text="Right")
+    right_speed_label.grid(row=0, column=2)
+    right_speed_entry = ttk.Entry(main_frame, width=8, justify=tkinter.RIGHT)
+    right_speed_entry.insert(0, "600")
+    right_speed_entry.grid(row=1, column=2)
+    right_speed = SpeedEntry(right_speed_entry)
+
+    # Held-down keys repeat; the publisher sends only what changes
+    # (the direction, or the speeds).
+    publisher = CommandPublisher(root,
+                                 lambda command: send(transport, *command))
+
+    def publish(channel, command):
+        """ Asks the publisher to send the command, at the current speeds. """
+        publisher.publish(channel,
+                          (command, left_speed.value, right_speed.value))
+
+    forward_button = ttk.Button(main_frame, text="Forward")
+    forward_button.grid(row=2, column=1)
+    forward_button['command'] = lambda: publish('drive', 'forward')
+    root.bind('<Up>', lambda event: publish('drive', 'forward'))
+
+    left_button = ttk.Button(main_frame, text="Left")
+    left_button.grid(row=3, column=0)
+    left_button['command'] = lambda: publish('drive', 'left')
+    root.bind('<Left>', lambda event: publish('drive', 'left'))
+
+    stop_button = ttk.Button(main_frame, text="Stop")
+    stop_button.grid(row=3, column=1)
+    stop_button['command'] = lambda: publish('drive', 'stop')
+    root.bind('<space>', lambda event: publish('drive', 'stop'))
+
+    right_button = ttk.Button(main_frame, text="Right")
+    right_button.grid(row=3, column=2)
+    right_button['command'] = lambda: publish('drive', 'right')
+    root.bind('<Right>', lambda event: publish('drive', 'right'))
+
+    back_button = ttk.Button(main_frame, text="Back")
+    back_button.grid(row=4, column=1)
+    back_button['command'] = lambda: publish('drive', 'back')
+    root.bind('<Down>', lambda event: publish('drive', 'back'))
+
+    up_button = ttk.Button(main_frame, text="Up")
+    up_button.grid(row=5, column=0)
+    up_button['command'] = lambda: publish('arm', 'up')
+    root.bind('<u>', lambda event: publish('arm', 'up'))
+
+    down_button = ttk.Button(main_frame, text="Down")
+    down_button.grid(row=6, column=0)
+    down_button['command'] = lambda: publish('arm', 'down')
+    root.bind('<j>', lambda event: publish('arm', 'down'))
+
+    # Buttons for quit and exit
+    q_button = ttk.Button(main_frame, text="Quit")
+    q_button.grid(row=5, column=2)
+    q_button['command'] = lambda: send(transport, 'quit')
+
+    e_button = ttk.Button(main_frame, text="Exit")
+    e_button.grid(row=6, column=2)
+    e_button['command'] = lambda: exit()
+
+    driver.run()  # Instead of   root.mainloop()
+
+
+async def connect(broker, transport):
+    """
+    Starts the broker, then sends the transport's messages to it.
+    (Messages published before then wait in the transport's queue.)
+    """
+    try:
+        await broker.start()
+    except OSError as error:
+        print('The loopback broker could not start: {}'.format(error))
+        return
+    transport.port = broker.port
+    await transport.run()
+
+
+def send(transport, command, left_speed=0, right_speed=0):
+    """ Sends the given command, with the given speeds, to the robot. """
+    transport.publish('robot/command',
+                      encode_command(command, left_speed, right_speed))
+
+
+# ----------------------------------------------------------------------
+# Calls  main  to start the ball rolling (but not when another module,
+# for example a test, imports this one just to use its functions).
+# ----------------------------------------------------------------------
+if __name__ == '__main__':
+    main()
@@ -14,12 +14,17 @@ Authors: David Mutchler and his colleagues
 
 import tkinter
 from tkinter import ttk
+from state_store import Store
 
 
-class Temperature(object):
+class Temperature(Store):
+    __slots__ = ('entry_for_temperature', 'label_for_temperature',
+                 'answer')
+
     def __init__(self):
-        self.entry_for_temperature = None
-        self.label_for_temperature = None
+        super().__init__(entry_for_temperature=None,
+                         label_for_temperature=None,
+                         answer='Enter a temperature in the box')
 
 
 def main():
@@ -43,9 +48,11 @@ def main():
     # temperature that the user enters in the Entry box.
     # We store the label in the Temperature object so that we can later
     # put the computed temperature on it.
-    label = ttk.Label(frame, text='Enter a temperature in the box')
+    label = ttk.Label(frame)
     label.grid()
     temperature.label_for_temperature = label
+    # Each time the answer changes, the Label shows it.
+    temperature.subscribe(['answer'], lambda data: show_answer(data))
 
     # Buttons that: get Entry value, compute and display temperature
     button1 = ttk.Button(frame, text='Compute Fahrenheit from Celsius')
@@ -73,7 +80,7 @@ def celsius_from_fahrenheit(temperature):
     # provided for it.
     format_string = '{:0.2f} Fahrenheit is {:0.2f} Celsius'
     answer = format_string.format(fahrenheit, celsius)
-    temperature.label_for_temperature['text'] = answer
+    temperature.answer = answer
 
 
 def fahrenheit_from_celsius(temperature):
@@ -90,7 +97,11 @@ def fahrenheit_from_celsius(temperature):
     # provided for it.
     format_string = '{:0.2f} Celsius is {:0.2f} Fahrenheit'
     answer = format_string.format(celsius, fahrenheit)
-    temperature.label_for_temperature['text'] = answer
+    temperature.answer = answer
+
+
+def show_answer(temperature):
+    temperature.label_for_temperature['text'] = temperature.answer
 
 
 # ----------------------------------------------------------------------
@@ -18,12 +18,17 @@ Authors: David Mutchler and his colleagues
 
 import tkinter
 from tkinter import ttk
+from event_log import EventLog
 
 
 def main():
     # Make root, frame and 3 buttons with callbacks.
     root = tkinter.Tk()
 
+    # Key presses can come fast.  Printing is slow, so the handlers
+    # below put what they print into an EventLog, which prints it soon.
+    event_log = EventLog()
+
     main_frame = ttk.Frame(root, padding=20)
     main_frame.grid()
 
@@ -36,9 +41,9 @@ def main():
     spin_button = ttk.Button(main_frame, text='Spin')
     spin_button.grid()
 
-    left_button['command'] = lambda: go_left_button()
-    right_button['command'] = lambda: go_right()
-    spin_button['command'] = lambda: spin()
+    left_button['command'] = lambda: go_left_button(event_log)
+    right_button['command'] = lambda: go_right(event_log)
+    spin_button['command'] = lambda: spin(event_log)
 
     # --------------------------------------------------------------------
     # For general-purpose keyboard events, use    root.bind_all(...).
@@ -52,8 +57,10 @@ def main():
     #
     # Try press, release, click and press-and-hold in the examples.
     # --------------------------------------------------------------------
-    root.bind_all('<KeyPress>', lambda event: pressed_a_key(event))
-    root.bind_all('<KeyRelease>', lambda event: released_a_key(event))
+    root.bind_all('<KeyPress>',
+                  lambda event: pressed_a_key(event, event_log))
+    root.bind_all('<KeyRelease>',
+                  lambda event: released_a_key(event, event_log))
 
     # --------------------------------------------------------------------
     # To bind a particular key, simply specify the key (see below).
@@ -73,52 +80,53 @@ def main():
     # at the top of this module, and also perhaps Table 7.1 of
     #   www.pythonware.com/library/tkinter/introduction/events-and-bindings.htm
     # --------------------------------------------------------------------------
-    root.bind_all('<Key-L>', lambda event: go_left(event))
-    root.bind_all('<Key-R>', lambda event: go_right(event))
-    root.bind_all('<Key-r>', lambda event: go_right(event))
-    root.bind_all('<Key-space>', lambda event: spin(event))
+    root.bind_all('<Key-L>', lambda event: go_left(event, event_log))
+    root.bind_all('<Key-R>', lambda event: go_right(event_log, event))
+    root.bind_all('<Key-r>', lambda event: go_right(event_log, event))
+    root.bind_all('<Key-space>', lambda event: spin(event_log, event))
 
     root.mainloop()
+    event_log.close()  # Prints whatever has not been printed yet
 
 
-def pressed_a_key(event):
+def pressed_a_key(event, event_log):
     # Notice how you can find out the key that was pressed.
-    print('You pressed the', event.keysym, 'key')
+    event_log.log('You pressed the', event.keysym, 'key')
 
 
-def released_a_key(event):
-    print('You released the', event.keysym, 'key')
+def released_a_key(event, event_log):
+    event_log.log('You released the', event.keysym, 'key')
 
 
-def go_left(event):
-    print('You pressed the ' + event.keysym + ' key: ', end='')
-    print('Go left!')
+def go_left(event, event_log):
+    event_log.log('You pressed the ' + event.keysym + ' key: ', end='')
+    event_log.log('Go left!')
 
 
-def go_left_button():
-    print('You clicked the Left button: ', end='')
-    print('Go left!')
+def go_left_button(event_log):
+    event_log.log('You clicked the Left button: ', end='')
+    event_log.log('Go left!')
 
 
-def go_right(event=None):
+def go_right(event_log, event=None):
     # Fancier version that allows EITHER key OR button presses.
     # The former provides the event, the latter does not.
     # It is UN-likely that you will want this fancier version.
     # Instead, use the SIMPLER version per   go_left.
     if event is None:
-        print('Button press: ', end='')
+        event_log.log('Button press: ', end='')
     else:
-        print('You pressed the ' + event.keysym + ' key: ', end='')
-    print('Go right!')
+        event_log.log('You pressed the ' + event.keysym + ' key: ', end='')
+    event_log.log('Go right!')
 
 
-def spin(event=None):
+def spin(event_log, event=None):
     # Fancier version, see comment in   go_right.
     if event is None:
-        print('Button press: ', end='')
+        event_log.log('Button press: ', end='')
     else:
-        print('You pressed the ' + event.keysym + ' key: ', end='')
-    print('Spin!')
+        event_log.log('You pressed the ' + event.keysym + ' key: ', end='')
+    event_log.log('Spin!')
 
 
 # ----------------------------------------------------------------------
@@ -22,20 +22,30 @@ Authors: David Mutchler and his colleagues
 
 import tkinter
 from tkinter import ttk
+from event_dispatch import Dispatcher
+from widget_updates import WidgetUpdater
+from state_store import Store
 
 
-class Data(object):
+class Data(Store):
+    __slots__ = ('number', 'entry_box1', 'entry_box2', 'number_label',
+                 'updater')
+
     def __init__(self):
-        self.number = 0
-        self.entry_box1 = None
-        self.entry_box2 = None
-        self.number_label = None
+        super().__init__(number=0, entry_box1=None, entry_box2=None,
+                         number_label=None, updater=None)
 
 
 def main():
     data = Data()
 
+    # The Dispatcher finds the function for each event in a table,
+    # and times each function (see the report at the end).
+    dispatcher = Dispatcher()
+
     root = tkinter.Tk()
+    # Changes to the Label are made at most once per idle time.
+    data.updater = WidgetUpdater(root)
 
     main_frame = ttk.Frame(root, padding=20)
     main_frame.grid()
@@ -57,6 +67,8 @@ def main():
     number_label = ttk.Label(main_frame, text=number_text)
     number_label.grid()
     data.number_label = number_label
+    # Each time the number changes, the Label shows it.
+    data.subscribe(['number'], lambda data: show_number(data))
 
     # --------------------------------------------------------------------
     # In the previous module, you saw   bind_all   which binds the Event
@@ -67,17 +79,21 @@ def main():
 
     entry1 = ttk.Entry(main_frame, width=4)
     entry1.grid()
-    entry1.bind('<Return>', lambda event: callback1(event, data))
+    dispatcher.bind(entry1, '<Return>',
+                    lambda event: change_by_entry_box(event, data, 1),
+                    'add the number in entry1')
     data.entry_box1 = entry1
 
     entry2 = ttk.Entry(main_frame, width=4)
     entry2.grid()
-    entry2.bind('<Return>', lambda event: callback2(event, data))
+    dispatcher.bind(entry2, '<Return>',
+                    lambda event: change_by_entry_box(event, data, -1),
+                    'subtract the number in entry2')
     data.entry_box2 = entry2
 
     # --------------------------------------------------------------------
     # You can bind Events to Buttons (and any other Widget).  So the
-    # first   button.bind   below shows an alternative to ['command'].
+    # first   bind   below shows an alternative to ['command'].
     # --------------------------------------------------------------------
 
     button_text = 'Use the TAB key to give me the "focus",'
@@ -85,64 +101,52 @@ def main():
     button = ttk.Button(main_frame, text=button_text)
     button.grid()
 
-    button.bind('<Button-1>', lambda event: callback3(event, data))
-    button.bind('<Key-u>', lambda event: callback3(event, data))
-    button.bind('<Key-d>', lambda event: callback3(event, data))
+    dispatcher.bind(button, '<Button-1>',
+                    lambda event: change_number(data, 1,
+                                                'button was pressed'),
+                    'button pressed')
+    dispatcher.bind(button, '<Key-u>',
+                    lambda event: change_number(
+                        data, 1, 'u key was pressed while the button'
+                                 ' had focus'),
+                    'u key')
+    dispatcher.bind(button, '<Key-d>',
+                    lambda event: change_number(
+                        data, -1, 'd key was pressed while the button'
+                                  ' had focus'),
+                    'd key')
 
     root.mainloop()
+    print(dispatcher.report())
+    print(data.updater.report())
 
 
-def callback1(event, data):
+def change_by_entry_box(event, data, sign):
     """
-    Increases the number in the given Data object by the value
-    of the Entry box bound to the given Event.
+    Increases (if sign is 1) or decreases (if sign is -1) the number
+    in the given Data object by the value of the Entry box bound to
+    the given Event.
     """
     widget = event.widget
     number_in_entry_box = int(widget.get())
-    print('This is callback1, which uses Widget: ' + str(widget))
-    data.number = data.number + number_in_entry_box
-
-    print('  The number is now ' + str(data.number))
-    data.number_label['text'] = 'The number is {}'.format(data.number)
+    print('The Entry box is Widget: ' + str(widget))
+    change_number(data, sign * number_in_entry_box)
 
 
-def callback2(event, data):
+def change_number(data, amount, message=None):
     """
-    Decreases the number in the given Data object by the value
-    of the Entry box bound to the given Event.
+    Changes the number in the given Data object by the given amount,
+    printing the given message (if any) first.
     """
-    widget = event.widget
-    number_in_entry_box = int(widget.get())
-    print('This is callback2, which uses Widget: ' + str(widget))
-    data.number = data.number - number_in_entry_box
-
+    if message is not None:
+        print(message)
+    data.number = data.number + amount
     print('  The number is now ' + str(data.number))
-    data.number_label['text'] = 'The number is {}'.format(data.number)
 
 
-def callback3(event, data):
-    """
-    Increments or decrements the number in the given Data object
-    depending on the given Event.
-    """
-    print('hello')
-    if event.type == '2':  # 2 is the KEY type in Windows, it seems
-        if event.keysym == 'u':
-            print('u key was pressed while the button had focus')
-            data.number = data.number + 1
-        elif event.keysym == 'd':
-            print('d key was pressed while the button had focus')
-            data.number = data.number - 1
-        else:
-            print('Unexpected - key ' + event.keysym + ' was pressed.')
-    elif event.type == '4':  # 4 is the BUTTON type in Windows, it seems
-        print('button was pressed')
-        data.number = data.number + 1  # So mouse press is same as u key.
-    else:
-        print('Unexpected - event type ' + event.type + ' occurred.')
-
-    print('  The number is now ' + str(data.number))
-    data.number_label['text'] = 'The number is {}'.format(data.number)
+def show_number(data):
+    data.updater.set(data.number_label, 'text',
+                     'The number is {}'.format(data.number))
 
 
 # ----------------------------------------------------------------------
@@ -11,18 +11,24 @@ Authors: David Mutchler and his colleagues
 
 import tkinter
 from tkinter import ttk
+from widget_updates import WidgetUpdater
+from state_store import Store
 
 
-class Data(object):
+class Data(Store):
+    __slots__ = ('number', 'color', 'number_label', 'updater')
+
     def __init__(self):
-        self.number = 0
-        self.number_label = None
+        super().__init__(number=0, color=None, number_label=None,
+                         updater=None)
 
 
 def main():
     data = Data()
 
     root = tkinter.Tk()
+    # Changes to the Label are made at most once per idle time.
+    data.updater = WidgetUpdater(root)
 
     main_frame = ttk.Frame(root, padding=50)
     main_frame.grid()
@@ -31,6 +37,8 @@ def main():
     label = ttk.Label(main_frame, text=label_text)
     label.grid()
     data.number_label = label
+    # Each time the number or color changes, the Label shows it.
+    data.subscribe(['number', 'color'], lambda data: show_number(data))
 
     # The default is for menus to be "tear-off" -- they can be dragged
     # off the menubar.  Use whichever style best suits your GUI.
@@ -68,18 +76,20 @@ def main():
 def increase_number(data, amount):
     """
     Increases the number in the given Data object by the given amount
-    and updates the Label in the given Data object that displays
-    the number.
+    (and so the Label that displays the number is updated).
     """
     data.number = data.number + amount
-    new_text = 'The number is {}'.format(data.number)
-    data.number_label['text'] = new_text
 
 
 def show(data, color):
+    data.color = color
+
+
+def show_number(data):
     new_text = 'The number is {}'.format(data.number)
-    data.number_label['text'] = new_text
-    data.number_label['background'] = color
+    data.updater.set(data.number_label, 'text', new_text)
+    if data.color is not None:
+        data.updater.set(data.number_label, 'background', data.color)
 
 
 # ----------------------------------------------------------------------
@@ -3,6 +3,10 @@ Example showing for tkinter and ttk:
   -- ttk.Checkbutton
   -- ttk.Radiobutton
   -- Using tkinter's StringVar, IntVar, DoubleVar to track changes
+  -- Doing something LATER without freezing the GUI, using the
+       Scheduler in the   after_scheduler   module (which must be
+       in the same folder as this module).  NEVER call  time.sleep
+       in a callback: nothing else can happen until it returns.
 
 Authors: David Mutchler and his colleagues
          at Rose-Hulman Institute of Technology.
@@ -10,12 +14,13 @@ Authors: David Mutchler and his colleagues
 
 import tkinter
 from tkinter import ttk
-import time
+from after_scheduler import Scheduler, LatencyProbe
 
 
 def main():
     # Thus usual root and main Frame.
     root = tkinter.Tk()
+    scheduler = Scheduler(root)
     mainframe = ttk.Frame(root, padding=20)
     mainframe.grid()
 
@@ -53,7 +58,8 @@ def main():
         radio['command'] = lambda: radiobutton_changed(radio_observer)
 
     button['command'] = lambda: button_pressed(checkbutton_observer,
-                                               radio_observer)
+                                               radio_observer,
+                                               scheduler)
 
     # Layout the widgets (here, in a row with padding between them).
     # You can see more on layout in a subsequent example.
@@ -76,11 +82,19 @@ def radiobutton_changed(radiobutton_observer):
     print('The radiobutton changed to', radiobutton_observer.get())
 
 
-def button_pressed(checkbutton_observer, radiobutton_observer):
+def button_pressed(checkbutton_observer, radiobutton_observer, scheduler):
     print('After 2 seconds, I will toggle the Checkbutton')
     print('and reset the radiobutton to Peter\'s.')
-    time.sleep(2)
 
+    # Ask for   reset_widgets   to be called in 2 seconds, and return
+    # right away, so the GUI keeps working while we wait.  The probe
+    # checks (every 10 milliseconds) that it really does keep working.
+    probe = LatencyProbe(scheduler.widget).start()
+    scheduler.call_later(2000, reset_widgets, checkbutton_observer,
+                         radiobutton_observer, probe)
+
+
+def reset_widgets(checkbutton_observer, radiobutton_observer, probe):
     if checkbutton_observer.get() == '1':
         checkbutton_observer.set('0')
     else:
@@ -88,6 +102,9 @@ def button_pressed(checkbutton_observer, radiobutton_observer):
 
     radiobutton_observer.set('peter')
 
+    probe.stop()
+    print('While waiting, the event loop ran:', probe.report())
+
 
 # ----------------------------------------------------------------------
 # Calls  main  to start the ball rolling.
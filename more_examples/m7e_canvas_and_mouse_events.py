@@ -3,20 +3,78 @@ Example showing for tkinter and ttk how to:
   -- Capture mouse clicks, releases and motion.
   -- Draw on a Canvas.
 
+Each drag of the mouse is drawn as ONE growing line (a "stroke"),
+using the StrokeEngine in the   canvas_strokes   module (which must be
+in the same folder as this module).  Strokes are simplified as they
+are drawn, keeping them within about   pen_data.tolerance   pixels of where
+the mouse went but with far fewer points.
+
+While dragging, the points of the mouse-motion events are collected
+by a MotionCoalescer and added to the stroke once per display frame,
+instead of once per event.
+
+Dragging the RIGHT mouse button erases whatever it passes over.
+A SpatialIndex (in the   canvas_index   module) keeps track of where
+every circle and stroke is, so erasing stays fast on huge drawings.
+
+The mouse WHEEL zooms in and out, and dragging the MIDDLE mouse button
+pans.  Finished circles and strokes are kept in a Viewport (in the
+  canvas_viewport   module), which draws only the shapes in view, and
+draws simplified strokes when zoomed out.
+
+With "Flatten finished drawing" checked, each finished circle and
+stroke is painted into the images of a RasterBackingStore (in the
+  canvas_raster   module) instead of staying on the Canvas as an item,
+so the Canvas stays quick to redraw however long you draw.
+(While zoomed or panned, the flattened images are hidden and the
+Viewport draws those shapes instead, and shapes drawn then are not
+flattened.)
+
+Everything you draw is saved, as you draw it, in the file
+  drawing.tkd
+(see the   canvas_file   module), and is loaded again the next time
+you run this module, a part at a time as it comes into view.
+Delete that file to start over.
+
 Authors: David Mutchler and his colleagues
          at Rose-Hulman Institute of Technology.
 """
 
 import tkinter
 from tkinter import ttk
+import os
+from canvas_strokes import StrokeEngine, MotionCoalescer
+from canvas_raster import RasterBackingStore
+from canvas_file import DrawingLog, DrawingFile
+from canvas_viewport import Viewport
+from state_store import Store
+
 
+class PenData(Store):
+    __slots__ = ('color', 'width', 'tolerance', 'stroke_engine',
+                 'motion_coalescer', 'viewport', 'next_key',
+                 'eraser_radius', 'flatten', 'backing_store', 'filename',
+                 'drawing_log', 'drawing_file', 'numbers_loaded', 'pan_x',
+                 'pan_y')
 
-class PenData(object):
     def __init__(self):
+        super().__init__()
         self.color = 'blue'
-        self.mouse_position_x = None
-        self.mouse_position_y = None
-        self.is_dragging = False
+        self.width = 5
+        self.tolerance = 1.5  # Pixels; 0 keeps every point
+        self.stroke_engine = None
+        self.motion_coalescer = None
+        self.viewport = None
+        self.next_key = 0  # Key for the next finished circle or stroke
+        self.eraser_radius = 10
+        self.flatten = False
+        self.backing_store = None
+        self.filename = 'drawing.tkd'
+        self.drawing_log = None
+        self.drawing_file = None
+        self.numbers_loaded = set()
+        self.pan_x = None
+        self.pan_y = None
 
 
 def main():
@@ -28,7 +86,10 @@ def main():
     main_frame.grid()
 
     instructions = 'Click the left mouse button to make circles,\n'
-    instructions = instructions + 'drag the left mouse button to draw'
+    instructions = instructions + 'drag the left mouse button to draw,\n'
+    instructions = instructions + 'drag the right mouse button to erase,\n'
+    instructions = instructions + 'use the wheel to zoom, and drag the\n'
+    instructions = instructions + 'middle mouse button to pan'
     label = ttk.Label(main_frame, text=instructions)
     label.grid()
 
@@ -36,46 +97,183 @@ def main():
     # Note that Canvas is a tkinter (NOT a ttk) class.
     canvas = tkinter.Canvas(main_frame, background='lightgray')
     canvas.grid()
+    pen_data.stroke_engine = StrokeEngine(canvas,
+                                          tolerance=pen_data.tolerance)
+    pen_data.motion_coalescer = MotionCoalescer(
+        canvas, pen_data.stroke_engine.extend_stroke)
+    pen_data.backing_store = RasterBackingStore(canvas,
+                                                background='lightgray')
+    pen_data.viewport = Viewport(canvas, pen_data.backing_store)
+    pen_data.viewport.on_view_change(
+        lambda left, top, right, bottom:
+        load_drawing(pen_data, left, top, right, bottom))
+    open_drawing(pen_data)
 
     # Make callbacks for mouse events.
-    canvas.bind('<Button-1>', lambda event: left_mouse_click(event))
+    canvas.bind('<Button-1>',
+                lambda event: left_mouse_click(event, pen_data))
     canvas.bind('<B1-Motion>',
                 lambda event: left_mouse_drag(event, pen_data))
     canvas.bind('<B1-ButtonRelease>',
                 lambda event: left_mouse_release(pen_data))  # @UnusedVariable
+    canvas.bind('<Button-3>', lambda event: erase(event, pen_data))
+    canvas.bind('<B3-Motion>', lambda event: erase(event, pen_data))
+
+    # The mouse wheel is <MouseWheel> on Windows and Mac,
+    # but buttons 4 and 5 on Linux.
+    canvas.bind('<MouseWheel>',
+                lambda event: zoom(event, pen_data, event.delta > 0))
+    canvas.bind('<Button-4>', lambda event: zoom(event, pen_data, True))
+    canvas.bind('<Button-5>', lambda event: zoom(event, pen_data, False))
+    canvas.bind('<Button-2>', lambda event: start_pan(event, pen_data))
+    canvas.bind('<B2-Motion>', lambda event: pan(event, pen_data))
 
     # Make a button to change the color.
-    button = ttk.Button(main_frame, text='Flip pen color')
+    button = ttk.Button(main_frame)
     button.grid()
     button['command'] = lambda: flip_pen_color(pen_data)
+    # The button shows the pen's color, each time it changes.
+    pen_data.subscribe(['color'], lambda data: show_pen_color(data, button))
+
+    # Make a button to go back to the unzoomed, unpanned view.
+    reset_button = ttk.Button(main_frame, text='Reset zoom')
+    reset_button.grid()
+    reset_button['command'] = lambda: pen_data.viewport.reset()
+
+    # Make a checkbutton to turn flattening on and off.
+    flatten_observer = tkinter.BooleanVar(value=pen_data.flatten)
+    flatten_checkbutton = ttk.Checkbutton(main_frame,
+                                          text='Flatten finished drawing',
+                                          variable=flatten_observer)
+    flatten_checkbutton.grid()
+    flatten_checkbutton['command'] = lambda: set_flatten(pen_data,
+                                                         flatten_observer)
 
     root.mainloop()
+    close_drawing(pen_data)
 
 
-def left_mouse_click(event):
-    canvas = event.widget
-    canvas.create_oval(event.x - 10, event.y - 10,
-                       event.x + 10, event.y + 10,
-                       fill='green', width=3)
+def left_mouse_click(event, data):
+    # Make the circle look the same size at any zoom.
+    scale = data.viewport.scale
+    x, y = data.viewport.to_world(event.x, event.y)
+    add_shape(('dot', x, y, 10 / scale, 'green', 'black', 3 / scale), data)
 
 
 def left_mouse_drag(event, data):
-    # data.mouse_position_x and _y keep track of the PREVIOUS mouse
-    # position while we are dragging.
-    canvas = event.widget
-    if data.is_dragging:
-        canvas.create_line(data.mouse_position_x, data.mouse_position_y,
-                           event.x, event.y,
-                           fill=data.color, width=5)
+    # The first drag event starts a stroke.  Each later one adds its
+    # point to the MotionCoalescer, which extends the stroke once per frame.
+    engine = data.stroke_engine
+    if engine.is_drawing():
+        data.motion_coalescer.add(event.x, event.y)
     else:
-        data.is_dragging = True  # Start dragging
-
-    data.mouse_position_x = event.x
-    data.mouse_position_y = event.y
+        engine.begin_stroke(event.x, event.y, data.color, data.width)
 
 
 def left_mouse_release(data):
-    data.is_dragging = False
+    data.motion_coalescer.flush()
+    stroke = data.stroke_engine.end_stroke()
+    if stroke is not None:
+        # The stroke was drawn in screen coordinates.  Hand it over to
+        # the Viewport in world coordinates.
+        points = data.viewport.to_world_points(stroke.points)
+        width = stroke.width / data.viewport.scale
+        stroke.delete_items()
+        add_shape(('line', points, stroke.color, width), data)
+
+        print('Stroke: {} points in, {} points out'.format(
+            stroke.points_in, stroke.number_of_points()))
+        print('  So far: {} motion events, {} flushes'.format(
+            data.motion_coalescer.events_received,
+            data.motion_coalescer.flushes_performed))
+
+
+def add_shape(shape, data, number_in_file=None):
+    """
+    Adds a finished circle or stroke to the drawing (and saves it,
+    unless it came from the drawing file).  Returns its key.
+    """
+    key = data.next_key
+    data.next_key = data.next_key + 1
+
+    # Paint into the backing store only at the unzoomed, unpanned view,
+    # where its tiles line up with the Canvas.  Otherwise the shape
+    # stays an item that the Viewport draws.
+    if data.flatten and data.viewport.is_identity():
+        if shape[0] == 'dot':
+            data.backing_store.add_dot(key, *shape[1:])
+        else:
+            data.backing_store.add_line(key, *shape[1:])
+    data.viewport.add_shape(key, shape)
+
+    if number_in_file is not None:
+        data.drawing_log.remember(key, number_in_file)
+    elif shape[0] == 'dot':
+        data.drawing_log.add_dot(key, *shape[1:])
+    else:
+        data.drawing_log.add_line(key, *shape[1:])
+    return key
+
+
+def erase(event, data):
+    """ Deletes the circles and strokes near the mouse. """
+    viewport = data.viewport
+    x, y = viewport.to_world(event.x, event.y)
+    radius = data.eraser_radius / viewport.scale
+    for key in viewport.index.find_at_point(x, y, radius):
+        viewport.remove(key)
+        data.backing_store.remove(key)
+        data.drawing_log.remove(key)
+
+
+def zoom(event, data, zoom_in):
+    if zoom_in:
+        data.viewport.zoom(1.25, event.x, event.y)
+    else:
+        data.viewport.zoom(1 / 1.25, event.x, event.y)
+
+
+def start_pan(event, data):
+    data.pan_x = event.x
+    data.pan_y = event.y
+
+
+def pan(event, data):
+    data.viewport.pan(event.x - data.pan_x, event.y - data.pan_y)
+    data.pan_x = event.x
+    data.pan_y = event.y
+
+
+def open_drawing(data):
+    """ Opens the drawing file and loads the part that is in view. """
+    is_new = not (os.path.exists(data.filename)
+                  and os.path.getsize(data.filename) > 0)
+    # The DrawingLog first, since it cuts off a partly written record.
+    data.drawing_log = DrawingLog(data.filename)
+    if not is_new:
+        data.drawing_file = DrawingFile(data.filename)
+    left, top, right, bottom = data.viewport.world_rectangle()
+    load_drawing(data, left, top, right, bottom)
+
+
+def close_drawing(data):
+    data.drawing_log.close()
+    if data.drawing_file is not None:
+        data.drawing_file.close()
+
+
+def load_drawing(data, left, top, right, bottom):
+    """ Adds the saved shapes in the given area that are not yet added. """
+    if data.drawing_file is None:
+        return
+    for number in data.drawing_file.numbers_in(left, top, right, bottom):
+        if number not in data.numbers_loaded:
+            data.numbers_loaded.add(number)
+            add_shape(data.drawing_file.shape(number), data, number)
+
+
+def set_flatten(data, flatten_observer):
+    data.flatten = flatten_observer.get()
 
 
 def flip_pen_color(data):
@@ -85,6 +283,10 @@ def flip_pen_color(data):
         data.color = 'blue'
 
 
+def show_pen_color(data, button):
+    button['text'] = 'Flip pen color (now {})'.format(data.color)
+
+
 # ----------------------------------------------------------------------
 # Calls  main  to start the ball rolling.
 # ----------------------------------------------------------------------
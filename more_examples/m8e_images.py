@@ -9,16 +9,29 @@ Note: The image file for tkinter/ttk must be a GIF (or one of several
       An unofficial port of PIL to Python 3 is available on the
       course web site (under the Graphics section) of Resources.
 
+The images are loaded by an ImagePipeline (in the   image_pipeline
+module, which must be in the same folder as this module) in other
+threads, so the window appears at once and each image shows up when it
+is ready.  The pipeline puts them in an ImageCache (in the   image_cache
+module), so each file is decoded just once for each size, however many
+widgets show it.
+
 Authors: David Mutchler and his colleagues
          at Rose-Hulman Institute of Technology.
 """
 
 import tkinter
 from tkinter import ttk
+import time
+from image_cache import ImageCache
+from image_pipeline import ImagePipeline
 
 
 def main():
+    start = time.perf_counter()
     root = tkinter.Tk()
+    image_cache = ImageCache()
+    pipeline = ImagePipeline(root, image_cache)
 
     main_frame = ttk.Frame(root, padding=20)
     main_frame.grid()
@@ -27,18 +40,39 @@ def main():
     # formats). To convert a JPG or anything else, use an outside tool.
     # Note that the image file must be in the same folder as this
     # module, if you use this way to refer to the image file.
-    photo = tkinter.PhotoImage(file='tkinter_mqtt_ev3.gif')
-
-    button1 = ttk.Button(main_frame, image=photo)
-    # The next line is necessary when your root.mainloop() call is outside the 
-    # current method. Tkinter has a bug that makes it think the image is ready for 
-    # garbage collection, which makes the image fully transparent. 
-    # See: http://effbot.org/pyfaq/why-do-my-tkinter-images-not-appear.htm
-    button1.image = photo
+    button1 = ttk.Button(main_frame, text='Loading...')
+    # The ImageCache keeps a reference to the PhotoImage.  Without that,
+    # Python would free it when this function returned, and the Button
+    # would go blank.  (That is why you often see   button1.image = photo.)
+    pipeline.load('tkinter_mqtt_ev3.gif', 1,
+                  lambda photo: show_image(button1, photo, pipeline, start))
     button1.grid()
     button1['command'] = lambda: print('hello')
 
+    # The same picture, a quarter as big, with text.  The second Button
+    # shares the PhotoImage that was made for the first one.
+    for k in range(2):
+        button = ttk.Button(main_frame, text='Small button {}'.format(k + 1),
+                            compound='left')
+        button.grid()
+        pipeline.load('tkinter_mqtt_ev3.gif', 1 / 4,
+                      lambda photo, button=button:
+                      show_image(button, photo, pipeline, start))
+
+    # The first time that the event loop has nothing to do, the window
+    # is showing and can be used.
+    root.after_idle(lambda: print('The window could be used after'
+                                  ' {:.1f} ms'.format(
+                                      (time.perf_counter() - start) * 1000)))
+
     root.mainloop()
+    pipeline.close()
+
+
+def show_image(button, photo, pipeline, start):
+    button['image'] = photo
+    print('An image was showing after {:.1f} ms; so far, {}'.format(
+        (time.perf_counter() - start) * 1000, pipeline.report()))
 
 
 # ----------------------------------------------------------------------
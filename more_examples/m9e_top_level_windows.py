@@ -8,21 +8,40 @@ Authors: David Mutchler and his colleagues
 
 import tkinter
 from tkinter import ttk
+from widget_updates import WidgetUpdater
+from state_store import Store
+from window_pool import WindowPool
+from fan_out import FanOut
+from leak_detector import LeakDetector
 
 
-class WindowsAndNumber(object):
+class WindowsAndNumber(Store):
+    __slots__ = ('number', 'pool', 'fan_out', 'updater', 'leak_detector')
+
     def __init__(self):
-        self.number = None
-        self.label = None
-        self.windows = []
+        super().__init__(number=0, pool=None, fan_out=None, updater=None,
+                         leak_detector=None)
 
 
 def main():
     """ Constructs and runs the GUI """
     root = tkinter.Tk()
     windows_and_number = WindowsAndNumber()
+    # Changes to the Labels are made at most once per idle time.
+    windows_and_number.updater = WidgetUpdater(root)
+    # Each time the number changes, every Label that shows it does so
+    # (in the next idle time).
+    windows_and_number.fan_out = FanOut(root, windows_and_number,
+                                        ['number'],
+                                        windows_and_number.updater)
+    # Pop-up windows are hidden when closed, and reused.
+    windows_and_number.pool = WindowPool(
+        root, lambda window: make_pop_up_label(window, windows_and_number))
 
     gui(root, windows_and_number)
+    # Counts widgets, images and memory, to report what grows.  It starts
+    # watching (and tracing memory) only when its Button is first pressed.
+    windows_and_number.leak_detector = LeakDetector(root)
 
     root.mainloop()
 
@@ -45,10 +64,14 @@ def put_stuff_on_main_window(root, windows):
     increase_button['command'] = lambda: change_number(windows, 1)
 
     destroy_button = ttk.Button(window1_frame,
-                                text='Destroy some windows')
+                                text='Close the pop-up windows')
     destroy_button.grid()
     destroy_button['command'] = lambda: destroy_windows(windows)
 
+    report_button = ttk.Button(window1_frame, text='Report what grew')
+    report_button.grid()
+    report_button['command'] = lambda: report_growth(windows)
+
 
 def put_stuff_on_window2(windows_and_number):
     """ Puts Buttons on a secondary window. """
@@ -78,34 +101,64 @@ def put_stuff_on_window3(windows_and_number):
     number_label = ttk.Label(window3_frame, text='The number is: 0')
     number_label.grid()
 
-    windows_and_number.number = 0
-    windows_and_number.label = number_label
+    windows_and_number.fan_out.add(number_label, show_number)
 
 
 def change_number(windows_and_number, delta):
     """
-    Changes the number in the data by the given delta,
-    then displays the changed value in its Label.
+    Changes the number in the data by the given delta
+    (and so every Label that shows it displays the changed value).
     """
     windows_and_number.number = windows_and_number.number + delta
+
+
+def show_number(label, windows_and_number):
     msg = 'The number is: {}'.format(windows_and_number.number)
-    windows_and_number.label['text'] = msg
+    windows_and_number.updater.set(label, 'text', msg)
 
 
-def pop_up(windows_and_number):
-    """ Pops up a window, with a Label that shows some info. """
-    window = tkinter.Toplevel()  # Note Toplevel, NOT Tk.
+def show_pop_up_number(label, windows_and_number):
     msg = 'The number is: \n {}'.format(windows_and_number.number)
-    label = ttk.Label(window, text=msg)
-    label.grid()
+    windows_and_number.updater.set(label, 'text', msg)
+
 
-    windows_and_number.windows.append(window)
+def pop_up(windows_and_number):
+    """
+    Pops up a window, with a Label that shows the number (and keeps
+    showing it as it changes).  The window is one that was closed
+    earlier, if there is one.
+    """
+    windows_and_number.pool.open()
+
+
+def make_pop_up_label(window, windows_and_number):
+    """ Puts a Label that shows the number on a new pop-up window. """
+    label = ttk.Label(window)
+    label.grid()
+    windows_and_number.fan_out.add(label, show_pop_up_number)
+    return label
 
 
 def destroy_windows(data):
-    """ Destroys all the windows stored in the given Data object. """
-    for k in range(len(data.windows)):
-        data.windows[k].destroy()
+    """
+    Closes all the pop-up windows in the given Data object's pool.
+    They are just hidden, to be reused by the next pop-ups.
+    """
+    data.pool.close_all()
+
+
+def report_growth(data):
+    """
+    Prints what grew (windows, images, memory) since the last report.
+    The first time, just starts watching.  Pop up and close windows a
+    few times between reports: since closed windows are reused, the
+    number of windows should stop growing.
+    """
+    report = data.leak_detector.checkpoint()
+    if report is None:
+        print('Watching what grows from now on.  Press again to see it.')
+    else:
+        print(report)
 
 
 # ----------------------------------------------------------------------
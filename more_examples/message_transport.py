@@ -0,0 +1,293 @@
+"""
+Sending messages to a robot over the network WITHOUT freezing the GUI.
+
+A MessageTransport keeps a QUEUE of messages waiting to be sent.
+Publishing a message just adds it to the queue and returns at once, so
+a Button's callback never waits for the network.  The transport's
+run   coroutine (run it with the   async_tk   module, or any asyncio
+event loop) sends the queued messages:
+  -- in BATCHES: all the messages that are waiting go out in one write,
+  -- RECONNECTING when the connection is lost, waiting a little longer
+       after each failed try.  Messages wait in the queue meanwhile.
+       (There are no acknowledgements, so the few messages that were
+       on their way when the connection broke can be lost.)
+  -- with BACKPRESSURE: if the network is slower than the messages, the
+       queue is allowed to grow only to   max_queued   messages.  Then
+       publish   drops the OLDEST message (a robot only cares about the
+       latest commands), while   await send(...)   waits for room.
+
+Each message has a TOPIC (like "robot/drive") and a PAYLOAD (bytes),
+as in MQTT, sent as:
+  length of the topic (2 bytes), length of the payload (4 bytes),
+  the topic (in UTF-8), the payload.
+
+A LoopbackBroker is a stand-in for a real broker that runs in the same
+program, so that the transport can be tried (and tested) offline.
+
+Run this module directly for a benchmark of messages per second and of
+the time from a click to the broker getting the message.
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import asyncio
+import collections
+import struct
+import time
+
+FRAME_HEADER = struct.Struct('>HI')  # topic length, payload length
+LOOPBACK_PORT = 18830
+
+
+def frame(topic, payload):
+    """ Returns the bytes that send the given message. """
+    topic = topic.encode('utf-8')
+    return FRAME_HEADER.pack(len(topic), len(payload)) + topic + payload
+
+
+async def read_frame(reader):
+    """ Returns (topic, payload) of the next message, or None at the end. """
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+        topic_length, payload_length = FRAME_HEADER.unpack(header)
+        data = await reader.readexactly(topic_length + payload_length)
+    except asyncio.IncompleteReadError:
+        return None
+    return data[:topic_length].decode('utf-8'), data[topic_length:]
+
+
+class MessageTransport(object):
+    """ Sends messages to a broker, from a queue, in the background. """
+
+    def __init__(self, host='127.0.0.1', port=LOOPBACK_PORT, max_queued=1000,
+                 max_batch=256, smallest_retry_seconds=0.1,
+                 largest_retry_seconds=5):
+        self.host = host
+        self.port = port
+        self.max_queued = max_queued
+        self.max_batch = max_batch
+        self.smallest_retry_seconds = smallest_retry_seconds
+        self.largest_retry_seconds = largest_retry_seconds
+
+        self.queue = collections.deque()  # Frames waiting to be sent
+        self.has_messages = asyncio.Event()
+        self.has_room = asyncio.Event()
+        self.has_room.set()
+        self.is_connected = False
+
+        self.number_published = 0
+        self.number_sent = 0
+        self.number_of_batches = 0
+        self.number_dropped = 0
+        self.number_of_connections = 0
+
+    def publish(self, topic, payload):
+        """
+        Queues the given message (payload is bytes) and returns at once.
+        If the queue is full, the oldest queued message is dropped.
+        """
+        if len(self.queue) >= self.max_queued:
+            self.queue.popleft()
+            self.number_dropped = self.number_dropped + 1
+        self.queue.append(frame(topic, payload))
+        self.number_published = self.number_published + 1
+        self.has_messages.set()
+        if len(self.queue) >= self.max_queued:
+            self.has_room.clear()
+
+    async def send(self, topic, payload):
+        """ Like publish, but waits (instead of dropping) if it is full. """
+        while len(self.queue) >= self.max_queued:
+            await self.has_room.wait()
+        self.publish(topic, payload)
+
+    async def run(self):
+        """ Connects (and reconnects) and sends messages, forever. """
+        retry_seconds = self.smallest_retry_seconds
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host,
+                                                               self.port)
+            except OSError:
+                await asyncio.sleep(retry_seconds)
+                retry_seconds = min(2 * retry_seconds,
+                                    self.largest_retry_seconds)
+                continue
+
+            retry_seconds = self.smallest_retry_seconds
+            self.is_connected = True
+            self.number_of_connections = self.number_of_connections + 1
+            sender = asyncio.ensure_future(self._send_batches(writer))
+            watcher = asyncio.ensure_future(reader.read())  # Empty at EOF
+            try:
+                await asyncio.wait([sender, watcher],
+                                   return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                self.is_connected = False
+                sender.cancel()
+                watcher.cancel()
+                writer.close()
+            if sender.done() and not sender.cancelled():
+                sender.exception()  # Consumes the connection error
+
+    # ------------------------------------------------------------------
+    # The rest of this class is helpers for the methods above.
+    # ------------------------------------------------------------------
+    async def _send_batches(self, writer):
+        while True:
+            if not self.queue:
+                self.has_messages.clear()
+                await self.has_messages.wait()
+            batch = []
+            while self.queue and len(batch) < self.max_batch:
+                batch.append(self.queue.popleft())
+            self.has_room.set()
+            try:
+                writer.write(b''.join(batch))
+                await writer.drain()
+            except BaseException:
+                # Not known to be sent: put the batch back, in order.
+                self.queue.extendleft(reversed(batch))
+                # As in publish: if that is too many, drop the OLDEST.
+                while len(self.queue) > self.max_queued:
+                    self.queue.popleft()
+                    self.number_dropped = self.number_dropped + 1
+                if len(self.queue) >= self.max_queued:
+                    self.has_room.clear()
+                raise
+            self.number_sent = self.number_sent + len(batch)
+            self.number_of_batches = self.number_of_batches + 1
+
+
+class LoopbackBroker(object):
+    """
+    A stand-in for a message broker, in the same program.  Messages
+    that it gets are passed to the functions that subscribed to their
+    topic, as   function(topic, payload).
+    """
+
+    def __init__(self, host='127.0.0.1', port=LOOPBACK_PORT):
+        self.host = host
+        self.port = port
+        self.server = None
+        self.subscribers = {}  # topic -> list of functions
+        self.connections = {}  # writer -> task, for connected clients
+        self.number_received = 0
+
+    def subscribe(self, topic, function):
+        self.subscribers.setdefault(topic, []).append(function)
+
+    async def start(self):
+        """ Starts listening (on any free port, if   port   is 0). """
+        self.server = await asyncio.start_server(self._serve, self.host,
+                                                 self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """ Stops listening and disconnects every client. """
+        self.server.close()
+        tasks = list(self.connections.values())
+        for writer in list(self.connections):
+            writer.close()
+        await asyncio.gather(*tasks)
+        await self.server.wait_closed()
+
+    async def _serve(self, reader, writer):
+        self.connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                message = await read_frame(reader)
+                if message is None:
+                    break
+                self.number_received = self.number_received + 1
+                for function in self.subscribers.get(message[0], []):
+                    function(message[0], message[1])
+        except (ConnectionError, asyncio.CancelledError):
+            pass  # A client that goes away is no error.
+        finally:
+            self.connections.pop(writer, None)
+            writer.close()
+
+
+# ----------------------------------------------------------------------
+# Benchmark: sustained messages per second, and the time from a "click"
+# (a callback that publishes, as a Button's would) to the broker getting
+# the message, including while the broker restarts.
+# ----------------------------------------------------------------------
+async def stop(task):
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+async def messages_per_second(number_of_messages=200000):
+    broker = LoopbackBroker(port=0)
+    await broker.start()
+    transport = MessageTransport(port=broker.port)
+    runner = asyncio.ensure_future(transport.run())
+
+    payload = b'forward 600 600'
+    start = time.perf_counter()
+    for _ in range(number_of_messages):
+        await transport.send('robot/drive', payload)
+    while broker.number_received < number_of_messages:
+        await asyncio.sleep(0.001)
+    seconds = time.perf_counter() - start
+
+    await stop(runner)
+    await broker.close()
+    print('{} messages in {:.2f} s: {:.0f} messages per second,'
+          ' {:.1f} per batch'.format(number_of_messages, seconds,
+                                     number_of_messages / seconds,
+                                     transport.number_sent
+                                     / transport.number_of_batches))
+
+
+async def click_to_publish(number_of_clicks=2000, milliseconds_apart=1,
+                           restart_broker=False):
+    latencies = []
+    broker = LoopbackBroker(port=0)
+    broker.subscribe('robot/drive', lambda topic, payload: latencies.append(
+        time.perf_counter() - float(payload)))
+    await broker.start()
+    transport = MessageTransport(port=broker.port,
+                                 smallest_retry_seconds=0.01)
+    runner = asyncio.ensure_future(transport.run())
+
+    loop = asyncio.get_running_loop()
+    for k in range(number_of_clicks):
+        loop.call_later(k * milliseconds_apart / 1000,
+                        lambda: transport.publish(
+                            'robot/drive',
+                            '{:.9f}'.format(time.perf_counter()).encode()))
+    if restart_broker:
+        await asyncio.sleep(number_of_clicks * milliseconds_apart / 2000)
+        await broker.close()
+        await asyncio.sleep(0.05)
+        await broker.start()
+
+    end = time.perf_counter() + number_of_clicks * milliseconds_apart / 1000
+    while time.perf_counter() < end + 1 and len(latencies) < number_of_clicks:
+        await asyncio.sleep(0.01)
+    await stop(runner)
+    await broker.close()
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    print('{} clicks{}: {} received, median {:.2f} ms, p99 {:.2f} ms'.format(
+        number_of_clicks, ' (broker restarted)' if restart_broker else '',
+        len(latencies), p50, p99))
+
+
+def benchmark():
+    asyncio.run(messages_per_second())
+    asyncio.run(click_to_publish())
+    asyncio.run(click_to_publish(restart_broker=True))
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,118 @@
+"""
+Reading a number from an Entry box only when it CHANGES.
+
+Calling   int(entry.get())   every time a command is sent asks Tk for
+the text (a call into Tcl) and parses it, again and again, even though
+the text almost never changes.  A SpeedEntry instead:
+  -- gives the Entry a StringVar, and asks to be told (with a "trace")
+       each time its text is changed, and only then parses it,
+  -- keeps the parsed speed in its   value   attribute, so reading the
+       speed is just reading an attribute: no Tcl, no parsing,
+  -- uses the Entry's   validatecommand   so that the user cannot type
+       anything but a whole number from   smallest   to   largest.
+While the box is empty or just a minus sign, the speed stays what it
+was, and the box is shown as INVALID (pink); when the box loses the
+focus, it shows the speed that is in use again.
+
+Run this module directly to compare the time to read the speed.
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import tkinter
+from tkinter import ttk
+import time
+
+
+class SpeedEntry(object):
+    """
+    Keeps the whole number in an Entry box, parsed and checked.
+
+    Type hints:
+      :type entry: ttk.Entry
+    """
+
+    def __init__(self, entry, smallest=-900, largest=900):
+        self.entry = entry
+        self.smallest = smallest
+        self.largest = largest
+        self.number_of_parses = 0
+
+        self.value = 0
+        self.value = self._parse(entry.get())
+        self.variable = tkinter.StringVar(entry, value=entry.get())
+        entry.configure(textvariable=self.variable, validate='key',
+                        validatecommand=(entry.register(self._is_valid),
+                                         '%P'))
+        self.variable.trace_add('write', self._text_changed)
+
+        style = ttk.Style(entry)
+        style.map('Speed.TEntry', fieldbackground=[('invalid', 'pink')])
+        entry.configure(style='Speed.TEntry')
+        entry.bind('<FocusOut>', self._show_value, '+')
+
+    # ------------------------------------------------------------------
+    # The rest of this class is helpers for the methods above.
+    # ------------------------------------------------------------------
+    def _is_valid(self, text):
+        # While typing, allow the text to be empty or just a minus sign.
+        if text in ('', '-'):
+            return True
+        try:
+            return self.smallest <= int(text) <= self.largest
+        except ValueError:
+            return False
+
+    def _text_changed(self, *arguments):
+        text = self.variable.get()
+        self.value = self._parse(text)
+        if text in ('', '-'):
+            self.entry.state(['invalid'])
+        else:
+            self.entry.state(['!invalid'])
+
+    def _show_value(self, event=None):
+        if self.variable.get() in ('', '-'):
+            self.variable.set(str(self.value))
+
+    def _parse(self, text):
+        # Text that is not (yet) a number leaves the speed as it was.
+        self.number_of_parses = self.number_of_parses + 1
+        try:
+            speed = int(text)
+        except ValueError:
+            return self.value
+        return min(self.largest, max(self.smallest, speed))
+
+
+# ----------------------------------------------------------------------
+# Benchmark: reading the speed for each of many commands, with
+# int(entry.get())   versus a SpeedEntry.
+# ----------------------------------------------------------------------
+def benchmark(number_of_commands=100000):
+    root = tkinter.Tk()
+    entry = ttk.Entry(root, width=8)
+    entry.insert(0, '600')
+    entry.grid()
+
+    start = time.perf_counter()
+    for _ in range(number_of_commands):
+        speed = int(entry.get())
+    seconds_with_get = time.perf_counter() - start
+
+    speed_entry = SpeedEntry(entry)
+    start = time.perf_counter()
+    for _ in range(number_of_commands):
+        speed = speed_entry.value
+    seconds_with_cache = time.perf_counter() - start
+
+    print('{} commands at speed {}:'.format(number_of_commands, speed))
+    print('  int(entry.get()):  {:8.2f} ms'.format(seconds_with_get * 1000))
+    print('  SpeedEntry.value:  {:8.2f} ms  ({} parses)'.format(
+        seconds_with_cache * 1000, speed_entry.number_of_parses))
+    root.destroy()
+
+
+if __name__ == '__main__':
+    benchmark()
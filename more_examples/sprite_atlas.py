@@ -0,0 +1,294 @@
+"""
+Loading MANY small icons from ONE image file (a "sprite atlas").
+
+With one   tkinter.PhotoImage(file=...)   per icon, a GUI with a
+thousand icons opens, reads and decodes a thousand files before its
+window appears.  Instead:
+  -- A BUILD step (build_atlas) packs all the icons, row after row,
+       into one big PNG image (the ATLAS), and writes where each icon
+       is (the LAYOUT) into a small JSON file next to it.
+  -- At run time, a SpriteAtlas reads and decodes just that ONE image.
+       Its   icon(name)   method makes a PhotoImage of the icon by
+       COPYING the icon's rectangle out of the atlas (with the Tk
+       photo image   copy ... -from   command), which is very quick.
+       Each icon is copied the first time it is asked for, and the
+       atlas keeps it (so there is no need for   button.image = photo).
+
+load_atlas   builds the atlas only if it is missing, or if any icon
+file has changed since it was built; otherwise it just uses the layout
+that is on disk.
+
+The icons are GIF files (read with   read_gif   and   to_rgba   from
+the   image_pipeline   module).  Each icon is named by its file's name,
+without its folder or extension, so no two of the files can have the
+same name (even in different folders).
+
+Run this module directly to compare the time to load 1,000 icons, one
+file each and from an atlas.
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import tkinter
+from tkinter import ttk
+import json
+import os
+import shutil
+import struct
+import tempfile
+import time
+import zlib
+from image_pipeline import read_gif, to_rgba
+
+
+class SpriteAtlas(object):
+    """
+    Icons, each cut out of one atlas image when it is first asked for.
+
+    Type hints:
+      :type master: tkinter.Tk
+    """
+
+    def __init__(self, image_filename, layout, master=None):
+        self.master = master
+        self.photo = tkinter.PhotoImage(file=image_filename, master=master)
+        self.layout = layout['icons']  # name -> [x, y, width, height]
+        self.icons = {}  # name -> PhotoImage
+
+    def icon(self, name):
+        """ Returns a PhotoImage of the icon with the given name. """
+        if name not in self.icons:
+            x, y, width, height = self.layout[name]
+            icon = tkinter.PhotoImage(master=self.master, width=width,
+                                      height=height)
+            icon.tk.call(icon.name, 'copy', self.photo.name,
+                         '-from', x, y, x + width, y + height)
+            self.icons[name] = icon
+        return self.icons[name]
+
+    def names(self):
+        return sorted(self.layout)
+
+
+def load_atlas(icon_filenames, atlas_filename, master=None):
+    """
+    Returns a SpriteAtlas of the given icon files, building the atlas
+    (in the given PNG file) first if it is missing or out of date.
+    """
+    layout = read_layout(atlas_filename)
+    if (layout is None or not os.path.exists(atlas_filename)
+            or layout['sources'] != sources(icon_filenames)):
+        layout = build_atlas(icon_filenames, atlas_filename)
+    return SpriteAtlas(atlas_filename, layout, master)
+
+
+def build_atlas(icon_filenames, atlas_filename, largest_width=1024):
+    """
+    Packs the icons in the given GIF files into one PNG file, and writes
+    its layout next to it.  Returns the layout.  Raises ValueError if two
+    of the files give their icons the same name.
+    """
+    icons = {}
+    for filename in icon_filenames:
+        name = icon_name(filename)
+        if name in icons:
+            raise ValueError('more than one icon is named ' + repr(name))
+        width, height, pixels, palette, transparent = read_gif(filename)
+        icons[name] = (width, height, to_rgba(pixels, palette, transparent))
+
+    sizes = {name: icon[:2] for name, icon in icons.items()}
+    positions, width, height = pack(sizes, largest_width)
+    rgba = bytearray(width * height * 4)
+    for name, (x, y) in positions.items():
+        icon_width, icon_height, icon_rgba = icons[name]
+        row_bytes = icon_width * 4
+        for row in range(icon_height):
+            start = ((y + row) * width + x) * 4
+            rgba[start:start + row_bytes] = icon_rgba[row * row_bytes:
+                                                      (row + 1) * row_bytes]
+    write_png(atlas_filename, width, height, rgba)
+
+    layout = {'width': width, 'height': height,
+              'sources': sources(icon_filenames),
+              'icons': {name: [x, y, sizes[name][0], sizes[name][1]]
+                        for name, (x, y) in positions.items()}}
+    with open(layout_filename(atlas_filename), 'w') as file:
+        json.dump(layout, file)
+    return layout
+
+
+def pack(sizes, largest_width):
+    """
+    Places rectangles (name -> (width, height)) in rows ("shelves"),
+    tallest first, each row at most   largest_width   wide.
+    Returns where each goes (name -> (x, y)), and the total width and
+    height.
+    """
+    names = sorted(sizes, key=lambda name: (-sizes[name][1],
+                                            -sizes[name][0], name))
+    positions = {}
+    x = 0
+    y = 0
+    row_height = 0
+    total_width = 0
+    for name in names:
+        width, height = sizes[name]
+        if x > 0 and x + width > largest_width:
+            y = y + row_height
+            x = 0
+            row_height = 0
+        positions[name] = (x, y)
+        x = x + width
+        row_height = max(row_height, height)
+        total_width = max(total_width, x)
+    return positions, total_width, y + row_height
+
+
+def read_layout(atlas_filename):
+    try:
+        with open(layout_filename(atlas_filename)) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def layout_filename(atlas_filename):
+    return os.path.splitext(atlas_filename)[0] + '.json'
+
+
+def sources(icon_filenames):
+    """ Returns what shows whether any icon file has changed. """
+    result = {}
+    for filename in icon_filenames:
+        status = os.stat(filename)
+        result[os.path.abspath(filename)] = [status.st_mtime_ns,
+                                             status.st_size]
+    return result
+
+
+def icon_name(filename):
+    """ Returns, for example, 'stop' for 'icons/stop.gif'. """
+    return os.path.splitext(os.path.basename(filename))[0]
+
+
+def write_png(filename, width, height, rgba):
+    """ Writes the red, green, blue and alpha of each pixel as a PNG. """
+    row_bytes = width * 4
+    rows = b''.join(b'\0' + rgba[y * row_bytes:(y + 1) * row_bytes]
+                    for y in range(height))
+
+    def chunk(kind, data):
+        return (struct.pack('>I', len(data)) + kind + data
+                + struct.pack('>I', zlib.crc32(kind + data)))
+
+    with open(filename, 'wb') as file:
+        file.write(b'\x89PNG\r\n\x1a\n')
+        file.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height,
+                                              8, 6, 0, 0, 0)))
+        file.write(chunk(b'IDAT', zlib.compress(rows)))
+        file.write(chunk(b'IEND', b''))
+
+
+# ----------------------------------------------------------------------
+# Benchmark: 1,000 small icons (cut from the picture in
+# tkinter_mqtt_ev3.gif and saved as GIF files), loaded one file each,
+# and from an atlas (the first time, when it must be built, and after).
+# ----------------------------------------------------------------------
+def write_gif(filename, width, height, pixels, palette, transparent):
+    """
+    Writes the pixels (an index into the palette, for each) as a GIF,
+    without compressing them: it starts the LZW code table again
+    (with a "clear" code) before it would need 10-bit codes.
+    """
+    codes = []
+    for start in range(0, len(pixels), 254):
+        codes.append(256)
+        codes.extend(pixels[start:start + 254])
+    codes.append(257)
+    data = bytearray()
+    bits = 0
+    number_of_bits = 0
+    for code in codes:
+        bits = bits | (code << number_of_bits)
+        number_of_bits = number_of_bits + 9
+        while number_of_bits >= 8:
+            data.append(bits & 255)
+            bits = bits >> 8
+            number_of_bits = number_of_bits - 8
+    if number_of_bits > 0:
+        data.append(bits)
+
+    with open(filename, 'wb') as file:
+        file.write(b'GIF89a' + struct.pack('<HHBBB', width, height,
+                                           0xF7, 0, 0))
+        file.write(palette.ljust(768, b'\0')[:768])
+        if transparent is not None:
+            file.write(b'\x21\xf9\x04\x01\x00\x00'
+                       + bytes([transparent, 0]))
+        file.write(b',' + struct.pack('<HHHHB', 0, 0, width, height, 0))
+        file.write(b'\x08')
+        for start in range(0, len(data), 255):
+            block = data[start:start + 255]
+            file.write(bytes([len(block)]) + block)
+        file.write(b'\x00;')
+
+
+def make_icons(folder, number_of_icons, size=32):
+    """ Saves icons cut from the picture in tkinter_mqtt_ev3.gif. """
+    picture = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           'tkinter_mqtt_ev3.gif')
+    width, height, pixels, palette, transparent = read_gif(picture)
+    filenames = []
+    for k in range(number_of_icons):
+        left = (k * 37) % (width - size)
+        top = (k * 11) % (height - size)
+        icon = b''.join(pixels[(top + y) * width + left:
+                               (top + y) * width + left + size]
+                        for y in range(size))
+        filenames.append(os.path.join(folder, 'icon{:04}.gif'.format(k)))
+        write_gif(filenames[-1], size, size, icon, palette, transparent)
+    return filenames
+
+
+def benchmark(number_of_icons=1000):
+    folder = tempfile.mkdtemp()
+    filenames = make_icons(folder, number_of_icons)
+    atlas_filename = os.path.join(folder, 'atlas.png')
+    root = tkinter.Tk()
+
+    start = time.perf_counter()
+    photos = [tkinter.PhotoImage(file=filename) for filename in filenames]
+    seconds_one_file_each = time.perf_counter() - start
+    del photos
+
+    times = []
+    for _ in range(2):  # Builds the atlas the first time only
+        start = time.perf_counter()
+        atlas = load_atlas(filenames, atlas_filename, root)
+        icons = [atlas.icon(name) for name in atlas.names()]
+        times.append(time.perf_counter() - start)
+        del icons
+
+    frame = ttk.Frame(root)
+    frame.grid()
+    for k, name in enumerate(atlas.names()[:100]):
+        ttk.Label(frame, image=atlas.icon(name)).grid(row=k // 20,
+                                                      column=k % 20)
+    root.update()
+
+    _, _, width, height = atlas.layout[atlas.names()[0]]
+    print('{} icons, {} by {} pixels each:'.format(number_of_icons, width,
+                                                   height))
+    print('  one GIF file each:            {:8.1f} ms'.format(
+        seconds_one_file_each * 1000))
+    print('  atlas, building it first:     {:8.1f} ms'.format(
+        times[0] * 1000))
+    print('  atlas, already built:         {:8.1f} ms'.format(
+        times[1] * 1000))
+    root.destroy()
+    shutil.rmtree(folder)
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,203 @@
+"""
+Keeping the DATA of a GUI in one place, and letting the widgets that
+show it SUBSCRIBE to the parts they show.
+
+In the other examples, a small class (like Data) holds the data that
+the callbacks need, and each callback that changes the data must also
+remember to change every widget that shows it.  A Store does that part:
+  -- A class made from Store lists its FIELDS in   __slots__, which
+       also makes its objects small and their fields quick to get.
+  -- subscribe(['number'], show_number)   asks the Store to call
+       show_number(store)   each time the   number   field changes
+       (and only then: setting a field to the value it already has is
+       not a change).
+  -- Inside   with store.batch():   changes are collected, and at the
+       end each subscriber is called ONCE, however many of its fields
+       changed, and however many times.
+
+For example:
+    class Data(Store):
+        __slots__ = ('number', 'label')
+
+    data = Data(number=0, label=label)
+    data.subscribe(['number'], lambda data: show(data.label, data.number))
+    data.number = data.number + 1  # Calls the lambda
+
+Run this module directly for a benchmark of memory and of the time it
+takes to notify subscribers, with thousands of fields and subscribers.
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import contextlib
+import random
+import time
+import tracemalloc
+
+_MISSING = object()
+
+
+class Store(object):
+    """ Fields (listed in   __slots__   by a subclass) with subscribers. """
+
+    __slots__ = ('_subscribers', '_fields_of_subscription', '_changed',
+                 '_batch_depth', '_next_subscription',
+                 'number_of_notifications')
+
+    def __init__(self, **values):
+        set_field = object.__setattr__
+        set_field(self, '_subscribers', {})  # field -> {id: function}
+        set_field(self, '_fields_of_subscription', {})  # id -> fields
+        set_field(self, '_changed', set())  # fields changed in a batch
+        set_field(self, '_batch_depth', 0)
+        set_field(self, '_next_subscription', 0)
+        set_field(self, 'number_of_notifications', 0)
+        for name, value in values.items():
+            set_field(self, name, value)
+
+    def __setattr__(self, name, value):
+        subscribers = self._subscribers.get(name)
+        if subscribers:
+            old_value = getattr(self, name, _MISSING)
+            object.__setattr__(self, name, value)
+            if old_value is value or old_value == value:
+                return
+            if self._batch_depth > 0:
+                self._changed.add(name)
+            else:
+                self._notify(subscribers.items())
+        else:
+            object.__setattr__(self, name, value)
+
+    def subscribe(self, fields, function, call_now=True):
+        """
+        Calls   function(store)   each time any of the given fields
+        changes, and also right now (unless call_now is False).
+        Returns a number to give to   unsubscribe.
+        """
+        subscription = self._next_subscription
+        object.__setattr__(self, '_next_subscription', subscription + 1)
+        self._fields_of_subscription[subscription] = tuple(fields)
+        for field in fields:
+            self._subscribers.setdefault(field, {})[subscription] = function
+        if call_now:
+            function(self)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        for field in self._fields_of_subscription.pop(subscription, ()):
+            del self._subscribers[field][subscription]
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Use as   with store.batch():   to call each subscriber just
+        once, at the end, for all the changes made inside it.
+        """
+        object.__setattr__(self, '_batch_depth', self._batch_depth + 1)
+        try:
+            yield self
+        finally:
+            object.__setattr__(self, '_batch_depth', self._batch_depth - 1)
+            if self._batch_depth == 0 and self._changed:
+                # Each subscriber once, in the order they subscribed.
+                to_notify = {}
+                for field in self._changed:
+                    to_notify.update(self._subscribers.get(field, {}))
+                self._changed.clear()
+                self._notify(sorted(to_notify.items()))
+
+    def _notify(self, subscribers):
+        for _, function in list(subscribers):
+            object.__setattr__(self, 'number_of_notifications',
+                               self.number_of_notifications + 1)
+            function(self)
+
+
+# ----------------------------------------------------------------------
+# Benchmark: memory for a store with thousands of fields (compared with
+# an ordinary object), and the time to notify thousands of subscribers,
+# each of which depends on a few fields.
+# ----------------------------------------------------------------------
+class PlainObject(object):
+    pass
+
+
+def bytes_to_make(make):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    things = make()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del things
+    return after - before
+
+
+def benchmark(number_of_fields=5000, number_of_objects=200):
+    names = ['field{}'.format(k) for k in range(number_of_fields)]
+    BigStore = type('BigStore', (Store,), {'__slots__': tuple(names)})
+
+    def make_stores():
+        return [BigStore(**{name: 0 for name in names})
+                for _ in range(number_of_objects)]
+
+    def make_plain_objects():
+        objects = []
+        for _ in range(number_of_objects):
+            thing = PlainObject()
+            for name in names:
+                setattr(thing, name, 0)
+            objects.append(thing)
+        return objects
+
+    print('{} objects with {} fields each:'.format(number_of_objects,
+                                                   number_of_fields))
+    print('  ordinary objects:  {:8.1f} MB'.format(
+        bytes_to_make(make_plain_objects) / 1000000))
+    print('  Store objects:     {:8.1f} MB'.format(
+        bytes_to_make(make_stores) / 1000000))
+
+    random.seed(120)
+    store = BigStore(**{name: 0 for name in names})
+    number_of_subscribers = number_of_fields
+    renders = [0]
+
+    def render(store):
+        renders[0] = renders[0] + 1
+
+    for _ in range(number_of_subscribers):
+        store.subscribe(random.sample(names, 3), render, call_now=False)
+
+    changed = random.sample(names, 1000)
+    start = time.perf_counter()
+    for name in changed:
+        setattr(store, name, getattr(store, name) + 1)
+    seconds_one_at_a_time = time.perf_counter() - start
+    renders_one_at_a_time = renders[0]
+
+    renders[0] = 0
+    start = time.perf_counter()
+    with store.batch():
+        for name in changed:
+            setattr(store, name, getattr(store, name) + 1)
+    seconds_in_batch = time.perf_counter() - start
+
+    print('{} subscribers, each on 3 of the fields; change {} fields:'
+          .format(number_of_subscribers, len(changed)))
+    print('  one at a time:  {:7.2f} ms, {} renders'.format(
+        seconds_one_at_a_time * 1000, renders_one_at_a_time))
+    print('  in one batch:   {:7.2f} ms, {} renders'.format(
+        seconds_in_batch * 1000, renders[0]))
+
+    name = changed[0]
+    renders[0] = 0
+    start = time.perf_counter()
+    for k in range(100000):
+        setattr(store, name, k)
+    print('  set one field 100,000 times:  {:.1f} ms, {} renders'.format(
+        (time.perf_counter() - start) * 1000, renders[0]))
+
+
+if __name__ == '__main__':
+    benchmark()
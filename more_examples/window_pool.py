@@ -0,0 +1,182 @@
+"""
+REUSING pop-up windows instead of making a new one each time.
+
+Making a tkinter.Toplevel (and the widgets on it) takes a while, and
+destroying it takes a while too.  A WindowPool instead HIDES a window
+that is closed (with its   withdraw   method) and keeps it.  The next
+time a window is wanted, a hidden one is shown again (with its
+deiconify   method), after its widgets are changed to show the new
+information.  So each window's widgets are made just once.
+
+The pool never has more than   max_windows   windows.  If all of them
+are open and another is wanted, the one that was opened longest ago is
+reused.  At most   max_hidden   closed windows are kept for reuse; any
+more are destroyed.
+
+Closing a window from its title bar hides it too, so it can be reused.
+
+Run this module directly to compare the time to pop up a window, and
+the memory used, for 10,000 pop-ups with and without a WindowPool.
+
+Authors: David Mutchler and his colleagues
+         at Rose-Hulman Institute of Technology.
+"""
+
+import tkinter
+from tkinter import ttk
+import os
+import time
+
+
+class WindowPool(object):
+    """
+    Keeps Toplevel windows to reuse.  For each window that it makes,
+    it calls   make_contents(window), which puts widgets on the window
+    and returns whatever   show   (see   open ) needs to change them.
+
+    Type hints:
+      :type root: tkinter.Tk
+    """
+
+    def __init__(self, root, make_contents, max_windows=20, max_hidden=5):
+        self.root = root
+        self.make_contents = make_contents
+        self.max_windows = max_windows
+        self.max_hidden = max_hidden
+
+        self.open_windows = []  # Oldest first
+        self.hidden_windows = []
+        self.contents = {}  # window -> what make_contents returned
+        self.number_made = 0
+        self.number_reused = 0
+
+    def open(self, show=None):
+        """
+        Opens a window (a hidden one, if there is one) after calling
+        show(contents)   to make its widgets show what they should
+        (if their contents are not already kept up to date).
+        Returns the window.
+        """
+        if self.hidden_windows:
+            window = self.hidden_windows.pop()
+            self.number_reused = self.number_reused + 1
+        elif len(self.open_windows) >= self.max_windows:
+            window = self.open_windows.pop(0)  # Reuse the oldest
+            self.number_reused = self.number_reused + 1
+        else:
+            window = tkinter.Toplevel(self.root)
+            window.protocol('WM_DELETE_WINDOW',
+                            lambda: self.close(window))
+            self.contents[window] = self.make_contents(window)
+            self.number_made = self.number_made + 1
+
+        if show:
+            show(self.contents[window])
+        window.deiconify()
+        self.open_windows.append(window)
+        return window
+
+    def close(self, window):
+        """ Hides the window, to reuse it (or destroys it, if enough are). """
+        if window not in self.open_windows:
+            return
+        self.open_windows.remove(window)
+        if len(self.hidden_windows) < self.max_hidden:
+            window.withdraw()
+            self.hidden_windows.append(window)
+        else:
+            del self.contents[window]
+            window.destroy()
+
+    def close_all(self):
+        for window in list(self.open_windows):
+            self.close(window)
+
+    def destroy_all(self):
+        """ Destroys every window in the pool, open or hidden. """
+        for window in self.open_windows + self.hidden_windows:
+            window.destroy()
+        self.open_windows = []
+        self.hidden_windows = []
+        self.contents = {}
+
+
+# ----------------------------------------------------------------------
+# Benchmark: pops up a window (with a Label showing a number) and closes
+# it, 10,000 times, making and destroying a Toplevel each time, and
+# with a WindowPool.
+# ----------------------------------------------------------------------
+def resident_megabytes():
+    """ Returns the memory that this program is using now, if it can. """
+    try:
+        with open('/proc/self/statm') as file:
+            pages = int(file.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 1000000
+    except (OSError, ValueError, AttributeError):
+        return float('nan')
+
+
+def make_label(window):
+    label = ttk.Label(window)
+    label.grid()
+    return label
+
+
+def pop_up_with_new_window(root, number):
+    window = tkinter.Toplevel(root)
+    label = make_label(window)
+    label['text'] = 'The number is: \n {}'.format(number)
+    return window
+
+
+def cycle(root, open_window, close_window, number_of_cycles):
+    times = []
+    for k in range(number_of_cycles):
+        start = time.perf_counter()
+        window = open_window(k)
+        root.update_idletasks()
+        times.append(time.perf_counter() - start)
+        close_window(window)
+        if k % 100 == 0:
+            root.update()
+    root.update()
+    return sorted(times)
+
+
+def benchmark(number_of_cycles=10000):
+    root = tkinter.Tk()
+    root.update()
+
+    results = []
+    start_megabytes = resident_megabytes()
+    times = cycle(root, lambda k: pop_up_with_new_window(root, k),
+                  lambda window: window.destroy(), number_of_cycles)
+    results.append(('new Toplevel each time', times,
+                    resident_megabytes() - start_megabytes))
+
+    pool = WindowPool(root, make_label)
+
+    def show_number(label, number):
+        label['text'] = 'The number is: \n {}'.format(number)
+
+    start_megabytes = resident_megabytes()
+    times = cycle(root,
+                  lambda k: pool.open(lambda label: show_number(label, k)),
+                  pool.close, number_of_cycles)
+    results.append(('WindowPool', times,
+                    resident_megabytes() - start_megabytes))
+
+    print('{} pop-ups, each opened and then closed:'.format(
+        number_of_cycles))
+    for name, times, megabytes in results:
+        print('  {:24}  median {:6.3f} ms,  p99 {:6.3f} ms,'
+              '  memory grew {:6.1f} MB'.format(
+                  name, times[len(times) // 2] * 1000,
+                  times[int(len(times) * 0.99)] * 1000, megabytes))
+    print('  The pool made {} windows and reused them {} times'.format(
+        pool.number_made, pool.number_reused))
+    root.destroy()
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,10 @@
+"""
+Lets the tests import the modules in   more_examples   (which import
+each other as modules in the same folder).
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'more_examples'))
@@ -0,0 +1,103 @@
+"""
+Tests of the   async_tk   module, with a stand-in for the root window
+that runs its   after   callbacks when the test says so (so no display
+is needed).
+"""
+
+import asyncio
+import socket
+import time
+from async_tk import AsyncTk
+
+
+class FakeRoot(object):
+    """ Keeps   after   callbacks, and runs them in   run_pending . """
+
+    def __init__(self):
+        self.callbacks = {}  # id -> (milliseconds, function)
+        self.number_of_afters = 0
+
+    def after(self, milliseconds, function):
+        self.number_of_afters = self.number_of_afters + 1
+        after_id = 'after#{}'.format(self.number_of_afters)
+        self.callbacks[after_id] = (milliseconds, function)
+        return after_id
+
+    def after_idle(self, function):
+        return self.after(0, function)
+
+    def after_cancel(self, after_id):
+        self.callbacks.pop(after_id, None)
+
+    def run_pending(self):
+        """ Runs the callbacks that are waiting (as if their time came). """
+        callbacks = list(self.callbacks.values())
+        self.callbacks = {}
+        for _, function in callbacks:
+            function()
+
+
+def run_until_idle(root, seconds=2):
+    end = time.perf_counter() + seconds
+    while root.callbacks and time.perf_counter() < end:
+        root.run_pending()
+        time.sleep(0.001)
+
+
+def test_the_driver_does_not_set_the_current_event_loop(monkeypatch):
+    def fail(loop):
+        raise AssertionError('set_event_loop was called')
+
+    monkeypatch.setattr(asyncio, 'set_event_loop', fail)
+    driver = AsyncTk(FakeRoot())
+    driver.close()
+
+
+def test_a_callback_runs_its_coroutine_and_then_ticking_stops():
+    root = FakeRoot()
+    driver = AsyncTk(root, tick_milliseconds=1)
+    done = []
+
+    async def handler(event):
+        await asyncio.sleep(0.01)
+        done.append(event)
+
+    assert driver.callback(handler)('event') is None
+    assert driver.callback(lambda: 'plain')() == 'plain'
+    run_until_idle(root)
+    assert done == ['event']
+    assert root.callbacks == {}  # Nothing ticks while idle
+    driver.close()
+
+
+def test_io_wakes_a_waiting_coroutine_on_a_tick():
+    root = FakeRoot()
+    driver = AsyncTk(root, tick_milliseconds=1)
+    reader_socket, writer_socket = socket.socketpair()
+    lines = []
+
+    async def read():
+        reader, _ = await asyncio.open_connection(sock=reader_socket)
+        lines.append(await reader.readline())
+        lines.append(await reader.readline())
+
+    driver.create_task(read())
+    root.run_pending()
+    assert [milliseconds for milliseconds, _ in root.callbacks.values()
+            ] == [1]  # Waiting for I/O: it ticks
+    writer_socket.sendall(b'one\ntwo\n')
+    writer_socket.close()
+    run_until_idle(root)
+    assert lines == [b'one\n', b'two\n']
+    driver.close()
+
+
+def test_close_cancels_unfinished_tasks():
+    root = FakeRoot()
+    driver = AsyncTk(root)
+    task = driver.create_task(asyncio.sleep(60))
+    root.run_pending()
+    driver.close()
+    assert task.cancelled()
+    assert driver.loop.is_closed()
+    assert root.callbacks == {}
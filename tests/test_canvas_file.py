@@ -0,0 +1,127 @@
+"""
+Tests of the   canvas_file   module: drawings written with a DrawingLog
+read back the same with a DrawingFile, with and without their index.
+"""
+
+import os
+import random
+import pytest
+from canvas_file import DrawingLog, DrawingFile, index_filename
+
+
+def write_drawing(filename):
+    log = DrawingLog(filename)
+    log.add_line('a', [10, 20, 30, 40, 50, 20], 'blue', 5)
+    log.add_line('b', [0.5, 1.25, 300.75, 400.5], 'red', 2)
+    log.add_dot('c', 600, 700, 10, 'green', 'black', 2)
+    log.add_line('d', [-5, -5, 5, 5], 'blue', 1)
+    log.remove('b')
+    log.close()
+
+
+EXPECTED = [(0, ('line', [10, 20, 30, 40, 50, 20], 'blue', 5)),
+            (2, ('dot', 600, 700, 10, 'green', 'black', 2)),
+            (3, ('line', [-5, -5, 5, 5], 'blue', 1))]
+
+
+def read_all(filename):
+    drawing = DrawingFile(filename)
+    shapes = sorted(drawing.all_shapes())
+    has_index = drawing.has_index
+    drawing.close()
+    return shapes, has_index
+
+
+def test_a_drawing_round_trips_through_its_index(tmp_path):
+    filename = str(tmp_path / 'drawing.tkd')
+    write_drawing(filename)
+    assert os.path.exists(index_filename(filename))
+    assert read_all(filename) == (EXPECTED, True)
+
+
+def test_a_drawing_reads_the_same_without_its_index(tmp_path):
+    filename = str(tmp_path / 'drawing.tkd')
+    write_drawing(filename)
+    os.remove(index_filename(filename))
+    assert read_all(filename) == (EXPECTED, False)
+
+
+def test_records_written_after_the_index_are_read(tmp_path):
+    filename = str(tmp_path / 'drawing.tkd')
+    write_drawing(filename)
+    log = DrawingLog(filename)
+    log.remember('c', 2)
+    log.add_dot('e', 1, 2, 3, 'yellow')
+    log.remove('c')
+    log.file.close()  # As if the program stopped without closing the log
+
+    shapes, has_index = read_all(filename)
+    assert has_index
+    assert shapes == [EXPECTED[0], EXPECTED[2],
+                      (4, ('dot', 1, 2, 3, 'yellow', 'black', 1))]
+
+
+def test_a_partly_written_last_record_is_cut_off(tmp_path):
+    filename = str(tmp_path / 'drawing.tkd')
+    write_drawing(filename)
+    with open(filename, 'ab') as file:
+        file.write(b'\x02\xff\x00\x00\x00partial')
+    assert read_all(filename) == (EXPECTED, True)
+
+    log = DrawingLog(filename)
+    log.add_line('f', [1, 1, 2, 2], 'red', 3)
+    log.close()
+    shapes, _ = read_all(filename)
+    assert shapes == EXPECTED + [(4, ('line', [1, 1, 2, 2], 'red', 3))]
+
+
+def test_an_index_of_another_drawing_is_not_used(tmp_path):
+    filename = str(tmp_path / 'drawing.tkd')
+    write_drawing(filename)
+    index = open(index_filename(filename), 'rb').read()
+    os.remove(filename)
+    log = DrawingLog(filename)
+    log.add_dot('x', 1, 1, 1, 'red')
+    log.file.close()
+    with open(index_filename(filename), 'wb') as file:
+        file.write(index)
+    assert read_all(filename) == ([(0, ('dot', 1, 1, 1, 'red', 'black',
+                                        1))], False)
+
+
+def test_numbers_in_finds_the_shapes_whose_boxes_overlap(tmp_path):
+    filename = str(tmp_path / 'drawing.tkd')
+    random.seed(120)
+    boxes = {}
+    log = DrawingLog(filename)
+    for number in range(300):
+        x = random.randrange(-2000, 2000)
+        y = random.randrange(-2000, 2000)
+        radius = random.randrange(1, 300)
+        log.add_dot(number, x, y, radius, 'blue', 'blue', 0)
+        boxes[number] = (x - radius, y - radius, x + radius, y + radius)
+    log.close()
+
+    for use_index in [True, False]:
+        if not use_index:
+            os.remove(index_filename(filename))
+        drawing = DrawingFile(filename)
+        for _ in range(50):
+            left = random.randrange(-2500, 2500)
+            top = random.randrange(-2500, 2500)
+            right = left + random.randrange(0, 1000)
+            bottom = top + random.randrange(0, 1000)
+            expected = [number for number, (x1, y1, x2, y2) in boxes.items()
+                        if not (x2 < left or x1 > right
+                                or y2 < top or y1 > bottom)]
+            assert drawing.numbers_in(left, top, right, bottom) == expected
+        drawing.close()
+
+
+def test_too_many_colors_raise_value_error(tmp_path):
+    log = DrawingLog(str(tmp_path / 'drawing.tkd'))
+    for k in range(256):
+        log.add_dot(k, 0, 0, 1, '#{:06x}'.format(k), '#000000')
+    with pytest.raises(ValueError):
+        log.add_dot('one too many', 0, 0, 1, '#ffffff')
+    log.close()
@@ -0,0 +1,63 @@
+"""
+Tests of the   canvas_index   module: the SpatialIndex finds the same
+shapes as checking every shape one by one.
+"""
+
+import random
+from canvas_index import (SpatialIndex, add_random_shapes,
+                          find_by_checking_every_shape, distance_to_segment,
+                          segment_meets_rectangle)
+
+
+def test_queries_find_what_checking_every_shape_finds():
+    random.seed(120)
+    for cell_size in [8, 32, 256]:
+        index = SpatialIndex(cell_size)
+        add_random_shapes(index, 1000, 800, 600)
+        for _ in range(100):
+            x = random.uniform(-20, 820)
+            y = random.uniform(-20, 620)
+            radius = random.choice([0, 3, 8, 40])
+            assert (sorted(index.find_at_point(x, y, radius))
+                    == find_by_checking_every_shape(index, x, y, radius))
+
+            x2 = x + random.uniform(-100, 100)
+            y2 = y + random.uniform(-100, 100)
+            expected = [key for key in index.shapes
+                        if index.overlaps(key, x, y, x2, y2)]
+            assert sorted(index.find_in_rectangle(x, y, x2, y2)) == expected
+
+
+def test_removed_and_replaced_shapes_are_not_found():
+    index = SpatialIndex(32)
+    index.add_oval('a', 0, 0, 20, 20)
+    index.add_line('b', [100, 100, 200, 100], 4)
+    index.add_line('c', [50, 50], 10)  # A single point: a dot
+    assert len(index) == 3
+    assert index.find_at_point(10, 10) == ['a']
+    assert index.find_at_point(150, 101) == ['b']
+    assert index.find_at_point(54, 50) == ['c']
+
+    index.remove('a')
+    index.add_line('b', [500, 500, 600, 600])  # Moves it
+    assert index.find_at_point(10, 10) == []
+    assert index.find_at_point(150, 101) == []
+    assert index.find_at_point(550, 550) == ['b']
+    assert 'a' not in index and 'b' in index
+    assert all(index.cells.values())  # No empty cells are kept
+
+    index.clear()
+    assert len(index) == 0 and index.find_at_point(550, 550) == []
+
+
+def test_distance_to_segment():
+    assert distance_to_segment(5, 3, 0, 0, 10, 0) == 3
+    assert distance_to_segment(13, 4, 0, 0, 10, 0) == 5
+    assert distance_to_segment(3, 4, 0, 0, 0, 0) == 5
+
+
+def test_segment_meets_rectangle():
+    assert segment_meets_rectangle(-10, 5, 20, 5, 0, 0, 10, 10)
+    assert segment_meets_rectangle(2, 2, 3, 3, 0, 0, 10, 10)
+    assert not segment_meets_rectangle(-10, 20, 20, 20, 0, 0, 10, 10)
+    assert not segment_meets_rectangle(11, 0, 30, 20, 0, 0, 10, 10)
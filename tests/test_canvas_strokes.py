@@ -0,0 +1,191 @@
+"""
+Tests of the   canvas_strokes   module, with stand-ins for the Canvas
+and its timers (so no display is needed).
+"""
+
+import math
+import random
+from canvas_strokes import (Stroke, StrokeEngine, MotionCoalescer,
+                            simplify_points)
+
+
+class FakeCanvas(object):
+    """ Keeps the points of each line item, as a Canvas would. """
+
+    def __init__(self):
+        self.lines = {}  # item id -> flat list of points
+        self.number_of_items = 0
+
+    def create_line(self, *points, **options):
+        self.number_of_items = self.number_of_items + 1
+        self.lines[self.number_of_items] = list(points)
+        return self.number_of_items
+
+    def insert(self, item, index, points):
+        assert index == 'end'
+        self.lines[item].extend(points)
+
+    def delete(self, *items):
+        for item in items:
+            del self.lines[item]
+
+
+class FakeWidget(object):
+    """ Keeps   after   callbacks, to run when the test says so. """
+
+    def __init__(self):
+        self.callbacks = {}  # id -> (milliseconds, function)
+        self.number_of_afters = 0
+
+    def after(self, milliseconds, function):
+        self.number_of_afters = self.number_of_afters + 1
+        self.callbacks[self.number_of_afters] = (milliseconds, function)
+        return self.number_of_afters
+
+    def after_cancel(self, after_id):
+        del self.callbacks[after_id]
+
+    def run_pending(self):
+        callbacks = list(self.callbacks.values())
+        self.callbacks = {}
+        for _, function in callbacks:
+            function()
+
+
+def distance_to_line(x, y, x1, y1, x2, y2):
+    """ The distance from (x, y) to the line through the two points. """
+    dx = x2 - x1
+    dy = y2 - y1
+    if dx == 0 and dy == 0:
+        return math.hypot(x - x1, y - y1)
+    return abs((x - x1) * dy - (y - y1) * dx) / math.hypot(dx, dy)
+
+
+def test_points_on_a_straight_line_simplify_to_its_ends():
+    points = []
+    for k in range(50):
+        points.extend([k * 2, k * 3 + 1])
+    assert simplify_points(points, 0.5) == [0, 1, 98, 148]
+
+
+def test_a_corner_is_kept():
+    points = [0, 0, 5, 0.1, 10, 0, 10, 5, 10.1, 10, 10, 20]
+    assert simplify_points(points, 1) == [0, 0, 10, 0, 10, 20]
+
+
+def test_zero_tolerance_keeps_every_point_off_the_line():
+    points = [0, 0, 1, 1, 2, 0, 3, 1, 4, 0]
+    assert simplify_points(points, 0) == points
+
+
+def test_one_or_two_points_are_kept_as_they_are():
+    assert simplify_points([3, 4], 10) == [3, 4]
+    assert simplify_points([3, 4, 3, 4], 10) == [3, 4, 3, 4]
+
+
+def test_every_dropped_point_is_within_tolerance_of_the_result():
+    random.seed(120)
+    x, y = 0, 0
+    points = [x, y]
+    for _ in range(3000):  # Long enough to go deeper than recursion could
+        x = x + random.uniform(-3, 3)
+        y = y + random.uniform(-3, 3)
+        points.extend([x, y])
+    tolerance = 2
+    simpler = simplify_points(points, tolerance)
+    assert simpler[:2] == points[:2] and simpler[-2:] == points[-2:]
+    assert len(simpler) < len(points)
+
+    kept = list(zip(simpler[0::2], simpler[1::2]))
+    segment = 0
+    for x, y in zip(points[0::2], points[1::2]):
+        if (x, y) == kept[segment + 1] and segment + 2 < len(kept):
+            segment = segment + 1
+        (x1, y1), (x2, y2) = kept[segment], kept[segment + 1]
+        assert distance_to_line(x, y, x1, y1, x2, y2) <= tolerance + 1e-9
+
+
+def test_a_stroke_is_split_into_items_that_join_up():
+    canvas = FakeCanvas()
+    stroke = Stroke(canvas, 0, 0, 'blue', 3, max_points_per_item=4)
+    for k in range(1, 10):
+        stroke.add_point(k, k % 2)
+    stroke.finish()
+    assert stroke.number_of_points() == 10
+    assert stroke.points_in == 10
+    drawn = []
+    for item in stroke.items:
+        line = canvas.lines[item]
+        assert len(line) <= 2 * 4
+        if drawn:
+            assert line[:2] == drawn[-2:]  # Each piece starts where the
+            line = line[2:]                # last one ended
+        drawn.extend(line)
+    assert drawn == stroke.points
+
+
+def test_a_stroke_with_a_tolerance_is_simplified_when_finished():
+    canvas = FakeCanvas()
+    stroke = Stroke(canvas, 0, 0, 'blue', 3, tolerance=1)
+    for k in range(1, 100):
+        stroke.add_point(k * 0.5, 0)  # Close together: most are skipped
+    stroke.add_point(50, 0.2)
+    stroke.finish()
+    assert stroke.points_in == 101
+    assert stroke.points == [0, 0, 50, 0.2]
+    assert [canvas.lines[item] for item in stroke.items] == [[0, 0, 50, 0.2]]
+    assert len(canvas.lines) == 1
+
+
+def test_each_drag_is_one_growing_line_item():
+    canvas = FakeCanvas()
+    engine = StrokeEngine(canvas)
+    assert not engine.is_drawing()
+    engine.continue_stroke(5, 5)  # Motion without a press: ignored
+    engine.begin_stroke(0, 0, 'red', 2)
+    for k in range(1, 500):
+        engine.continue_stroke(k, k)
+    engine.extend_stroke([500, 500, 501, 501])
+    assert engine.is_drawing()
+    stroke = engine.end_stroke()
+    assert not engine.is_drawing()
+    assert engine.end_stroke() is None
+    assert list(canvas.lines.values()) == [stroke.points]
+    assert stroke.number_of_points() == 502
+
+    engine.begin_stroke(9, 9, 'blue', 2)
+    engine.begin_stroke(1, 1, 'blue', 2)  # Ends the stroke before it
+    engine.end_stroke()
+    assert engine.number_of_strokes == 3
+
+
+def test_motion_events_are_flushed_together_once_per_frame():
+    widget = FakeWidget()
+    flushed = []
+    coalescer = MotionCoalescer(widget, flushed.append,
+                                milliseconds_per_frame=16)
+    for k in range(5):
+        coalescer.add(k, 10 * k)
+    assert list(widget.callbacks.values())[0][0] == 16
+    assert len(widget.callbacks) == 1  # One timer, however many events
+    assert flushed == []
+
+    widget.run_pending()
+    assert flushed == [[0, 0, 1, 10, 2, 20, 3, 30, 4, 40]]
+    coalescer.add(5, 50)
+    widget.run_pending()
+    widget.run_pending()  # Nothing more to flush
+    assert flushed[1:] == [[5, 50]]
+    assert (coalescer.events_received, coalescer.flushes_performed) == (6, 2)
+
+
+def test_flush_hands_over_the_points_at_once_and_cancels_the_timer():
+    widget = FakeWidget()
+    flushed = []
+    coalescer = MotionCoalescer(widget, flushed.append)
+    coalescer.add(1, 2)
+    coalescer.flush()  # For example, when the mouse is released
+    assert flushed == [[1, 2]]
+    assert widget.callbacks == {}
+    coalescer.flush()
+    assert flushed == [[1, 2]]
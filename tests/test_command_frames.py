@@ -0,0 +1,53 @@
+"""
+Tests of the   command_frames   module, and of sending framed commands
+from the   m10e_mqtt_remote   example.
+"""
+
+import pytest
+from command_frames import (encode_command, decode_command,
+                            encode_commands, decode_commands, FRAME)
+import m10e_mqtt_remote
+
+
+class RecordingTransport(object):
+    """ Keeps what is published, instead of sending it. """
+
+    def __init__(self):
+        self.messages = []
+
+    def publish(self, topic, payload):
+        self.messages.append((topic, payload))
+
+
+def test_a_command_round_trips_through_one_frame():
+    frame = encode_command('forward', 600, -32768)
+    assert len(frame) == FRAME.size
+    assert decode_command(frame) == ('forward', 600, -32768)
+
+
+def test_a_batch_round_trips():
+    commands = [('stop', 0, 0), ('left', -900, 900), ('quit', 32767, 1)]
+    batch = encode_commands(commands)
+    assert len(batch) == len(commands) * FRAME.size
+    assert decode_commands(batch) == commands
+
+
+def test_bad_commands_and_speeds_raise_value_error():
+    with pytest.raises(ValueError):
+        encode_command('jump', 0, 0)
+    with pytest.raises(ValueError):
+        encode_command('forward', 40000, 0)
+    with pytest.raises(ValueError):
+        encode_commands([('forward', 1, 1), ('back', 1.5, 0)])
+    with pytest.raises(ValueError):
+        decode_commands(b'\x01\x00')
+
+
+def test_the_remote_sends_the_speeds_with_the_command():
+    transport = RecordingTransport()
+    m10e_mqtt_remote.send(transport, 'forward', 600, 450)
+    m10e_mqtt_remote.send(transport, 'quit')
+    topics = [topic for topic, _ in transport.messages]
+    assert topics == ['robot/command', 'robot/command']
+    assert decode_command(transport.messages[0][1]) == ('forward', 600, 450)
+    assert decode_command(transport.messages[1][1]) == ('quit', 0, 0)
@@ -0,0 +1,125 @@
+"""
+Tests of the   command_publisher   module: repeated commands are not
+sent again, and changes are sent at most once per
+milliseconds_between_sends   (except stops), with a stand-in for the
+widget's timers and for the clock.
+"""
+
+import pytest
+import command_publisher
+from command_publisher import CommandPublisher, command_name
+
+
+class FakeClock(object):
+    """ Stands in for the   time   module: the time moves when told. """
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def perf_counter(self):
+        return self.now
+
+
+class FakeWidget(object):
+    """ Keeps   after   callbacks, and runs them when their time comes. """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.callbacks = {}  # id -> (when, function)
+        self.number_of_afters = 0
+
+    def after(self, milliseconds, function):
+        self.number_of_afters = self.number_of_afters + 1
+        self.callbacks[self.number_of_afters] = (
+            self.clock.now + milliseconds / 1000, function)
+        return self.number_of_afters
+
+    def after_cancel(self, after_id):
+        self.callbacks.pop(after_id, None)  # As Tk, even if it ran already
+
+    def wait(self, milliseconds):
+        """ Moves the clock on, running the callbacks that come due. """
+        self.clock.now = self.clock.now + milliseconds / 1000
+        for after_id, (when, function) in sorted(self.callbacks.items()):
+            if when <= self.clock.now and after_id in self.callbacks:
+                function()
+                self.callbacks.pop(after_id, None)
+
+
+@pytest.fixture
+def publisher(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(command_publisher, 'time', clock)
+    sent = []
+    publisher = CommandPublisher(FakeWidget(clock), sent.append,
+                                 milliseconds_between_sends=100)
+    publisher.sent = sent
+    return publisher
+
+
+def test_a_held_down_key_sends_its_command_once(publisher):
+    for _ in range(30):
+        publisher.publish('drive', 'forward')
+        publisher.widget.wait(33)
+    assert publisher.sent == ['forward']
+    assert (publisher.number_sent, publisher.number_suppressed) == (1, 29)
+    assert publisher.report() == (
+        '30 commands asked for: 1 sent, 29 suppressed')
+
+
+def test_changes_wait_for_their_turn_and_only_the_latest_is_sent(publisher):
+    widget = publisher.widget
+    publisher.publish('drive', 'forward')
+    widget.wait(10)
+    publisher.publish('drive', 'left')
+    publisher.publish('drive', 'right')  # Replaces 'left', never sent
+    assert publisher.sent == ['forward']
+    widget.wait(80)
+    assert publisher.sent == ['forward']  # 90 ms: not its turn yet
+    widget.wait(10)
+    assert publisher.sent == ['forward', 'right']
+    assert publisher.number_suppressed == 1
+
+
+def test_going_back_to_the_last_command_sends_nothing(publisher):
+    widget = publisher.widget
+    publisher.publish('drive', 'forward')
+    publisher.publish('drive', 'left')
+    publisher.publish('drive', 'forward')
+    widget.wait(200)
+    assert publisher.sent == ['forward']
+    assert widget.callbacks == {}
+
+
+def test_a_stop_is_sent_at_once_and_only_once(publisher):
+    widget = publisher.widget
+    publisher.publish('drive', 'forward')
+    publisher.publish('drive', 'left')
+    publisher.publish('drive', 'stop')  # Right away, and 'left' is dropped
+    publisher.publish('drive', 'stop')
+    assert publisher.sent == ['forward', 'stop']
+    widget.wait(200)
+    assert publisher.sent == ['forward', 'stop']
+
+
+def test_channels_are_limited_separately(publisher):
+    publisher.publish('drive', 'forward')
+    publisher.publish('arm', 'up')
+    assert publisher.sent == ['forward', 'up']
+
+
+def test_a_change_of_speed_is_a_change_of_command(publisher):
+    widget = publisher.widget
+    publisher.publish('drive', ('forward', 600, 600))
+    publisher.publish('drive', ('forward', 600, 600))
+    publisher.publish('drive', ('forward', 300, 600))
+    publisher.flush()
+    assert publisher.sent == [('forward', 600, 600), ('forward', 300, 600)]
+    assert widget.callbacks == {}
+    publisher.publish('drive', ('stop', 300, 600))
+    assert publisher.sent[-1] == ('stop', 300, 600)
+
+
+def test_command_name_is_the_first_item_of_a_tuple():
+    assert command_name(('stop', 1, 2)) == 'stop'
+    assert command_name('forward') == 'forward'
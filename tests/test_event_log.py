@@ -0,0 +1,87 @@
+"""
+Tests of the   event_log   module: what is logged is written, in order,
+to files that are rotated by their size in bytes, even after errors.
+"""
+
+import os
+import pytest
+from event_log import EventLog
+
+
+def read(filename):
+    with open(filename, encoding='utf-8') as file:
+        return file.read()
+
+
+def test_logged_values_are_written_like_print(tmp_path):
+    filename = str(tmp_path / 'log.txt')
+    event_log = EventLog(filename, flush_seconds=0.01)
+    event_log.log('You pressed', 'a', 3)
+    event_log.log('x', 'y', sep='-', end='!\n')
+    values = ['changed later']
+    event_log.log(values)
+    values.append('too late')  # The text was made when it was logged
+    event_log.close()
+    assert read(filename) == "You pressed a 3\nx-y!\n['changed later']\n"
+    assert event_log.number_logged == 3
+
+
+def test_a_value_that_cannot_be_made_into_text_fails_in_log(tmp_path):
+    class Broken(object):
+        def __str__(self):
+            raise RuntimeError('no text')
+
+    event_log = EventLog(str(tmp_path / 'log.txt'))
+    with pytest.raises(RuntimeError):
+        event_log.log('before', Broken())
+    event_log.log('after')
+    event_log.close()
+    assert read(str(tmp_path / 'log.txt')) == 'after\n'
+
+
+def test_files_are_rotated_by_bytes_and_never_left_empty(tmp_path):
+    filename = str(tmp_path / 'log.txt')
+    event_log = EventLog(filename, max_bytes=10, backup_count=2,
+                         flush_seconds=60)
+    event_log.log('é' * 8)  # 17 bytes in UTF-8, but 9 characters
+    event_log._write_batch()
+    event_log.log('ab')
+    event_log._write_batch()
+    event_log.log('cd')
+    event_log._write_batch()
+    event_log.close()
+    assert read(filename + '.1') == 'é' * 8 + '\n'
+    assert read(filename) == 'ab\ncd\n'
+    assert not os.path.exists(filename + '.2')
+
+
+def test_with_no_backups_the_file_starts_again(tmp_path):
+    filename = str(tmp_path / 'log.txt')
+    event_log = EventLog(filename, max_bytes=5, backup_count=0,
+                         flush_seconds=60)
+    for text in ['one', 'two', 'three']:
+        event_log.log(text)
+        event_log._write_batch()
+    event_log.close()
+    assert read(filename) == 'three\n'
+    assert os.listdir(str(tmp_path)) == ['log.txt']
+
+
+def test_the_writer_keeps_going_after_a_failed_write(tmp_path, capsys):
+    filename = str(tmp_path / 'log.txt')
+    event_log = EventLog(filename, flush_seconds=60)
+    write = event_log.file.write
+
+    def fail_once(text):
+        event_log.file.write = write
+        raise OSError('disk full')
+
+    event_log.file.write = fail_once
+    event_log.log('lost')
+    event_log._write_batch_or_report()
+    event_log.log('kept')
+    event_log.close()
+    assert not event_log.writer.is_alive()
+    assert event_log.number_of_errors == 1
+    assert 'disk full' in capsys.readouterr().err
+    assert read(filename) == 'kept\n'
@@ -0,0 +1,90 @@
+"""
+Tests of the   image_cache   module: what the cache remembers images
+by, and which images it lets go of, with stand-ins for PhotoImages (so
+no display is needed).
+"""
+
+import fractions
+import os
+from image_cache import ImageCache
+
+
+class FakePhoto(object):
+    """ Has the size of a PhotoImage, and answers   image inuse . """
+
+    def __init__(self, width, height, in_use=False):
+        self.size = (width, height)
+        self.in_use = in_use
+        self.name = 'pyimage{}'.format(id(self))
+        self.tk = self
+
+    def width(self):
+        return self.size[0]
+
+    def height(self):
+        return self.size[1]
+
+    def call(self, *arguments):
+        assert arguments == ('image', 'inuse', self.name)
+        return self.in_use
+
+    def getboolean(self, value):
+        return bool(value)
+
+
+def test_the_key_changes_with_the_file_and_the_scale(tmp_path):
+    filename = str(tmp_path / 'picture.gif')
+    with open(filename, 'wb') as file:
+        file.write(b'one')
+    cache = ImageCache()
+    key = cache.key(filename, 0.5)
+    assert key == cache.key(os.path.relpath(filename), 1 / 2)
+    assert key[-1] == fractions.Fraction(1, 2)
+    assert cache.key(filename, 1 / 3)[-1] == fractions.Fraction(1, 3)
+    assert cache.key(filename, 1) != key
+
+    with open(filename, 'wb') as file:
+        file.write(b'longer')  # A changed file is a different image
+    assert cache.key(filename, 0.5) != key
+
+
+def test_find_counts_hits_and_misses():
+    cache = ImageCache()
+    photo = FakePhoto(10, 10)
+    assert cache.find('a') is None
+    cache.add('a', photo, 0.25)
+    assert cache.find('a') is photo
+    assert cache.find('a') is photo
+    assert (cache.number_of_hits, cache.number_of_misses) == (2, 1)
+    assert cache.seconds_saved == 0.5
+    assert cache.report().startswith('2 hits, 1 misses, 1 images')
+
+
+def test_the_least_recently_used_images_are_let_go_first():
+    cache = ImageCache(max_bytes=3 * 400)  # Room for three 10x10 images
+    photos = {key: FakePhoto(10, 10) for key in 'abcd'}
+    for key in 'abc':
+        cache.add(key, photos[key], 0)
+    cache.find('a')  # Now 'b' is the least recently used
+    cache.add('d', photos['d'], 0)
+    assert list(cache.images) == ['c', 'a', 'd']
+    assert cache.bytes_used == 3 * 400
+
+
+def test_images_in_use_and_the_newest_image_are_kept():
+    cache = ImageCache(max_bytes=400)
+    cache.add('shown', FakePhoto(10, 10, in_use=True), 0)
+    cache.add('big', FakePhoto(100, 100), 0)  # Too big, but just added
+    assert list(cache.images) == ['shown', 'big']
+    cache.add('small', FakePhoto(1, 1), 0)
+    assert list(cache.images) == ['shown', 'small']
+
+
+def test_clear_lets_go_of_every_image_not_in_use():
+    cache = ImageCache()
+    cache.add('shown', FakePhoto(10, 10, in_use=True), 0)
+    cache.add('hidden', FakePhoto(10, 10), 0)
+    cache.clear()
+    assert list(cache.images) == ['shown']
+    assert cache.bytes_used == 400
+    assert cache.max_bytes == 50000000
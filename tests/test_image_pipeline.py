@@ -0,0 +1,97 @@
+"""
+Tests of the   image_pipeline   module: GIF files are decoded (or
+rejected with a ValueError) and made into PNG data that keeps their
+transparency, without Tk.
+"""
+
+import base64
+import fractions
+import os
+import struct
+import zlib
+import pytest
+from image_pipeline import (read_gif, parse_gif, decode_and_scale,
+                            scale_pixels, to_rgba)
+
+EXAMPLE_GIF = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'more_examples', 'tkinter_mqtt_ev3.gif')
+
+
+def tiny_gif():
+    """ A 2 by 1 GIF: a red pixel, then a transparent (index 1) one. """
+    return (b'GIF89a' + struct.pack('<HHBBB', 2, 1, 0x80, 0, 0)
+            + b'\xff\x00\x00' + b'\x00\xff\x00'  # The palette: red, green
+            + b'\x21\xf9\x04\x01\x00\x00\x01\x00'  # Index 1 is transparent
+            + b'\x2c' + struct.pack('<HHHHB', 0, 0, 2, 1, 0)
+            # Codes clear (4), 0, 1, end (5), 3 bits each:
+            + b'\x02\x02\x44\x0a\x00' + b'\x3b')
+
+
+def png_pixels(png):
+    """ Returns the width, height and RGBA bytes of simple PNG data. """
+    assert png[:8] == b'\x89PNG\r\n\x1a\n'
+    width, height, depth, color_type = struct.unpack('>IIBB', png[16:26])
+    assert (depth, color_type) == (8, 6)
+    length = struct.unpack('>I', png[33:37])[0]
+    assert png[37:41] == b'IDAT'
+    rows = zlib.decompress(png[41:41 + length])
+    row_length = 1 + 4 * width
+    return width, height, b''.join(rows[k + 1:k + row_length]
+                                   for k in range(0, len(rows), row_length))
+
+
+def test_a_tiny_gif_is_decoded():
+    assert parse_gif(tiny_gif()) == (2, 1, b'\x00\x01',
+                                     b'\xff\x00\x00\x00\xff\x00', 1)
+
+
+def test_decoded_png_keeps_the_transparent_pixels(tmp_path):
+    filename = str(tmp_path / 'tiny.gif')
+    with open(filename, 'wb') as file:
+        file.write(tiny_gif())
+    data, seconds = decode_and_scale(filename, 1)
+    assert seconds >= 0
+    assert png_pixels(base64.b64decode(data)) == (
+        2, 1, b'\xff\x00\x00\xff' + b'\x00\xff\x00\x00')
+
+
+def test_to_rgba_makes_only_the_transparent_index_clear():
+    rgba = to_rgba(b'\x00\x01\x02', b'\x01\x02\x03\x04\x05\x06', 2)
+    assert rgba == bytearray(b'\x01\x02\x03\xff\x04\x05\x06\xff'
+                             b'\x00\x00\x00\x00')
+    assert to_rgba(b'\x01', b'\x01\x02\x03\x04\x05\x06', None) == (
+        bytearray(b'\x04\x05\x06\xff'))
+
+
+@pytest.mark.parametrize('length', [0, 5, 13, 200, 800, -20])
+def test_a_cut_short_gif_raises_value_error(tmp_path, length):
+    with open(EXAMPLE_GIF, 'rb') as file:
+        data = file.read()
+    filename = str(tmp_path / 'short.gif')
+    with open(filename, 'wb') as file:
+        file.write(data[:length])
+    with pytest.raises(ValueError):
+        read_gif(filename)
+
+
+def test_a_file_that_is_not_a_gif_raises_value_error(tmp_path):
+    filename = str(tmp_path / 'not.gif')
+    with open(filename, 'wb') as file:
+        file.write(b'\x89PNG\r\n\x1a\n' + bytes(100))
+    with pytest.raises(ValueError):
+        read_gif(filename)
+
+
+def test_the_example_gif_is_read():
+    width, height, pixels, palette, _ = read_gif(EXAMPLE_GIF)
+    assert len(pixels) == width * height
+    assert len(palette) % 3 == 0
+
+
+def test_scale_pixels_matches_zoom_and_subsample():
+    pixels = bytes(range(12))  # 4 wide, 3 high
+    assert scale_pixels(4, 3, pixels, 1) == (4, 3, pixels)
+    assert scale_pixels(4, 3, pixels, fractions.Fraction(1, 2)) == (
+        2, 2, bytes([0, 2, 8, 10]))
+    assert scale_pixels(2, 1, b'\x05\x06', fractions.Fraction(2)) == (
+        4, 2, b'\x05\x05\x06\x06' * 2)
@@ -0,0 +1,66 @@
+"""
+Tests of the   speed_entry   module.  The rules for what may be typed,
+and how it is read, are checked without Tk; the Entry box itself is
+checked only where there is a display.
+"""
+
+import tkinter
+from tkinter import ttk
+import pytest
+from speed_entry import SpeedEntry
+
+
+def rules(smallest=-900, largest=900, value=0):
+    """ A SpeedEntry with no Entry box, for its rules alone. """
+    speed_entry = SpeedEntry.__new__(SpeedEntry)
+    speed_entry.smallest = smallest
+    speed_entry.largest = largest
+    speed_entry.value = value
+    speed_entry.number_of_parses = 0
+    return speed_entry
+
+
+def test_only_whole_numbers_in_range_may_be_typed():
+    speed_entry = rules()
+    for text in ['', '-', '0', '600', '-900', '900']:
+        assert speed_entry._is_valid(text)
+    for text in ['901', '-901', 'abc', '6.5', '--', '6-']:
+        assert not speed_entry._is_valid(text)
+
+
+def test_text_that_is_not_a_number_keeps_the_speed():
+    speed_entry = rules(value=600)
+    assert speed_entry._parse('-') == 600
+    assert speed_entry._parse('') == 600
+    assert speed_entry._parse('250') == 250
+    assert speed_entry._parse('5000') == 900
+    assert speed_entry._parse('-5000') == -900
+    assert speed_entry.number_of_parses == 5
+
+
+@pytest.fixture
+def root():
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError:
+        pytest.skip('needs a display')
+    yield root
+    root.destroy()
+
+
+def test_the_speed_is_parsed_only_when_the_text_changes(root):
+    entry = ttk.Entry(root)
+    entry.insert(0, '600')
+    speed_entry = SpeedEntry(entry)
+    assert speed_entry.value == 600
+    parses = speed_entry.number_of_parses
+    for _ in range(100):
+        assert speed_entry.value == 600
+    assert speed_entry.number_of_parses == parses
+
+    entry.delete(0, 'end')
+    assert speed_entry.value == 600 and entry.instate(['invalid'])
+    entry.insert(0, '-25')
+    assert speed_entry.value == -25 and not entry.instate(['invalid'])
+    entry.insert('end', 'x')  # Not allowed, so not typed
+    assert entry.get() == '-25'
@@ -0,0 +1,103 @@
+"""
+Tests of the   sprite_atlas   module: packing, building an atlas (and
+its layout) from GIF files, and the icons that cannot share an atlas.
+No display is needed, because these do not make PhotoImages.
+"""
+
+import os
+import random
+import struct
+import zlib
+import pytest
+from image_pipeline import read_gif
+from sprite_atlas import (build_atlas, pack, read_layout, write_gif,
+                          sources)
+
+PALETTE = bytes([0, 0, 0, 255, 0, 0, 0, 255, 0, 0, 0, 255])
+
+
+def make_icon(filename, width, height, color):
+    """ Writes a GIF, all one color, with a transparent top-left pixel. """
+    pixels = bytes([3]) + bytes([color]) * (width * height - 1)
+    write_gif(filename, width, height, pixels, PALETTE, 3)
+
+
+def read_png(filename):
+    """ Returns the width, height and RGBA bytes of the atlas PNG. """
+    with open(filename, 'rb') as file:
+        data = file.read()
+    width, height = struct.unpack('>II', data[16:24])
+    length = struct.unpack('>I', data[33:37])[0]
+    rows = zlib.decompress(data[41:41 + length])
+    row_length = 1 + 4 * width
+    return width, height, b''.join(rows[k + 1:k + row_length]
+                                   for k in range(0, len(rows), row_length))
+
+
+def test_pack_places_rectangles_without_overlap_within_the_width():
+    random.seed(120)
+    sizes = {'icon{}'.format(k): (random.randint(1, 40),
+                                  random.randint(1, 40))
+             for k in range(200)}
+    positions, width, height = pack(sizes, 256)
+    assert width <= 256
+    boxes = [(x, y, x + sizes[name][0], y + sizes[name][1])
+             for name, (x, y) in positions.items()]
+    for x1, y1, x2, y2 in boxes:
+        assert 0 <= x1 and x2 <= width and 0 <= y1 and y2 <= height
+    for k, (x1, y1, x2, y2) in enumerate(boxes):
+        for a1, b1, a2, b2 in boxes[k + 1:]:
+            assert x2 <= a1 or a2 <= x1 or y2 <= b1 or b2 <= y1
+
+
+def test_an_icon_wider_than_the_largest_width_gets_its_own_row():
+    positions, width, height = pack({'wide': (50, 5), 'small': (5, 5)}, 20)
+    assert positions == {'wide': (0, 0), 'small': (0, 5)}
+    assert (width, height) == (50, 10)
+
+
+def test_a_built_atlas_holds_each_icon_where_its_layout_says(tmp_path):
+    filenames = []
+    for k, (width, height) in enumerate([(4, 3), (2, 5), (6, 1)]):
+        filenames.append(str(tmp_path / 'icon{}.gif'.format(k)))
+        make_icon(filenames[-1], width, height, k)
+    atlas_filename = str(tmp_path / 'atlas.png')
+    layout = build_atlas(filenames, atlas_filename)
+    assert read_layout(atlas_filename) == layout
+    assert layout['sources'] == sources(filenames)
+
+    atlas_width, atlas_height, rgba = read_png(atlas_filename)
+    assert (atlas_width, atlas_height) == (layout['width'], layout['height'])
+    for k in range(3):
+        x, y, width, height = layout['icons']['icon{}'.format(k)]
+        color = PALETTE[3 * k:3 * k + 3]
+        for row in range(height):
+            for column in range(width):
+                start = ((y + row) * atlas_width + x + column) * 4
+                if row == 0 and column == 0:
+                    assert rgba[start + 3] == 0  # Transparent
+                else:
+                    assert rgba[start:start + 4] == color + b'\xff'
+
+
+def test_icons_with_the_same_name_raise_value_error(tmp_path):
+    filenames = []
+    for folder in ['one', 'two']:
+        os.mkdir(str(tmp_path / folder))
+        filenames.append(str(tmp_path / folder / 'stop.gif'))
+        make_icon(filenames[-1], 2, 2, 0)
+    with pytest.raises(ValueError):
+        build_atlas(filenames, str(tmp_path / 'atlas.png'))
+
+
+def test_write_gif_round_trips_through_read_gif(tmp_path):
+    filename = str(tmp_path / 'icon.gif')
+    pixels = bytes(random.randrange(4) for _ in range(700))  # > 254 codes
+    write_gif(filename, 35, 20, pixels, PALETTE, 3)
+    width, height, read_pixels, palette, transparent = read_gif(filename)
+    assert (width, height, read_pixels, transparent) == (35, 20, pixels, 3)
+    assert palette[:12] == PALETTE
+
+
+def test_a_missing_layout_reads_as_none(tmp_path):
+    assert read_layout(str(tmp_path / 'atlas.png')) is None
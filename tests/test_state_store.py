@@ -0,0 +1,100 @@
+"""
+Tests of the   state_store   module: who is notified, when, how often,
+and in what order.
+"""
+
+import pytest
+from state_store import Store
+
+
+class Data(Store):
+    __slots__ = ('number', 'color', 'name')
+
+
+def recorder(calls, label):
+    """ Returns a subscriber that records its label and the store. """
+    return lambda store: calls.append((label, store.number, store.color))
+
+
+def test_subscribers_are_called_now_and_on_each_change():
+    data = Data(number=0, color='red', name='x')
+    calls = []
+    data.subscribe(['number'], recorder(calls, 'a'))
+    data.subscribe(['color'], recorder(calls, 'b'), call_now=False)
+    assert calls == [('a', 0, 'red')]
+
+    data.number = 1
+    data.color = 'blue'
+    data.name = 'y'  # Nobody subscribed
+    assert calls[1:] == [('a', 1, 'red'), ('b', 1, 'blue')]
+    assert data.number_of_notifications == 2
+
+
+def test_setting_the_same_value_is_not_a_change():
+    data = Data(number=5, color='red', name='x')
+    calls = []
+    data.subscribe(['number', 'color'], recorder(calls, 'a'),
+                   call_now=False)
+    data.number = 5
+    data.color = 'red'
+    assert calls == []
+
+
+def test_subscribers_are_notified_in_the_order_they_subscribed():
+    data = Data(number=0, color='red', name='x')
+    calls = []
+    for label in 'cab':
+        data.subscribe(['number'], recorder(calls, label), call_now=False)
+    data.number = 1
+    assert [label for label, _, _ in calls] == ['c', 'a', 'b']
+
+
+def test_a_batch_notifies_each_subscriber_once_at_the_end():
+    data = Data(number=0, color='red', name='x')
+    calls = []
+    data.subscribe(['color'], recorder(calls, 'first'), call_now=False)
+    data.subscribe(['number', 'color'], recorder(calls, 'both'),
+                   call_now=False)
+    data.subscribe(['number'], recorder(calls, 'last'), call_now=False)
+    data.subscribe(['name'], recorder(calls, 'never'), call_now=False)
+
+    with data.batch():
+        for k in range(1, 10):
+            data.number = k
+        data.color = 'blue'
+        with data.batch():  # Batches can be inside batches
+            data.number = 10
+        assert calls == []
+    assert calls == [('first', 10, 'blue'), ('both', 10, 'blue'),
+                     ('last', 10, 'blue')]
+    assert data.number_of_notifications == 3
+
+
+def test_a_batch_that_fails_still_notifies_what_changed():
+    data = Data(number=0, color='red', name='x')
+    calls = []
+    data.subscribe(['number'], recorder(calls, 'a'), call_now=False)
+    with pytest.raises(ZeroDivisionError):
+        with data.batch():
+            data.number = 1
+            data.number = 1 / 0
+    assert calls == [('a', 1, 'red')]
+    data.number = 2  # Not in a batch any more
+    assert calls[-1] == ('a', 2, 'red')
+
+
+def test_unsubscribed_functions_are_not_called():
+    data = Data(number=0, color='red', name='x')
+    calls = []
+    subscription = data.subscribe(['number', 'color'], recorder(calls, 'a'),
+                                  call_now=False)
+    data.unsubscribe(subscription)
+    data.number = 1
+    data.color = 'blue'
+    assert calls == []
+
+
+def test_only_the_listed_fields_exist():
+    data = Data(number=0, color='red', name='x')
+    with pytest.raises(AttributeError):
+        data.size = 3